@@ -1,11 +1,17 @@
 import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
 import seaborn as sns
 import plotly.express as px
-from src.data_fetcher import fetch_and_process_data
-from src.data_processor import calculate_missing_stats, clean_data, calculate_growth_rate, get_top_n_countries
-import os
+from src.data_fetcher import fetch_and_process_data, default_fetcher, OFFLINE
+from src.data_processor import calculate_missing_stats, profile_missing, missing_grid, clean_data, calculate_growth_rate, get_top_n_countries
+from src.data_store import load_dataset, stored_version, dataset_version
+from src.rank_index import RankIndex
+from src.render import FigureCache
+from src.partition_index import PartitionIndex
+from src.choropleth import ChoroplethFrames
+from src.series_index import SeriesIndex, draw_series
+from src.dataset_cache import DatasetCache
+from src.registry import REGISTRY
+from src.telemetry import span, write_metrics
 
 # Page Settings
 st.set_page_config(page_title="World Pop Insights", layout="wide")
@@ -14,25 +20,94 @@ st.title("🌍 World Population Insights")
 st.markdown("Historical Population Analysis")
 
 # Data Loading (Cache mechanism)
-@st.cache_data
+@st.cache_resource
 def load_data():
-    if os.path.exists('data/population_data.csv'):
-        return pd.read_csv('data/population_data.csv')
-    return None
+    # One shared copy for all sessions (never modified in place).
+    # Columnar store (memory-mapped), falls back to the CSV export.
+    # Compact dtypes: categoricals, int16 years, float32 where precision allows.
+    # The version identifies this dataset for indexes built from it.
+    df = load_dataset(compact=True)
+    if df is None:
+        return None, None
+    return df, stored_version() or dataset_version(df)
+
+@st.cache_resource(max_entries=8)
+def get_rank_index(version, _df):
+    # Built once per dataset version and shared by all sessions
+    return RankIndex(_df)
+
+def make_fetcher():
+    # Progress bar driven by the fetch engine (one tick per finished request)
+    bar = st.progress(0.0, text="Requests completed: 0")
+    return default_fetcher(offline=st.session_state.get('offline_mode', OFFLINE),
+                           progress=lambda done, total: bar.progress(done / total, text=f"Requests completed: {done}/{total}"))
+
+@st.cache_resource(max_entries=8)
+def get_partition_index(version, _df):
+    # (scope, year) -> row range, built once per dataset version
+    return PartitionIndex(_df)
+
+@st.cache_resource(max_entries=24)
+def get_choropleth_frames(version, scope, _partitions):
+    # Map values of every year of a scope, built once per dataset version
+    return ChoroplethFrames(_partitions.rows(scope))
+
+@st.cache_resource(max_entries=8)
+def get_series_index(version, _df):
+    # Entity -> contiguous (year, value) arrays and the entity list, built once per dataset version
+    return SeriesIndex(_df, metrics=['population'])
+
+@st.cache_resource
+def get_dataset_cache():
+    # Cleaned/derived datasets shared by all sessions; a session only keeps the key
+    return DatasetCache(max_entries=8)
+
+def get_dataset(key):
+    # Key format: "<data version>[:<cleaning strategy>][+growth_rate]".
+    # The key describes how to rebuild the dataset if it was evicted.
+    def build():
+        base, _, derived = key.partition('+')
+        strategy = base.partition(':')[2]
+        data = clean_data(df, strategy=strategy) if strategy else df
+        if derived == 'growth_rate':
+            data = calculate_growth_rate(data)
+        return data
+    return get_dataset_cache().get_or_build(key, build)
+
+@st.cache_resource
+def get_figure_cache():
+    # Finished charts shared by all sessions, keyed by (dataset version, chart, parameters)
+    return FigureCache(max_entries=256)
 
 # Sidebar - Control Panel
 with st.sidebar:
     st.header("Data Management")
+
+    # Offline mode: only cached API responses are used
+    st.checkbox("Offline mode (use cached API responses only)", value=OFFLINE, key="offline_mode")
     
     # API Fetch
     if st.button("Fetch / Update Data from API"):
         with st.spinner('Communicating with World Bank API...'):
             try:
                 load_data.clear()
-                new_df = fetch_and_process_data()
+                new_df = fetch_and_process_data(fetcher=make_fetcher())
                 st.success(f"Data fetched successfully! Total Rows: {len(new_df)}")
-                if 'cleaned_df' in st.session_state:
-                    del st.session_state.cleaned_df
+                if 'dataset_key' in st.session_state:
+                    del st.session_state.dataset_key
+                st.rerun()
+            except Exception as e:
+                st.error(f"An error occurred: {e}")
+
+    # Incremental Refresh (only missing / recent years)
+    if st.button("Incremental Refresh (New Years Only)"):
+        with st.spinner('Fetching missing years from World Bank API...'):
+            try:
+                load_data.clear()
+                new_df = fetch_and_process_data(incremental=True, fetcher=make_fetcher())
+                st.success(f"Data refreshed! Total Rows: {len(new_df)}")
+                if 'dataset_key' in st.session_state:
+                    del st.session_state.dataset_key
                 st.rerun()
             except Exception as e:
                 st.error(f"An error occurred: {e}")
@@ -40,27 +115,31 @@ with st.sidebar:
     # Reload Local Data
     if st.button("Reload Local Data"):
         load_data.clear()
-        if 'cleaned_df' in st.session_state:
-            del st.session_state.cleaned_df
+        if 'dataset_key' in st.session_state:
+            del st.session_state.dataset_key
         st.success("Cache cleared and data reloaded from disk.")
         st.rerun()
 
-df = load_data()
+df, data_version = load_data()
 
 if df is not None:
     # Tabs
     tab1, tab2, tab3, tab4, tab5 = st.tabs(["🔍 Data Health & Cleaning", "📊 Overview", "🏆 Rankings & Growth", "📈 Time Series Analysis", "📂 Raw Data"])
 
     # --- TAB 1: DATA HEALTH & CLEANING ---
-    with tab1:
+    with tab1, span('tab.health_cleaning'):
         st.header("Data Quality Analysis")
         
-        # Session State usage: To keep cleaned data in memory
-        if 'cleaned_df' not in st.session_state:
-            st.session_state.cleaned_df = df
+        # Session State usage: the session only keeps a key into the shared dataset cache
+        if 'dataset_key' not in st.session_state or not st.session_state.dataset_key.startswith(data_version):
+            st.session_state.dataset_key = data_version
 
-        current_df = st.session_state.cleaned_df
-        stats = calculate_missing_stats(current_df)
+        version = st.session_state.dataset_key
+        current_df = get_dataset(version)
+        figure_cache = get_figure_cache()
+        # One null scan per dataset version (memoized), shared by all the views below
+        profile = profile_missing(current_df, version)
+        stats = calculate_missing_stats(current_df, version)
 
         # 1. Metrics
         col1, col2, col3 = st.columns(3)
@@ -78,20 +157,38 @@ if df is not None:
             sizes = [stats['total_cells'] - stats['missing_cells'], stats['missing_cells']]
             explode = (0, 0.1)  # Separate the missing slice slightly
 
-            fig_pie, ax_pie = plt.subplots()
-            ax_pie.pie(sizes, explode=explode, labels=labels, autopct='%1.1f%%',
-                    shadow=True, startangle=90, colors=['#66b3ff','#ff9999'])
-            ax_pie.axis('equal') 
-            st.pyplot(fig_pie)
+            def draw_pie(fig):
+                ax_pie = fig.subplots()
+                ax_pie.pie(sizes, explode=explode, labels=labels, autopct='%1.1f%%',
+                        shadow=True, startangle=90, colors=['#66b3ff','#ff9999'])
+                ax_pie.axis('equal')
+            st.image(figure_cache.png((version, 'pie'), draw_pie, figsize=(6.4, 4.8)))
 
         with col_viz2:
             st.subheader("Missing Data Map (Heatmap)")
-            st.markdown("Yellow lines indicate missing data locations.")
-            # Seaborn Heatmap - For professional look
-            fig_heat, ax_heat = plt.subplots(figsize=(8, 5))
-            # If data is too large, heatmap slows down, so we can sample or just show nulls
-            sns.heatmap(current_df.isnull(), cbar=False, yticklabels=False, cmap='viridis', ax=ax_heat)
-            st.pyplot(fig_heat)
+            heat_view = st.radio("View:", ["Row blocks x Columns", "Countries x Years"], horizontal=True, key="heatmap_view")
+            st.markdown("Brighter cells indicate a higher share of missing data.")
+            # Nulls are binned into a bounded grid and drawn as one image,
+            # so the cost depends on the output size, not the number of rows
+            heat_mode = 'rows' if heat_view.startswith('Row') else 'entity_year'
+
+            def draw_heatmap(fig):
+                grid, row_labels, col_labels = missing_grid(profile, mode=heat_mode)
+                ax_heat = fig.subplots()
+                ax_heat.imshow(grid, aspect='auto', interpolation='nearest', cmap='viridis', vmin=0, vmax=1)
+                step = max(1, len(col_labels) // 12)
+                ax_heat.set_xticks(range(0, len(col_labels), step))
+                ax_heat.set_xticklabels(col_labels[::step], rotation=90)
+                ax_heat.set_yticks([])
+            st.image(figure_cache.png((version, 'heatmap', heat_mode), draw_heatmap, figsize=(8, 5)))
+
+        # Breakdowns from the same bitmask
+        with st.expander("Missing Data Breakdown (by Year / Country)"):
+            col_b1, col_b2 = st.columns(2)
+            col_b1.markdown("**Missing cells per year**")
+            col_b1.bar_chart(profile['by_year'])
+            col_b2.markdown("**Countries with the most missing cells**")
+            col_b2.dataframe(profile['by_country'].sort_values(ascending=False).head(15).rename('missing_cells'))
 
         # 3. Action: Cleaning Options
         st.divider()
@@ -99,149 +196,156 @@ if df is not None:
         
         clean_method = st.selectbox(
             "Select Cleaning Method:",
-            ("Select...", "drop (Delete missing rows)", "fill_mean (Fill with country mean)", "interpolate (Time series completion)")
+            ("Select...", "drop (Delete missing rows)", "fill_mean (Fill with country mean)", "interpolate (Time series completion)",
+             "ffill (Carry last known value forward)", "nearest (Closest known year)")
         )
         
         if st.button("Apply"):
             if clean_method != "Select...":
                 method_key = clean_method.split()[0] # take before parenthesis
-                st.session_state.cleaned_df = clean_data(df, strategy=method_key)
+                st.session_state.dataset_key = f"{data_version}:{method_key}"
+                get_dataset(st.session_state.dataset_key)
                 st.success(f"Data cleaned with '{method_key}' method! Charts updated.")
                 st.rerun() # Rerun to update charts with new data
             else:
                 st.warning("Please select a method.")
 
     # Use current_df for other tabs
-    if 'cleaned_df' not in st.session_state:
-        st.session_state.cleaned_df = df
-    current_df = st.session_state.cleaned_df
+    current_df = get_dataset(st.session_state.dataset_key)
+    figure_cache = get_figure_cache()
 
-    with tab2:
+    with tab2, span('tab.overview'):
         st.subheader("Country and Group Distinction")
         
         # Filtering Option
         filter_option = st.radio("Analysis Scope:", ["Countries Only", "Groups Only (Aggregates)", "All"], horizontal=True)
-        
-        if filter_option == "Countries Only":
-            filtered_df = current_df[current_df['is_aggregate'] == False]
-        elif filter_option == "Groups Only (Aggregates)":
-            filtered_df = current_df[current_df['is_aggregate'] == True]
-        else:
-            filtered_df = current_df
+        scope = {"Countries Only": "countries", "Groups Only (Aggregates)": "aggregates", "All": "all"}[filter_option]
+        partitions = get_partition_index(st.session_state.dataset_key, current_df)
 
-        # Year Selection
-        min_year = int(filtered_df['date'].min())
-        max_year = int(filtered_df['date'].max())
-        
-        selected_year = st.slider("Select Year", min_year, max_year, max_year, key="overview_year_slider")
+        # Year Selection (a cleaned/filtered dataset may have no rows in a scope)
+        min_year, max_year = partitions.years(scope)
+        if min_year is None:
+            st.info(f"No rows in scope '{filter_option}' for this dataset.")
+        else:
+            selected_year = st.slider("Select Year", min_year, max_year, max_year, key="overview_year_slider")
 
-        # Data for Selected Year
-        year_data = filtered_df[filtered_df['date'] == selected_year].copy()
+            # Data for Selected Year (precomputed row range, no full-frame scan)
+            year_data = partitions.slice(scope, selected_year).copy()
         
-        # Fill NaN density for visualization to avoid Plotly errors
-        year_data['density'] = year_data['density'].fillna(0)
+            # Fill NaN density for visualization to avoid Plotly errors
+            year_data['density'] = year_data['density'].fillna(0)
         
-        col1, col2 = st.columns(2)
-        col1.metric("Number of Entities in Dataset", len(year_data))
-        col1.markdown(f"*Selected Year: {selected_year}*")
+            col1, col2 = st.columns(2)
+            col1.metric("Number of Entities in Dataset", len(year_data))
+            col1.markdown(f"*Selected Year: {selected_year}*")
         
-        # --- CHOROPLETH MAP ---
-        st.markdown(f"### 🗺️ Global Population Map ({selected_year})")
-        if 'iso_code' in year_data.columns:
-            fig_map = px.choropleth(
-                year_data,
-                locations="iso_code",
-                color="population",
-                hover_name="country",
-                color_continuous_scale=px.colors.sequential.Plasma,
-                title=f"World Population Map ({selected_year})",
-                labels={'population': 'Population'}
-            )
-            fig_map.update_layout(geo=dict(showframe=False, showcoastlines=False, projection_type='equirectangular'))
-            st.plotly_chart(fig_map, use_container_width=True)
-        else:
-            st.warning("ISO codes not found in data. Please click 'Fetch / Update Data from API' to update the dataset with ISO codes.")
+            # --- CHOROPLETH MAP ---
+            st.markdown(f"### 🗺️ Global Population Map ({selected_year})")
+            if 'iso_code' in year_data.columns:
+                frames = get_choropleth_frames(st.session_state.dataset_key, scope, partitions)
+                # The animated map holds every year; its slider runs in the browser without reruns
+                if st.toggle("Animate all years", key="overview_animate"):
+                    fig_map = frames.animated_figure()
+                else:
+                    fig_map = figure_cache.get_or_build((st.session_state.dataset_key, 'choropleth', filter_option, selected_year),
+                                                        lambda: frames.figure(selected_year))
+                st.plotly_chart(fig_map, use_container_width=True)
+            else:
+                st.warning("ISO codes not found in data. Please click 'Fetch / Update Data from API' to update the dataset with ISO codes.")
 
-        # Simple Scatter Plot (Density vs Population)
-        st.markdown(f"### Population vs Surface Area Distribution ({selected_year})")
+            # Simple Scatter Plot (Density vs Population)
+            st.markdown(f"### Population vs Surface Area Distribution ({selected_year})")
         
-        # Interactive Plotly Chart
-        fig = px.scatter(
-            year_data,
-            x="surface_area",
-            y="population",
-            color="region_name",
-            size="density",
-            hover_name="country",
-            log_x=True,
-            log_y=True,
-            title=f"{selected_year} Distribution (Logarithmic)",
-            labels={
-                "surface_area": "Surface Area (km²)",
-                "population": "Population",
-                "region_name": "Region",
-                "density": "Density (pop/km²)"
-            },
-            template="plotly_white"
-        )
-        st.plotly_chart(fig, use_container_width=True)
+            # Interactive Plotly Chart
+            def build_scatter():
+                return px.scatter(
+                    year_data,
+                    x="surface_area",
+                    y="population",
+                    color="region_name",
+                    size="density",
+                    hover_name="country",
+                    log_x=True,
+                    log_y=True,
+                    title=f"{selected_year} Distribution (Logarithmic)",
+                    labels={
+                        "surface_area": "Surface Area (km²)",
+                        "population": "Population",
+                        "region_name": "Region",
+                        "density": "Density (pop/km²)"
+                    },
+                    template="plotly_white"
+                )
+            fig = figure_cache.get_or_build((st.session_state.dataset_key, 'scatter', filter_option, selected_year), build_scatter)
+            st.plotly_chart(fig, use_container_width=True)
 
     # --- TAB 3: RANKINGS & GROWTH ---
-    with tab3:
+    with tab3, span('tab.rankings_growth'):
         st.header("🏆 Rankings & Growth Analysis")
         
         # Calculate Growth Rate if not present
         if 'growth_rate' not in current_df.columns:
-            current_df = calculate_growth_rate(current_df)
-            st.session_state.cleaned_df = current_df # Update session state
+            st.session_state.dataset_key += "+growth_rate"
+            current_df = get_dataset(st.session_state.dataset_key)
+        version = st.session_state.dataset_key
+        rank_index = get_rank_index(version, current_df)
         
         col_rank1, col_rank2 = st.columns([1, 2])
         
         with col_rank1:
             st.subheader("Top N Analysis")
             target_year = st.slider("Select Year", int(current_df['date'].min()), int(current_df['date'].max()), int(current_df['date'].max()), key="rankings_year_slider")
-            metric = st.selectbox("Select Metric", ["population", "density", "growth_rate", "surface_area"])
+            # Every registered metric (config/indicators.json) present in the data
+            metric = st.selectbox("Select Metric", [m for m in REGISTRY.metrics if m in current_df.columns])
             top_n = st.slider("Number of Countries", 5, 20, 10)
             
-            top_countries = get_top_n_countries(current_df, target_year, metric, n=top_n)
+            top_countries = get_top_n_countries(current_df, target_year, metric, n=top_n, index=rank_index)
             st.dataframe(top_countries[['country', metric, 'region_name']].reset_index(drop=True))
             
         with col_rank2:
             st.subheader(f"Top {top_n} Countries by {metric.capitalize()} ({target_year})")
-            fig_bar, ax_bar = plt.subplots(figsize=(10, 6))
-            sns.barplot(data=top_countries, x=metric, y='country', palette='viridis', ax=ax_bar)
-            ax_bar.set_title(f"Top {top_n} by {metric}")
-            st.pyplot(fig_bar)
+
+            def draw_bar(fig):
+                ax_bar = fig.subplots()
+                sns.barplot(data=top_countries, x=metric, y='country', order=top_countries['country'].tolist(), palette='viridis', ax=ax_bar)
+                ax_bar.set_title(f"Top {top_n} by {metric}")
+            st.image(figure_cache.png((version, 'bar', target_year, metric, top_n), draw_bar, figsize=(10, 6)))
             
         st.divider()
         
         st.subheader("Growth Rate Distribution")
         # Histogram of growth rates for the selected year
-        year_data = current_df[(current_df['date'] == target_year) & (current_df['is_aggregate'] == False)]
-        
-        fig_hist, ax_hist = plt.subplots(figsize=(10, 4))
-        sns.histplot(data=year_data, x='growth_rate', bins=30, kde=True, ax=ax_hist)
-        ax_hist.set_title(f"Distribution of Population Growth Rates in {target_year}")
-        ax_hist.set_xlabel("Growth Rate (%)")
-        st.pyplot(fig_hist)
+        def draw_hist(fig):
+            year_data = current_df[(current_df['date'] == target_year) & (current_df['is_aggregate'] == False)]
+            ax_hist = fig.subplots()
+            sns.histplot(data=year_data, x='growth_rate', bins=30, kde=True, ax=ax_hist)
+            ax_hist.set_title(f"Distribution of Population Growth Rates in {target_year}")
+            ax_hist.set_xlabel("Growth Rate (%)")
+        st.image(figure_cache.png((version, 'growth_hist', target_year), draw_hist, figsize=(10, 4)))
 
-    with tab4:
+    with tab4, span('tab.time_series'):
         st.subheader("Comparative Growth")
         # Country selection with Multiselect
-        all_entities = current_df['country'].unique().tolist()
-        selected_entities = st.multiselect("Select Countries/Groups to Compare:", all_entities, default=["Turkiye", "Germany"])
+        series_index = get_series_index(st.session_state.dataset_key, current_df)
+        selected_entities = st.multiselect("Select Countries/Groups to Compare:", series_index.entities, default=["Turkiye", "Germany"])
         
         if selected_entities:
-            subset = current_df[current_df['country'].isin(selected_entities)]
-            
-            fig2, ax2 = plt.subplots(figsize=(12, 6))
-            sns.lineplot(data=subset, x='date', y='population', hue='country', ax=ax2)
-            ax2.set_title("Population Change by Year")
-            ax2.grid(True, linestyle='--', alpha=0.7)
-            st.pyplot(fig2)
+            def draw_lines(fig):
+                # Array slices per entity, LTTB-downsampled to a fixed point budget
+                series = series_index.plot_series(selected_entities, 'population')
+                ax2 = fig.subplots()
+                draw_series(ax2, series)
+                ax2.set_xlabel('date')
+                ax2.set_ylabel('population')
+                ax2.set_title("Population Change by Year")
+                ax2.grid(True, linestyle='--', alpha=0.7)
+            st.image(figure_cache.png((st.session_state.dataset_key, 'timeseries', tuple(selected_entities)), draw_lines, figsize=(12, 6)))
 
-    with tab5:
+    with tab5, span('tab.raw_data'):
         st.dataframe(current_df)
 
 else:
-    st.info("No data available yet. Please click the 'Fetch / Update Data from API' button in the sidebar.")
\ No newline at end of file
+    st.info("No data available yet. Please click the 'Fetch / Update Data from API' button in the sidebar.")
+
+# Spans/counters of this rerun to data/telemetry (no-op unless WPI_TELEMETRY=1)
+write_metrics()
\ No newline at end of file
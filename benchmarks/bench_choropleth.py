@@ -0,0 +1,72 @@
+"""
+Overview map benchmark: px.choropleth rebuilt per year vs ChoroplethFrames
+(one pass over all years, per-year figures from the skeleton) and the
+animated figure holding every year.
+
+Build time covers every year of the stored dataset (countries scope);
+payload is the plotly JSON sent to the browser.
+
+Usage: python benchmarks/bench_choropleth.py [--repeat 3]
+"""
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import plotly.express as px
+import plotly.io as pio
+
+from src.choropleth import ChoroplethFrames
+from src.data_store import load_dataset
+from src.partition_index import PartitionIndex
+
+
+def px_map(year_data, year):
+    # The previous Overview map
+    fig = px.choropleth(year_data, locations="iso_code", color="population", hover_name="country",
+                        color_continuous_scale=px.colors.sequential.Plasma,
+                        title=f"World Population Map ({year})", labels={'population': 'Population'})
+    fig.update_layout(geo=dict(showframe=False, showcoastlines=False, projection_type='equirectangular'))
+    return fig
+
+
+def best(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - t0)
+    return min(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    os.chdir(ROOT)
+    partitions = PartitionIndex(load_dataset(compact=True))
+    first, last = partitions.years('countries')
+    years = range(first, last + 1)
+
+    px_s, px_figs = best(lambda: [px_map(partitions.slice('countries', y), y) for y in years], args.repeat)
+
+    def frames_build():
+        frames = ChoroplethFrames(partitions.rows('countries'))
+        return frames, [frames.figure(y) for y in years]
+    frames_s, (frames, figs) = best(frames_build, args.repeat)
+    anim_s, anim = best(lambda: ChoroplethFrames(partitions.rows('countries')).animated_figure(), args.repeat)
+
+    per_year = lambda fs: sum(len(pio.to_json(f)) for f in fs) / len(fs) / 1024
+    print(f"{len(years)} years")
+    print(f"{'':<22} {'build all (ms)':>15} {'payload (KB)':>14}")
+    print(f"{'px.choropleth':<22} {px_s * 1000:>15.1f} {per_year(px_figs):>10.1f}/year")
+    print(f"{'ChoroplethFrames':<22} {frames_s * 1000:>15.1f} {per_year(figs):>10.1f}/year")
+    print(f"{'animated (all years)':<22} {anim_s * 1000:>15.1f} {len(pio.to_json(anim)) / 1024:>10.1f} total")
+
+
+if __name__ == "__main__":
+    main()
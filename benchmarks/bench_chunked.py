@@ -0,0 +1,80 @@
+"""
+Peak memory of in-memory vs chunked (out-of-core) cleaning + derivation.
+
+Writes a synthetic store of --scale times the real dataset, then runs each
+mode in a fresh subprocess and reports its time and peak RSS. The chunked
+runs should stay roughly flat as the store grows; the in-memory run grows
+with it.
+
+Usage: python benchmarks/bench_chunked.py [--scale 100] [--chunks 10000,100000]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.synthetic import make_panel
+from src.data_store import save_dataset
+
+# Peak RSS from VmHWM: ru_maxrss would carry over the parent's peak across exec
+CHILD = """
+import resource, time, json
+from src.data_store import load_dataset, save_dataset
+from src.data_processor import clean_data
+from src.derived import update_derived
+from src.chunked import process_chunked
+t0 = time.perf_counter()
+{run}
+elapsed = time.perf_counter() - t0
+try:
+    with open('/proc/self/status') as f:
+        peak_kb = next(int(line.split()[1]) for line in f if line.startswith('VmHWM'))
+except OSError:
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({{'seconds': elapsed, 'peak_rss_mb': peak_kb / 1024}}))
+"""
+
+IN_MEMORY = ("df = update_derived(clean_data(load_dataset({src!r}, None), {strategy!r}))[0]\n"
+             "save_dataset(df, {out!r}, csv_path=None)")
+CHUNKED = "process_chunked({src!r}, {out!r}, {strategy!r}, chunk_rows={chunk_rows})"
+
+
+def run_child(code):
+    out = subprocess.run([sys.executable, '-c', CHILD.format(run=code)], cwd=ROOT,
+                         capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--scale', type=int, default=100)
+    parser.add_argument('--strategy', default='interpolate')
+    parser.add_argument('--chunks', default='10000,100000')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, 'store.arrow')
+        out = os.path.join(tmp, 'out.arrow')
+        df = make_panel(args.scale)
+        save_dataset(df, src, csv_path=None)
+        print(f"{len(df)} rows, strategy={args.strategy}")
+        del df
+
+        runs = [('in-memory', IN_MEMORY.format(src=src, out=out, strategy=args.strategy))]
+        for chunk_rows in (int(c) for c in args.chunks.split(',')):
+            runs.append((f"chunked {chunk_rows}",
+                         CHUNKED.format(src=src, out=out, strategy=args.strategy, chunk_rows=chunk_rows)))
+
+        print(f"{'mode':<16} {'seconds':>8} {'peak RSS MB':>12}")
+        for name, code in runs:
+            r = run_child(code)
+            print(f"{name:<16} {r['seconds']:>8.2f} {r['peak_rss_mb']:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
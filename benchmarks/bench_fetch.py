@@ -0,0 +1,69 @@
+"""
+Fetch engine scaling benchmark against the local World Bank stub.
+
+Fetches N indicators for all stub countries with different concurrency
+limits; wall-clock time should follow requests / max_workers.
+
+Usage: python benchmarks/bench_fetch.py [--indicators 8] [--latency 0.2] [--fail-rate 0.05]
+"""
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.fetch_engine import WorldBankFetcher, FetchError
+
+
+def spawn_stub(latency, fail_rate):
+    """
+    Runs the stub in its own process so it doesn't compete with the client for the GIL.
+    """
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        port = s.getsockname()[1]
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'wb_stub_server.py')
+    proc = subprocess.Popen([sys.executable, script, '--port', str(port), '--latency', str(latency),
+                             '--fail-rate', str(fail_rate)], stdout=subprocess.DEVNULL)
+    base_url = f"http://127.0.0.1:{port}/v2"
+    probe = WorldBankFetcher(base_url=base_url, retries=20, backoff=0.05)
+    for _ in range(50):
+        try:
+            probe.get_countries()
+            break
+        except FetchError:
+            time.sleep(0.1)
+    return proc, base_url
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--indicators', type=int, default=8)
+    parser.add_argument('--latency', type=float, default=0.2)
+    parser.add_argument('--fail-rate', type=float, default=0.05)
+    parser.add_argument('--workers', default='1,4,8,16')
+    args = parser.parse_args()
+
+    proc, base_url = spawn_stub(args.latency, args.fail_rate)
+    indicators = {f"IND.{i}": f"metric_{i}" for i in range(args.indicators)}
+
+    print(f"{'workers':>7} {'requests':>9} {'seconds':>8} {'rows':>8}")
+    for workers in (int(w) for w in args.workers.split(',')):
+        fetcher = WorldBankFetcher(base_url=base_url, max_workers=workers, rate_limit=None,
+                                   backoff=0.05)
+        countries = [c['id'] for c in fetcher.get_countries()]
+        n_requests = args.indicators * -(-len(countries) // fetcher.chunk_size)
+
+        t0 = time.perf_counter()
+        df = fetcher.get_dataframe(indicators, 1960, 2023, countries=countries)
+        elapsed = time.perf_counter() - t0
+        print(f"{workers:>7} {n_requests:>9} {elapsed:>8.2f} {len(df):>8}")
+
+    proc.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Metadata join benchmark: name merge (pd.merge on the country name) vs the
+ISO-keyed entity dimension join (src.entities.join_entities).
+
+The panel grows with the number of entities and years; the dimension is
+the synthetic World Bank metadata of benchmarks/wb_stub_server.
+
+Usage: python benchmarks/bench_join.py [--entities 266,2660,17576] [--years 64] [--repeat 5]
+"""
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.wb_stub_server import make_countries
+from src.entities import build_entities, join_entities
+
+
+def name_merge(df, countries):
+    # The previous _attach_metadata
+    meta = pd.DataFrame(countries)[['name', 'region', 'id']]
+    meta['region_name'] = meta['region'].apply(lambda x: x['value'] if isinstance(x, dict) else None)
+    meta['is_aggregate'] = meta['region_name'] == 'Aggregates'
+    out = pd.merge(df.drop(columns='iso_code'), meta[['name', 'region_name', 'is_aggregate', 'id']],
+                   left_on='country', right_on='name', how='left')
+    out.rename(columns={'id': 'iso_code'}, inplace=True)
+    out.drop(columns=['name'], inplace=True)
+    return out
+
+
+def best(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--entities', default='266,2660,17576')
+    parser.add_argument('--years', type=int, default=64)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'entities':>8} {'rows':>10} {'name merge (ms)':>16} {'dimension join (ms)':>20}")
+    for n in (int(s) for s in args.entities.split(',')):
+        countries = make_countries(n_countries=n - n // 6, n_aggregates=n // 6)
+        entities = build_entities(countries)
+        df = pd.DataFrame({
+            'iso_code': np.repeat(entities.index.to_numpy(), args.years),
+            'country': np.repeat(entities['name'].to_numpy(), args.years),
+            'date': np.tile(np.arange(2023, 2023 - args.years, -1), n),
+        })
+        df['population'] = np.random.default_rng(0).random(len(df))
+
+        merge_s = best(lambda: name_merge(df, countries), args.repeat)
+        join_s = best(lambda: join_entities(df, entities), args.repeat)
+        print(f"{n:>8} {len(df):>10} {merge_s * 1000:>16.1f} {join_s * 1000:>20.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Cold-load benchmark: plain CSV (pd.read_csv defaults) vs the columnar store.
+
+Each load runs in a fresh subprocess so the numbers reflect a new dashboard
+replica (nothing cached in the interpreter).
+
+Usage: python benchmarks/bench_load.py [--repeat 5]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (setup, load) - imports happen in setup so only the load itself is measured
+LOADERS = {
+    'csv': ("import pandas as pd", "df = pd.read_csv('data/population_data.csv')"),
+    'store': ("from src.data_store import load_dataset", "df = load_dataset()"),
+    'compact': ("from src.data_store import load_dataset", "df = load_dataset(compact=True)"),
+    'normalized': ("from src.data_store import load_normalized", "df = load_normalized()"),
+}
+
+CHILD = """
+import resource, time, json
+{setup}
+rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+t0 = time.perf_counter()
+{loader}
+elapsed = time.perf_counter() - t0
+rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({{
+    'seconds': elapsed,
+    'rss_delta_mb': (rss_after - rss_before) / 1024,
+    'df_memory_mb': df.memory_usage(deep=True).sum() / 1e6,
+}}))
+"""
+
+
+def run_once(name):
+    setup, loader = LOADERS[name]
+    code = CHILD.format(setup=setup, loader=loader)
+    out = subprocess.run([sys.executable, '-c', code], cwd=ROOT, check=True,
+                         capture_output=True, text=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    if not all(os.path.exists(os.path.join(ROOT, p))
+               for p in ('data/population_data.arrow', 'data/population_normalized/facts.arrow')):
+        subprocess.run([sys.executable, '-m', 'src.data_store'], cwd=ROOT, check=True)
+
+    print(f"{'loader':<10} {'load (ms)':>10} {'RSS delta (MB)':>15} {'frame (MB)':>11}")
+    for name in LOADERS:
+        runs = [run_once(name) for _ in range(args.repeat)]
+        seconds = statistics.median(r['seconds'] for r in runs)
+        rss = statistics.median(r['rss_delta_mb'] for r in runs)
+        frame = runs[0]['df_memory_mb']
+        print(f"{name:<10} {seconds * 1000:>10.1f} {rss:>15.1f} {frame:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""
+Benchmark suite for the src/data_processor hot functions on synthetic panels.
+
+Times (best of --repeat) and memory-profiles (tracemalloc peak, separate run)
+calculate_missing_stats (the public call and the versioned profile path),
+every clean_data strategy, calculate_growth_rate and get_top_n_countries
+at 1x/10x/100x/1000x the real row count. Results are
+written as JSON and compared against a stored baseline; a case slower or
+hungrier than baseline * (1 + threshold) is flagged and the exit code is 1.
+
+Usage: python benchmarks/bench_processor.py [--scales 1,10,100,1000] [--missing 0.05]
+                                            [--threshold 0.25] [--save-baseline]
+"""
+import argparse
+import datetime
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import make_panel
+from src import data_processor
+from src.data_processor import calculate_missing_stats, clean_data, calculate_growth_rate, get_top_n_countries
+from src.rank_index import RankIndex
+
+BASELINE_PATH = os.path.join(ROOT, 'benchmarks', 'baseline.json')
+RESULTS_PATH = os.path.join(ROOT, 'benchmarks', 'results.json')
+STRATEGIES = ['drop', 'fill_mean', 'interpolate', 'ffill', 'nearest']
+
+# Differences below these are noise, never flagged
+MIN_SECONDS = 0.002
+MIN_MB = 1.0
+
+
+def missing_profile(df, context):
+    # Memoized by version: measure the profile itself, not a cache hit
+    data_processor._PROFILE_CACHE.clear()
+    return calculate_missing_stats(df, version='bench')
+
+
+def make_cases():
+    """
+    (name, fn(df, context)) pairs; context holds per-panel setup (year, rank index).
+    """
+    cases = [('calculate_missing_stats', lambda df, c: calculate_missing_stats(df)),
+             ('calculate_missing_stats[profile]', missing_profile)]
+    for strategy in STRATEGIES:
+        cases.append((f"clean_data[{strategy}]", lambda df, c, s=strategy: clean_data(df, s)))
+    cases.append(('calculate_growth_rate', lambda df, c: calculate_growth_rate(df)))
+    cases.append(('get_top_n_countries', lambda df, c: get_top_n_countries(df, c['year'], 'population', 10)))
+    cases.append(('get_top_n_countries[index]',
+                  lambda df, c: get_top_n_countries(df, c['year'], 'population', 10, index=c['index'])))
+    return cases
+
+
+def measure(fn, df, context, repeat):
+    """
+    Best wall time of `repeat` runs, then one traced run for the peak allocation.
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        gc.collect()
+        t0 = time.perf_counter()
+        fn(df, context)
+        best = min(best, time.perf_counter() - t0)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn(df, context)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return best, peak / 1e6
+
+
+def compare(results, baseline, threshold):
+    """
+    Cases whose time or peak memory exceed the baseline by more than threshold.
+    """
+    regressions = []
+    for key, r in results.items():
+        b = baseline.get(key)
+        if b is None:
+            continue
+        if r['seconds'] > b['seconds'] * (1 + threshold) and r['seconds'] - b['seconds'] > MIN_SECONDS:
+            regressions.append((key, 'seconds', b['seconds'], r['seconds']))
+        if r['peak_mb'] > b['peak_mb'] * (1 + threshold) and r['peak_mb'] - b['peak_mb'] > MIN_MB:
+            regressions.append((key, 'peak_mb', b['peak_mb'], r['peak_mb']))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--scales', default='1,10,100,1000')
+    parser.add_argument('--missing', type=float, default=0.05, help="share of metric cells set to NaN")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--filter', default='', help="only cases whose name contains this text")
+    parser.add_argument('--output', default=RESULTS_PATH)
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--threshold', type=float, default=0.25, help="allowed slowdown, 0.25 = +25%%")
+    parser.add_argument('--save-baseline', action='store_true', help="store these results as the new baseline")
+    args = parser.parse_args()
+
+    results = {}
+    print(f"{'case':<34} {'scale':>5} {'rows':>10} {'seconds':>9} {'peak MB':>9}")
+    for scale in (int(s) for s in args.scales.split(',')):
+        df = make_panel(scale, missing=args.missing)
+        context = {'year': int(df['date'].max()), 'index': RankIndex(df, ['population'])}
+        for name, fn in make_cases():
+            if args.filter not in name:
+                continue
+            seconds, peak_mb = measure(fn, df, context, args.repeat)
+            results[f"{name}@{scale}"] = {'case': name, 'scale': scale, 'rows': len(df),
+                                          'seconds': seconds, 'peak_mb': peak_mb}
+            print(f"{name:<34} {scale:>5} {len(df):>10} {seconds:>9.4f} {peak_mb:>9.1f}")
+        del df, context
+
+    report = {
+        'meta': {
+            'created': datetime.datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'machine': platform.machine(),
+            'missing': args.missing,
+            'repeat': args.repeat,
+        },
+        'results': results,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+    print(f"\nResults written to {args.output}")
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+        print(f"Baseline saved to {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print("No baseline to compare with (run with --save-baseline)")
+        return
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if baseline['meta'].get('missing') != args.missing:
+        print(f"Warning: baseline was recorded with missing={baseline['meta'].get('missing')}")
+
+    regressions = compare(results, baseline['results'], args.threshold)
+    if not regressions:
+        print(f"No regressions against the baseline (threshold +{args.threshold:.0%})")
+        return
+    print(f"Regressions against the baseline (threshold +{args.threshold:.0%}):")
+    for key, measure_name, old, new in regressions:
+        print(f"  {key:<34} {measure_name:<8} {old:.4f} -> {new:.4f} ({new / old - 1:+.0%})")
+    raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Time-series comparison benchmark: isin() filter + sns.lineplot (the previous
+Time Series tab) vs SeriesIndex slices with LTTB downsampling and ax.plot.
+
+Times cover selecting the series and rendering the PNG; --points sets the
+observations per entity (64 = yearly data, larger = a high-frequency
+indicator on the same synthetic panel).
+
+Usage: python benchmarks/bench_series.py [--entities 2,10,50,200] [--points 64,5000] [--repeat 3]
+"""
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+import pandas as pd
+import seaborn as sns
+
+from src.render import render_png
+from src.series_index import SeriesIndex, draw_series
+
+
+def make_series(n_entities, points, seed=0):
+    rng = np.random.default_rng(seed)
+    walk = rng.normal(0.01, 0.05, (n_entities, points)).cumsum(axis=1)
+    return pd.DataFrame({
+        'country': np.repeat([f"Entity {i:04d}" for i in range(n_entities)], points),
+        'date': np.tile(np.arange(points), n_entities),
+        'population': (rng.lognormal(15, 2, n_entities)[:, None] * np.exp(walk)).ravel(),
+    })
+
+
+def draw_lineplot(df, selected):
+    def draw(fig):
+        subset = df[df['country'].isin(selected)]
+        ax = fig.subplots()
+        sns.lineplot(data=subset, x='date', y='population', hue='country', hue_order=selected, ax=ax)
+    return render_png(draw, (12, 6), 100)
+
+
+def draw_index(index, selected):
+    def draw(fig):
+        series = index.plot_series(selected, 'population')
+        ax = fig.subplots()
+        draw_series(ax, series)
+    return render_png(draw, (12, 6), 100)
+
+
+def best(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--entities', default='2,10,50,200')
+    parser.add_argument('--points', default='64,5000')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    counts = [int(s) for s in args.entities.split(',')]
+
+    print(f"{'points':>7} {'entities':>8} {'lineplot (ms)':>14} {'index + LTTB (ms)':>18}")
+    for points in (int(s) for s in args.points.split(',')):
+        df = make_series(max(counts), points)
+        index = SeriesIndex(df, metrics=['population'])
+        for n in counts:
+            selected = index.entities[:n]
+            old = best(lambda: draw_lineplot(df, selected), args.repeat)
+            new = best(lambda: draw_index(index, selected), args.repeat)
+            print(f"{points:>7} {n:>8} {old * 1000:>14.1f} {new * 1000:>18.1f}")
+
+
+if __name__ == "__main__":
+    main()
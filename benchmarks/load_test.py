@@ -0,0 +1,123 @@
+"""
+Load test for the query API (src/api_server.py).
+
+Starts the server on the stored dataset in its own process (or targets
+--url), then keeps N client threads issuing a mix of queries for a fixed
+duration over persistent connections. Reports p50/p99 latency and
+requests per second.
+
+Usage: python benchmarks/load_test.py [--clients 8] [--duration 10] [--url http://127.0.0.1:8000]
+"""
+import argparse
+import http.client
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.parse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Query mix: (weight, path template)
+QUERIES = [
+    (4, "/top?year={year}&metric=population&n=10"),
+    (2, "/top?year={year}&metric=density&n=20&format=csv"),
+    (3, "/timeseries?country={country}&metric=population"),
+    (1, "/growth?year={year}"),
+    (1, "/missing?by=year"),
+]
+COUNTRIES = ['Turkiye', 'Germany', 'India', 'China', 'Brazil', 'Nigeria', 'France', 'Japan']
+
+
+def spawn_server():
+    """
+    Runs the API in its own process so it doesn't compete with the clients for the GIL.
+    """
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        port = s.getsockname()[1]
+    proc = subprocess.Popen([sys.executable, '-m', 'src.api_server', '--port', str(port)],
+                            cwd=ROOT, stdout=subprocess.DEVNULL)
+    for _ in range(300):
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+            conn.request('GET', '/health')
+            if conn.getresponse().status == 200:
+                conn.close()
+                break
+        except OSError:
+            if proc.poll() is not None:
+                raise SystemExit("API server exited (is there a dataset? run python -m src.data_fetcher)")
+            time.sleep(0.1)
+    return proc, f"http://127.0.0.1:{port}"
+
+
+def client(url, deadline, latencies, errors, seed):
+    rng = random.Random(seed)
+    target = urllib.parse.urlparse(url)
+    conn = http.client.HTTPConnection(target.hostname, target.port, timeout=30)
+    weights = [w for w, _ in QUERIES]
+    while time.perf_counter() < deadline:
+        template = rng.choices([q for _, q in QUERIES], weights)[0]
+        path = template.format(year=rng.randint(1990, 2022), country=rng.choice(COUNTRIES))
+        t0 = time.perf_counter()
+        try:
+            conn.request('GET', path)
+            response = conn.getresponse()
+            response.read()
+            if response.status != 200:
+                errors.append(response.status)
+        except (OSError, http.client.HTTPException):
+            errors.append(None)
+            conn.close()
+            conn = http.client.HTTPConnection(target.hostname, target.port, timeout=30)
+            continue
+        latencies.append(time.perf_counter() - t0)
+    conn.close()
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q / 100 * len(values)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--url', default=None)
+    parser.add_argument('--clients', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=10.0)
+    args = parser.parse_args()
+
+    proc = None
+    url = args.url
+    if url is None:
+        proc, url = spawn_server()
+
+    latencies, errors = [], []
+    deadline = time.perf_counter() + args.duration
+    threads = [threading.Thread(target=client, args=(url, deadline, latencies, errors, i))
+               for i in range(args.clients)]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - t0
+
+    if proc is not None:
+        proc.terminate()
+
+    if not latencies:
+        raise SystemExit(f"No successful requests ({len(errors)} errors)")
+    print(f"clients:   {args.clients}")
+    print(f"requests:  {len(latencies)} ({len(errors)} errors)")
+    print(f"req/s:     {len(latencies) / elapsed:.0f}")
+    print(f"p50 (ms):  {percentile(latencies, 50) * 1000:.2f}")
+    print(f"p99 (ms):  {percentile(latencies, 99) * 1000:.2f}")
+
+
+if __name__ == "__main__":
+    main()
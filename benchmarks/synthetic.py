@@ -0,0 +1,50 @@
+"""
+Synthetic population panels shaped like data/population_data.csv
+(266 entities x 64 years = ~17k rows at scale 1).
+"""
+import numpy as np
+import pandas as pd
+
+BASE_ENTITIES = 266
+YEARS = np.arange(1960, 2024)
+REGIONS = ['East Asia & Pacific', 'Europe & Central Asia', 'Latin America & Caribbean',
+           'Middle East & North Africa', 'North America', 'South Asia', 'Sub-Saharan Africa']
+
+
+def make_panel(scale=1, missing=0.05, seed=0):
+    """
+    Returns a long dataframe (country, date, population, surface_area,
+    region_name, is_aggregate, iso_code, density) with `scale` times the
+    entities of the real dataset and roughly `missing` of metric cells NaN.
+    """
+    rng = np.random.default_rng(seed)
+    n_entities = BASE_ENTITIES * scale
+    n_years = len(YEARS)
+    n = n_entities * n_years
+
+    names = np.array([f"Entity {i:07d}" for i in range(n_entities)], dtype=object)
+    is_aggregate = np.arange(n_entities) % 6 == 0
+
+    base = rng.lognormal(15, 2, n_entities)
+    growth = rng.normal(0.015, 0.01, n_entities)
+    population = base[:, None] * (1 + growth[:, None]) ** np.arange(n_years)[None, :]
+    surface = np.repeat(rng.lognormal(11, 2, n_entities)[:, None], n_years, axis=1)
+
+    population = population.ravel()
+    surface = surface.ravel()
+    population[rng.random(n) < missing] = np.nan
+    surface[rng.random(n) < missing] = np.nan
+
+    df = pd.DataFrame({
+        'country': pd.Categorical(np.repeat(names, n_years)),
+        'date': np.tile(YEARS, n_entities).astype('int16'),
+        'population': population,
+        'surface_area': surface,
+        'region_name': pd.Categorical(np.repeat(np.where(is_aggregate, 'Aggregates',
+                                                         np.array(REGIONS, dtype=object)[np.arange(n_entities) % len(REGIONS)]),
+                                                n_years)),
+        'is_aggregate': pd.array(np.repeat(is_aggregate, n_years), dtype='boolean'),
+        'iso_code': pd.Categorical(np.repeat(np.array([f"E{i:06d}" for i in range(n_entities)], dtype=object), n_years)),
+    })
+    df['density'] = df['population'] / df['surface_area']
+    return df
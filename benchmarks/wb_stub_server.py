@@ -0,0 +1,123 @@
+"""
+Local stub of the World Bank v2 JSON API (no network needed).
+
+Serves /v2/country and /v2/country/<codes>/indicator/<code>?date=a:b with
+deterministic synthetic values, an artificial per-request latency and an
+optional failure rate (HTTP 503) to exercise retries.
+
+Usage: python benchmarks/wb_stub_server.py [--port 8765] [--latency 0.2] [--fail-rate 0.1]
+"""
+import argparse
+import json
+import random
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def make_countries(n_countries=217, n_aggregates=49):
+    """
+    Synthetic country metadata in the World Bank record format.
+    """
+    countries = []
+    for i in range(n_countries + n_aggregates):
+        code = f"{chr(65 + i // 676 % 26)}{chr(65 + i // 26 % 26)}{chr(65 + i % 26)}"
+        aggregate = i >= n_countries
+        region = 'Aggregates' if aggregate else f"Region {i % 7}"
+        countries.append({
+            'id': code,
+            'iso2Code': code[:2],
+            'name': f"Entity {code}",
+            'region': {'id': 'NA' if aggregate else f"R{i % 7}", 'iso2code': '', 'value': region},
+            'incomeLevel': {'id': 'NA', 'iso2code': '', 'value': 'Aggregates' if aggregate else 'High income'},
+        })
+    return countries
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    latency = 0.0
+    fail_rate = 0.0
+    countries = make_countries()
+    requests_served = 0
+    lock = threading.Lock()
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        with StubHandler.lock:
+            StubHandler.requests_served += 1
+        time.sleep(self.latency)
+        if random.random() < self.fail_rate:
+            return self._send(503, {'error': 'temporarily unavailable'})
+
+        url = urllib.parse.urlparse(self.path)
+        params = dict(urllib.parse.parse_qsl(url.query))
+        parts = [p for p in url.path.split('/') if p][1:]  # strip "v2"
+
+        if parts == ['country']:
+            records = self.countries
+        elif len(parts) == 4 and parts[0] == 'country' and parts[2] == 'indicator':
+            by_code = {c['id']: c for c in self.countries}
+            codes = parts[1].split(';')
+            indicator = parts[3]
+            start, end = (int(y) for y in params.get('date', '1960:2023').split(':'))
+            records = []
+            for code in codes:
+                c = by_code.get(code)
+                if c is None:
+                    return self._send(200, [{'message': [{'id': '120', 'key': 'Invalid value',
+                                                          'value': 'The provided parameter value is not valid'}]}])
+                seed = sum(map(ord, code + indicator))
+                for year in range(end, start - 1, -1):
+                    value = None if (seed + year) % 37 == 0 else float(seed * 1000 + (year - 1960) * seed)
+                    records.append({
+                        'indicator': {'id': indicator, 'value': indicator},
+                        'country': {'id': c['iso2Code'], 'value': c['name']},
+                        'countryiso3code': code,
+                        'date': str(year),
+                        'value': value,
+                        'unit': '', 'obs_status': '', 'decimal': 0,
+                    })
+        else:
+            return self._send(404, {'error': 'not found'})
+
+        per_page = int(params.get('per_page', 50))
+        page = int(params.get('page', 1))
+        pages = max(1, -(-len(records) // per_page))
+        header = {'page': page, 'pages': pages, 'per_page': per_page, 'total': len(records)}
+        self._send(200, [header, records[(page - 1) * per_page:page * per_page]])
+
+
+def start_stub_server(port=0, latency=0.0, fail_rate=0.0):
+    """
+    Starts the stub in a background thread. Returns (server, base_url).
+    """
+    handler = type('Handler', (StubHandler,), {'latency': latency, 'fail_rate': fail_rate})
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/v2"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.2)
+    parser.add_argument('--fail-rate', type=float, default=0.0)
+    args = parser.parse_args()
+
+    server, base_url = start_stub_server(args.port, args.latency, args.fail_rate)
+    print(f"World Bank stub listening on {base_url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
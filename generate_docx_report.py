@@ -1,679 +1,613 @@
+import argparse
+
 from docx import Document
-from docx.shared import Inches, Pt, RGBColor
+from docx.shared import Inches, Pt
 from docx.enum.text import WD_ALIGN_PARAGRAPH
-from docx.oxml.ns import qn
-from docx.oxml import OxmlElement
-import datetime
-
-# Document oluştur
-doc = Document()
-
-# Stil ayarları
-style = doc.styles['Normal']
-style.font.name = 'Calibri'
-style.font.size = Pt(11)
-
-# ===== TITLE PAGE =====
-title = doc.add_heading('WORLD POPULATION INSIGHTS', 0)
-title.alignment = WD_ALIGN_PARAGRAPH.CENTER
-subtitle = doc.add_paragraph('Historical Population Growth Analysis and Visualization')
-subtitle.alignment = WD_ALIGN_PARAGRAPH.CENTER
-subtitle.runs[0].font.size = Pt(14)
-subtitle.runs[0].font.italic = True
-
-doc.add_paragraph()
-
-# Course Info
-doc.add_paragraph('Course: SENG 419 (1) [331440] - Introduction to Data Science')
-doc.add_paragraph('Student: Arda ÇAM (ID: 220208002)')
-doc.add_paragraph()
-doc.add_paragraph('Institution: OSTIM Technical University')
-doc.add_paragraph('Faculty of Engineering')
-doc.add_paragraph('Department of Software Engineering')
-doc.add_paragraph()
-doc.add_paragraph('Instructor: Lect. Muhammet Mustafa Ölmez')
-doc.add_paragraph()
-doc.add_paragraph(f'Date: December 11, 2025')
-
-doc.add_page_break()
-
-# ===== ABSTRACT =====
-doc.add_heading('ABSTRACT', 1)
-abstract_text = """This project presents a comprehensive data science application for analyzing and visualizing historical world population data spanning from 1960 to 2023. The application utilizes the World Bank API to fetch population statistics, surface area, and demographic indicators for 215 countries and regional aggregates. The project implements an interactive Streamlit-based dashboard that includes data quality assessment, exploratory data analysis, growth rate calculations, ranking mechanisms, and temporal trend visualization. Key findings reveal that India surpassed China as the world's most populous country by 2023, while regional analysis shows diverse population growth patterns across different continents. The application demonstrates proficiency in large dataset handling, data cleaning, statistical analysis, and interactive visualization techniques essential for modern data science practices.
+
+from src.reporting import output_path, prepare_dataset, render_charts, report_context
+from src.data_store import load_dataset
+
+
+def add_table(doc, header, rows):
+    table = doc.add_table(rows=len(rows) + 1, cols=len(header))
+    table.style = 'Light Grid Accent 1'
+    for cell, text in zip(table.rows[0].cells, header):
+        cell.text = text
+    for i, values in enumerate(rows, 1):
+        for cell, text in zip(table.rows[i].cells, values):
+            cell.text = text
+    return table
+
+
+def build_docx(ctx, output):
+    """
+    Builds the DOCX report of a report context (see src.reporting) into output.
+    """
+    # Document oluştur
+    doc = Document()
+
+    # Stil ayarları
+    style = doc.styles['Normal']
+    style.font.name = 'Calibri'
+    style.font.size = Pt(11)
+
+    # ===== TITLE PAGE =====
+    title = doc.add_heading('WORLD POPULATION INSIGHTS', 0)
+    title.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    subtitle = doc.add_paragraph('Historical Population Growth Analysis and Visualization'
+                                 + (f" — {ctx['region']}" if ctx['region'] else ''))
+    subtitle.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    subtitle.runs[0].font.size = Pt(14)
+    subtitle.runs[0].font.italic = True
+
+    doc.add_paragraph()
+
+    # Course Info
+    doc.add_paragraph('Course: SENG 419 (1) [331440] - Introduction to Data Science')
+    doc.add_paragraph('Student: Arda ÇAM (ID: 220208002)')
+    doc.add_paragraph()
+    doc.add_paragraph('Institution: OSTIM Technical University')
+    doc.add_paragraph('Faculty of Engineering')
+    doc.add_paragraph('Department of Software Engineering')
+    doc.add_paragraph()
+    doc.add_paragraph('Instructor: Lect. Muhammet Mustafa Ölmez')
+    doc.add_paragraph()
+    doc.add_paragraph(f'Date: December 11, 2025')
+
+    doc.add_page_break()
+
+    # ===== ABSTRACT =====
+    doc.add_heading('ABSTRACT', 1)
+    abstract_text = f"""This project presents a comprehensive data science application for analyzing and visualizing historical world population data spanning from {ctx['first_year']} to {ctx['last_year']}. The application utilizes the World Bank API to fetch population statistics, surface area, and demographic indicators for {ctx['entities']}. The project implements an interactive Streamlit-based dashboard that includes data quality assessment, exploratory data analysis, growth rate calculations, ranking mechanisms, and temporal trend visualization. Key findings reveal that India surpassed China as the world's most populous country by 2023, while regional analysis shows diverse population growth patterns across different continents. The application demonstrates proficiency in large dataset handling, data cleaning, statistical analysis, and interactive visualization techniques essential for modern data science practices.
 
 Keywords: World Population Analysis, Data Visualization, Growth Rate Calculation, Time Series Analysis, Interactive Dashboard, Data Quality Assessment"""
-doc.add_paragraph(abstract_text)
-
-doc.add_page_break()
-
-# ===== TABLE OF CONTENTS =====
-doc.add_heading('TABLE OF CONTENTS', 1)
-toc_items = [
-    '1. INTRODUCTION',
-    '   1.1 Background',
-    '   1.2 Motivation',
-    '   1.3 Project Significance',
-    '2. PROJECT DEFINITION AND SCOPE',
-    '   2.1 Objective',
-    '   2.2 Scope',
-    '   2.3 Dataset Specification',
-    '   2.4 Key Metrics',
-    '3. SYSTEM ARCHITECTURE',
-    '   3.1 Architecture Overview',
-    '   3.2 Technology Stack',
-    '   3.3 Module Architecture',
-    '   3.4 Data Flow Diagram',
-    '   3.5 Caching Strategy',
-    '4. METHODOLOGY',
-    '   4.1 Data Collection',
-    '   4.2 Data Processing Pipeline',
-    '   4.3 Statistical Analysis',
-    '   4.4 Visualization Techniques',
-    '5. PROJECT RESULTS AND FINDINGS',
-    '6. TECHNICAL CHALLENGES AND SOLUTIONS',
-    '7. PROJECT TIMELINE',
-    '8. PROJECT BUDGET',
-    '9. REFERENCES',
-    '10. CONCLUSION'
-]
-for item in toc_items:
-    doc.add_paragraph(item, style='List Bullet')
-
-doc.add_page_break()
-
-# ===== 1. INTRODUCTION =====
-doc.add_heading('1. INTRODUCTION', 1)
-
-doc.add_heading('1.1 Background', 2)
-doc.add_paragraph(
-    "Understanding global population dynamics is crucial for policymakers, researchers, and organizations worldwide. Population growth rates, distribution patterns, and density metrics provide insights into resource allocation, development planning, and demographic transitions. With the exponential growth of available data, the ability to efficiently process, analyze, and visualize large datasets has become a fundamental competency in data science."
-)
-
-doc.add_heading('1.2 Motivation', 2)
-doc.add_paragraph(
-    "Traditional population analysis approaches often rely on static reports and limited visualization capabilities. This project addresses the need for:"
-)
-motivations = [
-    "Interactive Analysis: Real-time exploration of population data across different years and regions",
-    "Data Quality Transparency: Clear assessment of data completeness and reliability",
-    "Automated Insights: Systematic identification of trends, rankings, and anomalies",
-    "Accessibility: User-friendly interface for non-technical stakeholders"
-]
-for mot in motivations:
-    doc.add_paragraph(mot, style='List Bullet')
-
-doc.add_heading('1.3 Project Significance', 2)
-doc.add_paragraph(
-    "This project demonstrates essential data science competencies:"
-)
-competencies = [
-    "Integration with external APIs (World Bank)",
-    "Handling large-scale datasets (17,020 rows × multiple indicators)",
-    "Statistical computation (growth rates, aggregations)",
-    "Interactive visualization and dashboard development",
-    "Data quality assessment and cleaning strategies"
-]
-for comp in competencies:
-    doc.add_paragraph(comp, style='List Bullet')
-
-doc.add_page_break()
-
-# ===== 2. PROJECT DEFINITION AND SCOPE =====
-doc.add_heading('2. PROJECT DEFINITION AND SCOPE', 1)
-
-doc.add_heading('2.1 Objective', 2)
-doc.add_paragraph(
-    "Develop an interactive web-based application to analyze and visualize historical world population growth rates, enabling users to:"
-)
-objectives = [
-    "Explore population trends across 1960-2023",
-    "Identify and rank countries by population, density, and growth metrics",
-    "Assess data quality and apply appropriate cleaning strategies",
-    "Compare population dynamics across regions and time periods"
-]
-for obj in objectives:
-    doc.add_paragraph(obj, style='List Bullet')
-
-doc.add_heading('2.2 Scope', 2)
-
-doc.add_paragraph('Included:')
-included = [
-    "Data fetching from World Bank API",
-    "Processing of 215 countries and regional aggregates",
-    "Calculation of population growth rates",
-    "Interactive dashboard with multiple analysis perspectives",
-    "Data quality assessment tools",
-    "Temporal trend visualization",
-    "Ranking and comparison analysis"
-]
-for inc in included:
-    doc.add_paragraph(inc, style='List Bullet')
-
-doc.add_paragraph('Excluded:')
-excluded = [
-    "Predictive modeling and forecasting",
-    "Machine learning-based clustering",
-    "Advanced statistical hypothesis testing",
-    "Mobile application development"
-]
-for exc in excluded:
-    doc.add_paragraph(exc, style='List Bullet')
-
-doc.add_heading('2.3 Dataset Specification', 2)
-
-# Table
-table = doc.add_table(rows=9, cols=2)
-table.style = 'Light Grid Accent 1'
-table_cells = table.rows[0].cells
-table_cells[0].text = 'Attribute'
-table_cells[1].text = 'Value'
-
-data = [
-    ('Data Source', 'World Bank Open Data API'),
-    ('Time Period', '1960-2023 (63 years)'),
-    ('Number of Entities', '215 (countries + regional aggregates)'),
-    ('Total Rows', '17,020'),
-    ('File Size', '1.5 MB'),
-    ('Key Indicators', 'Total Population (SP.POP.TOTL), Surface Area (AG.LND.TOTL.K2)'),
-    ('Format', 'CSV (cached locally)'),
-    ('Data Completeness', '~95%'),
-]
-
-for i, (attr, val) in enumerate(data, 1):
-    row = table.rows[i].cells
-    row[0].text = attr
-    row[1].text = val
-
-doc.add_heading('2.4 Key Metrics', 2)
-doc.add_paragraph('Primary Metrics:')
-metrics = [
-    "Population (SP.POP.TOTL): Total population count",
-    "Surface Area (AG.LND.TOTL.K2): Land area in km²",
-    "Population Density: Calculated as Population / Surface Area",
-    "Growth Rate: Year-over-year percentage change in population"
-]
-for metric in metrics:
-    doc.add_paragraph(metric, style='List Bullet')
-
-doc.add_page_break()
-
-# ===== 3. SYSTEM ARCHITECTURE =====
-doc.add_heading('3. SYSTEM ARCHITECTURE', 1)
-
-doc.add_heading('3.1 Architecture Overview', 2)
-doc.add_paragraph(
-    "The application follows a Layered Architecture Pattern with separation of concerns across data, processing, and presentation layers."
-)
-
-# Technology Stack Table
-doc.add_heading('3.2 Technology Stack', 2)
-tech_table = doc.add_table(rows=9, cols=4)
-tech_table.style = 'Light Grid Accent 1'
-header = tech_table.rows[0].cells
-header[0].text = 'Layer'
-header[1].text = 'Technology'
-header[2].text = 'Purpose'
-header[3].text = 'Version'
-
-tech_data = [
-    ('Framework', 'Streamlit', 'Interactive web UI', 'Latest'),
-    ('Data Processing', 'Pandas', 'Data manipulation & analysis', '1.5+'),
-    ('Visualization', 'Plotly', 'Interactive charts & maps', 'Latest'),
-    ('Visualization', 'Matplotlib/Seaborn', 'Statistical plots', 'Latest'),
-    ('API Client', 'wbdata', 'World Bank API access', 'Latest'),
-    ('Data Format', 'CSV', 'Data persistence', '-'),
-    ('Language', 'Python', 'Core programming', '3.10+'),
-    ('Environment', 'venv', 'Virtual environment', '-'),
-]
-
-for i, (layer, tech, purpose, version) in enumerate(tech_data, 1):
-    row = tech_table.rows[i].cells
-    row[0].text = layer
-    row[1].text = tech
-    row[2].text = purpose
-    row[3].text = version
-
-doc.add_heading('3.3 Module Architecture', 2)
-
-doc.add_heading('3.3.1 Data Fetcher Module (src/data_fetcher.py)', 3)
-fetcher_table = doc.add_table(rows=4, cols=2)
-fetcher_table.style = 'Light Grid Accent 1'
-f_header = fetcher_table.rows[0].cells
-f_header[0].text = 'Component'
-f_header[1].text = 'Responsibility'
-
-fetcher_data = [
-    ('fetch_and_process_data()', 'Connects to World Bank API, extracts population and surface area indicators, enriches with ISO codes and regional metadata'),
-    ('Data Indicators', 'SP.POP.TOTL (population), AG.LND.TOTL.K2 (surface area)'),
-    ('Date Range', '1960-2023 (configurable)'),
-]
-
-for i, (comp, resp) in enumerate(fetcher_data, 1):
-    row = fetcher_table.rows[i].cells
-    row[0].text = comp
-    row[1].text = resp
-
-doc.add_heading('3.3.2 Data Processor Module (src/data_processor.py)', 3)
-proc_table = doc.add_table(rows=5, cols=4)
-proc_table.style = 'Light Grid Accent 1'
-p_header = proc_table.rows[0].cells
-p_header[0].text = 'Function'
-p_header[1].text = 'Input'
-p_header[2].text = 'Output'
-p_header[3].text = 'Purpose'
-
-proc_data = [
-    ('calculate_missing_stats()', 'DataFrame', 'Dict with statistics', 'Assess data quality'),
-    ('clean_data()', 'DataFrame, strategy', 'Cleaned DataFrame', 'Remove/fill missing values'),
-    ('calculate_growth_rate()', 'DataFrame', 'DataFrame with growth_rate', 'Compute year-over-year change'),
-    ('get_top_n_countries()', 'DataFrame, year, metric, n', 'Top-N sorted DataFrame', 'Rank entities by metric'),
-]
-
-for i, (func, inp, out, purp) in enumerate(proc_data, 1):
-    row = proc_table.rows[i].cells
-    row[0].text = func
-    row[1].text = inp
-    row[2].text = out
-    row[3].text = purp
-
-doc.add_heading('3.3.3 Presentation Layer (app.py)', 3)
-ui_table = doc.add_table(rows=6, cols=2)
-ui_table.style = 'Light Grid Accent 1'
-u_header = ui_table.rows[0].cells
-u_header[0].text = 'Tab'
-u_header[1].text = 'Functionality'
-
-ui_data = [
-    ('Data Health & Cleaning', 'Missing value visualization, quality metrics, interactive cleaning strategies'),
-    ('Overview', 'Year selection slider, choropleth map, scatter plot, regional filtering'),
-    ('Rankings & Growth', 'Top-N analysis, bar charts, growth rate distribution'),
-    ('Time Series Analysis', 'Multi-country population trend comparison'),
-    ('Raw Data', 'Tabular data explorer for detailed inspection'),
-]
-
-for i, (tab, func) in enumerate(ui_data, 1):
-    row = ui_table.rows[i].cells
-    row[0].text = tab
-    row[1].text = func
-
-doc.add_page_break()
-
-# ===== 4. METHODOLOGY =====
-doc.add_heading('4. METHODOLOGY', 1)
-
-doc.add_heading('4.1 Data Collection', 2)
-doc.add_paragraph('Source: World Bank Open Data API')
-doc.add_paragraph(
-    "The World Bank API provides standardized, verified demographic data accessed through the wbdata Python library. Population (SP.POP.TOTL) and surface area (AG.LND.TOTL.K2) indicators were fetched for all 215 countries and regional aggregates spanning 1960-2023."
-)
-
-doc.add_heading('4.2 Data Processing Pipeline', 2)
-
-doc.add_heading('4.2.1 Data Cleaning Strategies', 3)
-clean_table = doc.add_table(rows=4, cols=4)
-clean_table.style = 'Light Grid Accent 1'
-c_header = clean_table.rows[0].cells
-c_header[0].text = 'Strategy'
-c_header[1].text = 'Method'
-c_header[2].text = 'Use Case'
-c_header[3].text = 'Formula'
-
-clean_data_rows = [
-    ('Drop', 'Remove rows with missing values', 'When data is sparse', 'df.dropna()'),
-    ('Fill Mean', 'Replace with country average', 'Temporal gaps', 'df.fillna(df.groupby("country").transform("mean"))'),
-    ('Interpolate', 'Linear interpolation over time', 'Time series continuity', 'df.groupby("country")["value"].interpolate()'),
-]
-
-for i, (strat, method, use, formula) in enumerate(clean_data_rows, 1):
-    row = clean_table.rows[i].cells
-    row[0].text = strat
-    row[1].text = method
-    row[2].text = use
-    row[3].text = formula
-
-doc.add_heading('4.2.2 Derived Metrics', 3)
-
-doc.add_paragraph('Population Density:')
-doc.add_paragraph('density = population / surface_area', style='List Number')
-
-doc.add_paragraph('Growth Rate (Year-over-Year):')
-doc.add_paragraph('growth_rate = ((population_t - population_t-1) / population_t-1) × 100', style='List Number')
-
-doc.add_paragraph('Missing Data Ratio:')
-doc.add_paragraph('missing_ratio = (total_missing_cells / total_cells) × 100', style='List Number')
-
-doc.add_heading('4.3 Visualization Techniques', 2)
-
-doc.add_heading('4.3.1 Data Quality (Tab 1)', 3)
-doc.add_paragraph('Pie Chart (Fill Rate): Displays data completeness percentage')
-doc.add_paragraph('Heatmap (Missing Data Pattern): Reveals systematic missing patterns')
-
-doc.add_heading('4.3.2 Overview (Tab 2)', 3)
-doc.add_paragraph('Choropleth Map: Geographic visualization of population distribution using Plotly')
-doc.add_paragraph('Scatter Plot: Population vs Surface Area with density-based sizing')
-
-doc.add_heading('4.3.3 Rankings & Growth (Tab 3)', 3)
-doc.add_paragraph('Bar Chart: Horizontal bars showing Top-N countries by selected metric')
-doc.add_paragraph('Histogram: Growth rate distribution with kernel density estimation')
-
-doc.add_heading('4.3.4 Time Series (Tab 4)', 3)
-doc.add_paragraph('Line Plot: Multi-country population trends over 63 years')
-
-# [METODOLOJI İÇİN FOTO ALANLARI]
-doc.add_paragraph()
-doc.add_paragraph('___________________________________________________________')
-doc.add_paragraph('[SCREENSHOT 1: Data Health & Cleaning Tab]')
-doc.add_paragraph('(Missing value heatmap ve pie chart görseli buraya eklenecek)')
-doc.add_paragraph('___________________________________________________________')
-
-doc.add_paragraph()
-doc.add_paragraph('___________________________________________________________')
-doc.add_paragraph('[SCREENSHOT 2: Overview Tab - Interactive Dashboard]')
-doc.add_paragraph('(Choropleth harita ve scatter plot görseli buraya eklenecek)')
-doc.add_paragraph('___________________________________________________________')
-
-doc.add_paragraph()
-doc.add_paragraph('___________________________________________________________')
-doc.add_paragraph('[SCREENSHOT 3: Rankings & Growth Tab]')
-doc.add_paragraph('(Top-N bar chart ve growth rate histogram görseli buraya eklenecek)')
-doc.add_paragraph('___________________________________________________________')
-
-doc.add_paragraph()
-doc.add_paragraph('___________________________________________________________')
-doc.add_paragraph('[SCREENSHOT 4: Time Series Analysis Tab]')
-doc.add_paragraph('(Multi-country time series line plot görseli buraya eklenecek)')
-doc.add_paragraph('___________________________________________________________')
-
-doc.add_page_break()
-
-# ===== 5. RESULTS AND FINDINGS =====
-doc.add_heading('5. PROJECT RESULTS AND FINDINGS', 1)
-
-doc.add_heading('5.1 Dataset Overview', 2)
-overview_table = doc.add_table(rows=7, cols=2)
-overview_table.style = 'Light Grid Accent 1'
-o_header = overview_table.rows[0].cells
-o_header[0].text = 'Metric'
-o_header[1].text = 'Value'
-
-overview_data = [
-    ('Total Entities', '215 countries & regional aggregates'),
-    ('Time Period', '1960-2023 (63 years)'),
-    ('Total Data Points', '17,020 rows'),
-    ('File Size', '1.5 MB'),
-    ('Data Completeness', '~95%'),
-    ('Temporal Coverage', '63 consecutive years'),
-]
-
-for i, (metric, val) in enumerate(overview_data, 1):
-    row = overview_table.rows[i].cells
-    row[0].text = metric
-    row[1].text = val
-
-doc.add_heading('5.2 Key Findings', 2)
-
-doc.add_heading('5.2.1 Top 5 Most Populous Countries (2023)', 3)
-pop_table = doc.add_table(rows=6, cols=3)
-pop_table.style = 'Light Grid Accent 1'
-pop_header = pop_table.rows[0].cells
-pop_header[0].text = 'Rank'
-pop_header[1].text = 'Country'
-pop_header[2].text = 'Population'
-
-pop_data = [
-    ('1', 'India', '1,417,173,173'),
-    ('2', 'China', '1,425,887,337'),
-    ('3', 'United States', '338,289,857'),
-    ('4', 'Indonesia', '275,501,339'),
-    ('5', 'Pakistan', '231,402,117'),
-]
-
-for i, (rank, country, pop) in enumerate(pop_data, 1):
-    row = pop_table.rows[i].cells
-    row[0].text = rank
-    row[1].text = country
-    row[2].text = pop
-
-doc.add_paragraph('Insight: India\'s rapid population growth resulted in surpassing China as the world\'s most populous country in 2023, marking a significant demographic milestone.')
-
-doc.add_heading('5.2.2 Top 5 Fastest Growing Countries (2023)', 3)
-growth_table = doc.add_table(rows=6, cols=3)
-growth_table.style = 'Light Grid Accent 1'
-g_header = growth_table.rows[0].cells
-g_header[0].text = 'Rank'
-g_header[1].text = 'Country'
-g_header[2].text = 'Growth Rate'
-
-growth_data = [
-    ('1', 'Oman', '5.87%'),
-    ('2', 'Kuwait', '5.42%'),
-    ('3', 'Syrian Arab Republic', '4.89%'),
-    ('4', 'Singapore', '3.95%'),
-    ('5', 'Saudi Arabia', '3.47%'),
-]
-
-for i, (rank, country, rate) in enumerate(growth_data, 1):
-    row = growth_table.rows[i].cells
-    row[0].text = rank
-    row[1].text = country
-    row[2].text = rate
-
-doc.add_paragraph('Insight: Middle Eastern countries dominate rapid growth metrics, driven by high immigration, young population structures, and economic development.')
-
-doc.add_heading('5.2.3 Top 5 Highest Population Density (2023)', 3)
-density_table = doc.add_table(rows=6, cols=3)
-density_table.style = 'Light Grid Accent 1'
-d_header = density_table.rows[0].cells
-d_header[0].text = 'Rank'
-d_header[1].text = 'Country'
-d_header[2].text = 'Density (pop/km²)'
-
-density_data = [
-    ('1', 'Macao SAR, China', '21,418'),
-    ('2', 'Monaco', '19,320'),
-    ('3', 'Singapore', '8,292'),
-    ('4', 'Hong Kong SAR, China', '7,622'),
-    ('5', 'Gibraltar', '4,348'),
-]
-
-for i, (rank, country, dens) in enumerate(density_data, 1):
-    row = density_table.rows[i].cells
-    row[0].text = rank
-    row[1].text = country
-    row[2].text = dens
-
-doc.add_paragraph('Insight: City-states and urban regions exhibit extreme population density due to geographic constraints and economic specialization.')
-
-doc.add_heading('5.2.4 Data Quality Assessment', 3)
-quality_table = doc.add_table(rows=5, cols=3)
-quality_table.style = 'Light Grid Accent 1'
-q_header = quality_table.rows[0].cells
-q_header[0].text = 'Metric'
-q_header[1].text = 'Value'
-q_header[2].text = 'Assessment'
-
-quality_data = [
-    ('Total Data Points', '17,020', '-'),
-    ('Missing Values', '~850', '5%'),
-    ('Complete Time Series', '~195 countries', '91%'),
-    ('Data Accuracy', 'High', 'World Bank verified'),
-]
-
-for i, (metric, val, assess) in enumerate(quality_data, 1):
-    row = quality_table.rows[i].cells
-    row[0].text = metric
-    row[1].text = val
-    row[2].text = assess
-
-doc.add_page_break()
-
-# ===== 6. TECHNICAL CHALLENGES =====
-doc.add_heading('6. TECHNICAL CHALLENGES AND SOLUTIONS', 1)
-
-doc.add_heading('6.1 Challenge 1: API Rate Limiting and Network Stability', 2)
-doc.add_paragraph('Problem: World Bank API connectivity issues, data fetching timeouts, multiple requests for indicator retrieval')
-doc.add_paragraph('Solution: Implemented local caching mechanism using @st.cache_data decorator')
-doc.add_paragraph('Result: Reduced API calls by 95%, improved load time from 5s to <1s, increased reliability through fallback to local data')
-
-doc.add_heading('6.2 Challenge 2: Missing Data Handling', 2)
-doc.add_paragraph('Problem: Plotly error with NaN values in size parameter, visualization failures')
-doc.add_paragraph('Solution: Data validation and NaN handling before visualization using fillna(0)')
-doc.add_paragraph('Result: Eliminated rendering errors, improved robustness of visualization pipeline')
-
-doc.add_heading('6.3 Challenge 3: Module Import Structure', 2)
-doc.add_paragraph('Problem: ModuleNotFoundError for src.data_fetcher, PYTHONPATH configuration issues')
-doc.add_paragraph('Solution: Proper package structure with __init__.py files, clear module organization')
-doc.add_paragraph('Result: Clean, maintainable code structure, professional project layout')
-
-doc.add_heading('6.4 Challenge 4: Data Volume and Performance', 2)
-doc.add_paragraph('Problem: 17,020 rows × multiple indicators caused memory and rendering constraints')
-doc.add_paragraph('Solution: Selective visualization and data sampling strategies')
-doc.add_paragraph('Result: Maintained real-time interactivity, preserved analytical fidelity')
-
-doc.add_page_break()
-
-# ===== 7. PROJECT TIMELINE =====
-doc.add_heading('7. PROJECT TIMELINE', 1)
-
-doc.add_heading('Week 1: Foundation & Data Collection', 2)
-week1_table = doc.add_table(rows=6, cols=3)
-week1_table.style = 'Light Grid Accent 1'
-w1_header = week1_table.rows[0].cells
-w1_header[0].text = 'Day'
-w1_header[1].text = 'Task'
-w1_header[2].text = 'Status'
-
-week1_data = [
-    ('Nov 27', 'Project setup, environment configuration', '✓ Complete'),
-    ('Nov 28', 'World Bank API integration', '✓ Complete'),
-    ('Nov 29', 'Data processing pipeline implementation', '✓ Complete'),
-    ('Nov 30', 'Initial Streamlit dashboard structure', '✓ Complete'),
-    ('Dec 1', 'Data Health & Cleaning tab', '✓ Complete'),
-]
-
-for i, (day, task, status) in enumerate(week1_data, 1):
-    row = week1_table.rows[i].cells
-    row[0].text = day
-    row[1].text = task
-    row[2].text = status
-
-doc.add_heading('Week 2: Analysis & Enhancement', 2)
-week2_table = doc.add_table(rows=8, cols=3)
-week2_table.style = 'Light Grid Accent 1'
-w2_header = week2_table.rows[0].cells
-w2_header[0].text = 'Day'
-w2_header[1].text = 'Task'
-w2_header[2].text = 'Status'
-
-week2_data = [
-    ('Dec 2', 'Overview tab with choropleth map', '✓ Complete'),
-    ('Dec 3', 'Rankings & Growth tab', '✓ Complete'),
-    ('Dec 4', 'Time Series Analysis tab', '✓ Complete'),
-    ('Dec 5', 'Bug fixes and error handling', '✓ Complete'),
-    ('Dec 6', 'Code documentation and UI translation', '✓ Complete'),
-    ('Dec 7', 'Final testing and optimization', '✓ Complete'),
-    ('Dec 8-11', 'Final refinements and report preparation', '✓ Complete'),
-]
-
-for i, (day, task, status) in enumerate(week2_data, 1):
-    row = week2_table.rows[i].cells
-    row[0].text = day
-    row[1].text = task
-    row[2].text = status
-
-doc.add_paragraph('Total Development Time: 15 days')
-doc.add_paragraph('Estimated Development Hours: 60 hours')
-
-doc.add_page_break()
-
-# ===== 8. PROJECT BUDGET =====
-doc.add_heading('8. PROJECT BUDGET', 1)
-
-budget_table = doc.add_table(rows=10, cols=4)  # 9 satırdan 10 satıra değiştir
-budget_table.style = 'Light Grid Accent 1'
-b_header = budget_table.rows[0].cells
-b_header[0].text = 'Category'
-b_header[1].text = 'Item'
-b_header[2].text = 'Cost'
-b_header[3].text = 'Notes'
-
-budget_data = [
-    ('Software', 'Streamlit', '$0', 'Open source'),
-    ('Software', 'Pandas', '$0', 'Open source'),
-    ('Software', 'Plotly', '$0', 'Free tier'),
-    ('Software', 'Matplotlib/Seaborn', '$0', 'Open source'),
-    ('Software', 'wbdata', '$0', 'Open source'),
-    ('Infrastructure', 'Cloud Hosting', '$0', 'Free tier available'),
-    ('Data', 'World Bank API', '$0', 'Public data, no fees'),
-    ('Development', 'IDE/Tools', '$0', 'VS Code (free)'),
-]
-
-for i, (cat, item, cost, notes) in enumerate(budget_data, 1):
-    row = budget_table.rows[i].cells
-    row[0].text = cat
-    row[1].text = item
-    row[2].text = cost
-    row[3].text = notes
-
-total_row = budget_table.rows[9].cells  # Şimdi 10 satırdan 9. satır var
-total_row[0].text = 'TOTAL BUDGET'
-total_row[2].text = '$0'
-total_row[3].text = 'Fully open-source solution'
-
-doc.add_paragraph('Budget Efficiency: 100% open-source technology stack with no licensing fees.')
-
-doc.add_page_break()
-
-# ===== 9. REFERENCES =====
-doc.add_heading('9. REFERENCES', 1)
-
-doc.add_heading('9.1 Data Sources', 2)
-
-references = [
-    ('World Bank Open Data. (2024). World Bank API. Retrieved from https://data.worldbank.org/', 'Creative Commons Attribution 4.0'),
-    ('World Bank. (2024). SP.POP.TOTL - Total Population Indicator. https://data.worldbank.org/indicator/SP.POP.TOTL', 'Standardized population statistics'),
-    ('World Bank. (2024). AG.LND.TOTL.K2 - Land Area Indicator. https://data.worldbank.org/indicator/AG.LND.TOTL.K2', 'Measured in square kilometers'),
-]
-
-for ref, note in references:
-    p = doc.add_paragraph(ref)
-    p.paragraph_format.left_indent = Inches(0.5)
-
-doc.add_heading('9.2 Software Documentation', 2)
-
-software_refs = [
-    'Streamlit. (2024). "Streamlit Documentation." https://docs.streamlit.io/',
-    'Pandas Development Team. (2024). "Pandas Documentation." https://pandas.pydata.org/docs/',
-    'Plotly Technologies. (2024). "Plotly Python Documentation." https://plotly.com/python/',
-    'Matplotlib Development Team. (2024). "Matplotlib Documentation." https://matplotlib.org/',
-    'Seaborn Development Team. (2024). "Seaborn Documentation." https://seaborn.pydata.org/',
-    'wbdata Library. (2024). "World Bank Data Library." https://github.com/mwouts/world_bank_data',
-]
-
-for ref in software_refs:
-    p = doc.add_paragraph(ref)
-    p.paragraph_format.left_indent = Inches(0.5)
-
-doc.add_heading('9.3 Academic References', 2)
-
-academic_refs = [
-    'United Nations. (2023). "World Population Prospects 2022." ISBN: 978-92-1-148364-8',
-    'Keyfitz, N., & Flieger, W. (1990). "World Population Growth and Aging." University of Chicago Press',
-    'Lee, R. D. (2011). "The Outlook for Population Growth." Science, 333(6042), 569-573.',
-    'McKinney, W. (2012). "Python for Data Analysis." O\'Reilly Media',
-    'VanderPlas, J. (2016). "Python Data Science Handbook." O\'Reilly Media',
-]
-
-for ref in academic_refs:
-    p = doc.add_paragraph(ref)
-    p.paragraph_format.left_indent = Inches(0.5)
-
-doc.add_page_break()
-
-# ===== 10. CONCLUSION =====
-doc.add_heading('10. CONCLUSION', 1)
-
-conclusion = """This project successfully demonstrates comprehensive data science competencies through the development of an interactive web application for analyzing historical world population dynamics. The application processes over 17,000 data points spanning 63 years across 215 countries and regions, implementing sophisticated data cleaning, statistical analysis, and interactive visualization techniques.
+    doc.add_paragraph(abstract_text)
+
+    doc.add_page_break()
+
+    # ===== TABLE OF CONTENTS =====
+    doc.add_heading('TABLE OF CONTENTS', 1)
+    toc_items = [
+        '1. INTRODUCTION',
+        '   1.1 Background',
+        '   1.2 Motivation',
+        '   1.3 Project Significance',
+        '2. PROJECT DEFINITION AND SCOPE',
+        '   2.1 Objective',
+        '   2.2 Scope',
+        '   2.3 Dataset Specification',
+        '   2.4 Key Metrics',
+        '3. SYSTEM ARCHITECTURE',
+        '   3.1 Architecture Overview',
+        '   3.2 Technology Stack',
+        '   3.3 Module Architecture',
+        '   3.4 Data Flow Diagram',
+        '   3.5 Caching Strategy',
+        '4. METHODOLOGY',
+        '   4.1 Data Collection',
+        '   4.2 Data Processing Pipeline',
+        '   4.3 Statistical Analysis',
+        '   4.4 Visualization Techniques',
+        '5. PROJECT RESULTS AND FINDINGS',
+        '6. TECHNICAL CHALLENGES AND SOLUTIONS',
+        '7. PROJECT TIMELINE',
+        '8. PROJECT BUDGET',
+        '9. REFERENCES',
+        '10. CONCLUSION'
+    ]
+    for item in toc_items:
+        doc.add_paragraph(item, style='List Bullet')
+
+    doc.add_page_break()
+
+    # ===== 1. INTRODUCTION =====
+    doc.add_heading('1. INTRODUCTION', 1)
+
+    doc.add_heading('1.1 Background', 2)
+    doc.add_paragraph(
+        "Understanding global population dynamics is crucial for policymakers, researchers, and organizations worldwide. Population growth rates, distribution patterns, and density metrics provide insights into resource allocation, development planning, and demographic transitions. With the exponential growth of available data, the ability to efficiently process, analyze, and visualize large datasets has become a fundamental competency in data science."
+    )
+
+    doc.add_heading('1.2 Motivation', 2)
+    doc.add_paragraph(
+        "Traditional population analysis approaches often rely on static reports and limited visualization capabilities. This project addresses the need for:"
+    )
+    motivations = [
+        "Interactive Analysis: Real-time exploration of population data across different years and regions",
+        "Data Quality Transparency: Clear assessment of data completeness and reliability",
+        "Automated Insights: Systematic identification of trends, rankings, and anomalies",
+        "Accessibility: User-friendly interface for non-technical stakeholders"
+    ]
+    for mot in motivations:
+        doc.add_paragraph(mot, style='List Bullet')
+
+    doc.add_heading('1.3 Project Significance', 2)
+    doc.add_paragraph(
+        "This project demonstrates essential data science competencies:"
+    )
+    competencies = [
+        "Integration with external APIs (World Bank)",
+        f"Handling large-scale datasets ({ctx['row_count']} rows × multiple indicators)",
+        "Statistical computation (growth rates, aggregations)",
+        "Interactive visualization and dashboard development",
+        "Data quality assessment and cleaning strategies"
+    ]
+    for comp in competencies:
+        doc.add_paragraph(comp, style='List Bullet')
+
+    doc.add_page_break()
+
+    # ===== 2. PROJECT DEFINITION AND SCOPE =====
+    doc.add_heading('2. PROJECT DEFINITION AND SCOPE', 1)
+
+    doc.add_heading('2.1 Objective', 2)
+    doc.add_paragraph(
+        "Develop an interactive web-based application to analyze and visualize historical world population growth rates, enabling users to:"
+    )
+    objectives = [
+        f"Explore population trends across {ctx['first_year']}-{ctx['last_year']}",
+        "Identify and rank countries by population, density, and growth metrics",
+        "Assess data quality and apply appropriate cleaning strategies",
+        "Compare population dynamics across regions and time periods"
+    ]
+    for obj in objectives:
+        doc.add_paragraph(obj, style='List Bullet')
+
+    doc.add_heading('2.2 Scope', 2)
+
+    doc.add_paragraph('Included:')
+    included = [
+        "Data fetching from World Bank API",
+        f"Processing of {ctx['entities']}",
+        "Calculation of population growth rates",
+        "Interactive dashboard with multiple analysis perspectives",
+        "Data quality assessment tools",
+        "Temporal trend visualization",
+        "Ranking and comparison analysis"
+    ]
+    for inc in included:
+        doc.add_paragraph(inc, style='List Bullet')
+
+    doc.add_paragraph('Excluded:')
+    excluded = [
+        "Predictive modeling and forecasting",
+        "Machine learning-based clustering",
+        "Advanced statistical hypothesis testing",
+        "Mobile application development"
+    ]
+    for exc in excluded:
+        doc.add_paragraph(exc, style='List Bullet')
+
+    doc.add_heading('2.3 Dataset Specification', 2)
+
+    # Table
+    data = [
+        ('Data Source', 'World Bank Open Data API'),
+        ('Time Period', f"{ctx['first_year']}-{ctx['last_year']} ({ctx['year_span']} years)"),
+        ('Number of Entities', ctx['entities']),
+        ('Total Rows', ctx['row_count']),
+        ('File Size', ctx['file_size']),
+        ('Key Indicators', 'Total Population (SP.POP.TOTL), Surface Area (AG.LND.TOTL.K2)'),
+        ('Format', 'CSV (cached locally)'),
+        ('Data Completeness', ctx['completeness']),
+    ]
+    add_table(doc, ('Attribute', 'Value'), data)
+
+    doc.add_heading('2.4 Key Metrics', 2)
+    doc.add_paragraph('Primary Metrics:')
+    metrics = [
+        "Population (SP.POP.TOTL): Total population count",
+        "Surface Area (AG.LND.TOTL.K2): Land area in km²",
+        "Population Density: Calculated as Population / Surface Area",
+        "Growth Rate: Year-over-year percentage change in population"
+    ]
+    for metric in metrics:
+        doc.add_paragraph(metric, style='List Bullet')
+
+    doc.add_page_break()
+
+    # ===== 3. SYSTEM ARCHITECTURE =====
+    doc.add_heading('3. SYSTEM ARCHITECTURE', 1)
+
+    doc.add_heading('3.1 Architecture Overview', 2)
+    doc.add_paragraph(
+        "The application follows a Layered Architecture Pattern with separation of concerns across data, processing, and presentation layers."
+    )
+
+    # Technology Stack Table
+    doc.add_heading('3.2 Technology Stack', 2)
+    tech_table = doc.add_table(rows=9, cols=4)
+    tech_table.style = 'Light Grid Accent 1'
+    header = tech_table.rows[0].cells
+    header[0].text = 'Layer'
+    header[1].text = 'Technology'
+    header[2].text = 'Purpose'
+    header[3].text = 'Version'
+
+    tech_data = [
+        ('Framework', 'Streamlit', 'Interactive web UI', 'Latest'),
+        ('Data Processing', 'Pandas', 'Data manipulation & analysis', '1.5+'),
+        ('Visualization', 'Plotly', 'Interactive charts & maps', 'Latest'),
+        ('Visualization', 'Matplotlib/Seaborn', 'Statistical plots', 'Latest'),
+        ('API Client', 'wbdata', 'World Bank API access', 'Latest'),
+        ('Data Format', 'CSV', 'Data persistence', '-'),
+        ('Language', 'Python', 'Core programming', '3.10+'),
+        ('Environment', 'venv', 'Virtual environment', '-'),
+    ]
+
+    for i, (layer, tech, purpose, version) in enumerate(tech_data, 1):
+        row = tech_table.rows[i].cells
+        row[0].text = layer
+        row[1].text = tech
+        row[2].text = purpose
+        row[3].text = version
+
+    doc.add_heading('3.3 Module Architecture', 2)
+
+    doc.add_heading('3.3.1 Data Fetcher Module (src/data_fetcher.py)', 3)
+    fetcher_table = doc.add_table(rows=4, cols=2)
+    fetcher_table.style = 'Light Grid Accent 1'
+    f_header = fetcher_table.rows[0].cells
+    f_header[0].text = 'Component'
+    f_header[1].text = 'Responsibility'
+
+    fetcher_data = [
+        ('fetch_and_process_data()', 'Connects to World Bank API, extracts population and surface area indicators, enriches with ISO codes and regional metadata'),
+        ('Data Indicators', 'SP.POP.TOTL (population), AG.LND.TOTL.K2 (surface area)'),
+        ('Date Range', f"{ctx['first_year']}-{ctx['last_year']} (configurable)"),
+    ]
+
+    for i, (comp, resp) in enumerate(fetcher_data, 1):
+        row = fetcher_table.rows[i].cells
+        row[0].text = comp
+        row[1].text = resp
+
+    doc.add_heading('3.3.2 Data Processor Module (src/data_processor.py)', 3)
+    proc_table = doc.add_table(rows=5, cols=4)
+    proc_table.style = 'Light Grid Accent 1'
+    p_header = proc_table.rows[0].cells
+    p_header[0].text = 'Function'
+    p_header[1].text = 'Input'
+    p_header[2].text = 'Output'
+    p_header[3].text = 'Purpose'
+
+    proc_data = [
+        ('calculate_missing_stats()', 'DataFrame', 'Dict with statistics', 'Assess data quality'),
+        ('clean_data()', 'DataFrame, strategy', 'Cleaned DataFrame', 'Remove/fill missing values'),
+        ('calculate_growth_rate()', 'DataFrame', 'DataFrame with growth_rate', 'Compute year-over-year change'),
+        ('get_top_n_countries()', 'DataFrame, year, metric, n', 'Top-N sorted DataFrame', 'Rank entities by metric'),
+    ]
+
+    for i, (func, inp, out, purp) in enumerate(proc_data, 1):
+        row = proc_table.rows[i].cells
+        row[0].text = func
+        row[1].text = inp
+        row[2].text = out
+        row[3].text = purp
+
+    doc.add_heading('3.3.3 Presentation Layer (app.py)', 3)
+    ui_table = doc.add_table(rows=6, cols=2)
+    ui_table.style = 'Light Grid Accent 1'
+    u_header = ui_table.rows[0].cells
+    u_header[0].text = 'Tab'
+    u_header[1].text = 'Functionality'
+
+    ui_data = [
+        ('Data Health & Cleaning', 'Missing value visualization, quality metrics, interactive cleaning strategies'),
+        ('Overview', 'Year selection slider, choropleth map, scatter plot, regional filtering'),
+        ('Rankings & Growth', 'Top-N analysis, bar charts, growth rate distribution'),
+        ('Time Series Analysis', 'Multi-country population trend comparison'),
+        ('Raw Data', 'Tabular data explorer for detailed inspection'),
+    ]
+
+    for i, (tab, func) in enumerate(ui_data, 1):
+        row = ui_table.rows[i].cells
+        row[0].text = tab
+        row[1].text = func
+
+    doc.add_page_break()
+
+    # ===== 4. METHODOLOGY =====
+    doc.add_heading('4. METHODOLOGY', 1)
+
+    doc.add_heading('4.1 Data Collection', 2)
+    doc.add_paragraph('Source: World Bank Open Data API')
+    doc.add_paragraph(
+        f"The World Bank API provides standardized, verified demographic data accessed through the wbdata Python library. Population (SP.POP.TOTL) and surface area (AG.LND.TOTL.K2) indicators were fetched for {ctx['entities']} spanning {ctx['first_year']}-{ctx['last_year']}."
+    )
+
+    doc.add_heading('4.2 Data Processing Pipeline', 2)
+
+    doc.add_heading('4.2.1 Data Cleaning Strategies', 3)
+    clean_table = doc.add_table(rows=4, cols=4)
+    clean_table.style = 'Light Grid Accent 1'
+    c_header = clean_table.rows[0].cells
+    c_header[0].text = 'Strategy'
+    c_header[1].text = 'Method'
+    c_header[2].text = 'Use Case'
+    c_header[3].text = 'Formula'
+
+    clean_data_rows = [
+        ('Drop', 'Remove rows with missing values', 'When data is sparse', 'df.dropna()'),
+        ('Fill Mean', 'Replace with country average', 'Temporal gaps', 'df.fillna(df.groupby("country").transform("mean"))'),
+        ('Interpolate', 'Linear interpolation over time', 'Time series continuity', 'df.groupby("country")["value"].interpolate()'),
+    ]
+
+    for i, (strat, method, use, formula) in enumerate(clean_data_rows, 1):
+        row = clean_table.rows[i].cells
+        row[0].text = strat
+        row[1].text = method
+        row[2].text = use
+        row[3].text = formula
+
+    doc.add_heading('4.2.2 Derived Metrics', 3)
+
+    doc.add_paragraph('Population Density:')
+    doc.add_paragraph('density = population / surface_area', style='List Number')
+
+    doc.add_paragraph('Growth Rate (Year-over-Year):')
+    doc.add_paragraph('growth_rate = ((population_t - population_t-1) / population_t-1) × 100', style='List Number')
+
+    doc.add_paragraph('Missing Data Ratio:')
+    doc.add_paragraph('missing_ratio = (total_missing_cells / total_cells) × 100', style='List Number')
+
+    doc.add_heading('4.3 Visualization Techniques', 2)
+
+    doc.add_heading('4.3.1 Data Quality (Tab 1)', 3)
+    doc.add_paragraph('Pie Chart (Fill Rate): Displays data completeness percentage')
+    doc.add_paragraph('Heatmap (Missing Data Pattern): Reveals systematic missing patterns')
+
+    doc.add_heading('4.3.2 Overview (Tab 2)', 3)
+    doc.add_paragraph('Choropleth Map: Geographic visualization of population distribution using Plotly')
+    doc.add_paragraph('Scatter Plot: Population vs Surface Area with density-based sizing')
+
+    doc.add_heading('4.3.3 Rankings & Growth (Tab 3)', 3)
+    doc.add_paragraph('Bar Chart: Horizontal bars showing Top-N countries by selected metric')
+    doc.add_paragraph('Histogram: Growth rate distribution with kernel density estimation')
+
+    doc.add_heading('4.3.4 Time Series (Tab 4)', 3)
+    doc.add_paragraph(f"Line Plot: Multi-country population trends over {ctx['year_span']} years")
+
+    # [METODOLOJI İÇİN FOTO ALANLARI]
+    doc.add_paragraph()
+    doc.add_paragraph('___________________________________________________________')
+    doc.add_paragraph('[SCREENSHOT 1: Data Health & Cleaning Tab]')
+    doc.add_paragraph('(Missing value heatmap ve pie chart görseli buraya eklenecek)')
+    doc.add_paragraph('___________________________________________________________')
+
+    doc.add_paragraph()
+    doc.add_paragraph('___________________________________________________________')
+    doc.add_paragraph('[SCREENSHOT 2: Overview Tab - Interactive Dashboard]')
+    doc.add_paragraph('(Choropleth harita ve scatter plot görseli buraya eklenecek)')
+    doc.add_paragraph('___________________________________________________________')
+
+    doc.add_paragraph()
+    doc.add_paragraph('___________________________________________________________')
+    doc.add_paragraph('[SCREENSHOT 3: Rankings & Growth Tab]')
+    doc.add_paragraph('(Top-N bar chart ve growth rate histogram görseli buraya eklenecek)')
+    doc.add_paragraph('___________________________________________________________')
+
+    doc.add_paragraph()
+    doc.add_paragraph('___________________________________________________________')
+    doc.add_paragraph('[SCREENSHOT 4: Time Series Analysis Tab]')
+    doc.add_paragraph('(Multi-country time series line plot görseli buraya eklenecek)')
+    doc.add_paragraph('___________________________________________________________')
+
+    doc.add_page_break()
+
+    # ===== 5. RESULTS AND FINDINGS =====
+    doc.add_heading('5. PROJECT RESULTS AND FINDINGS', 1)
+
+    doc.add_paragraph(f"Figures computed from the dataset for: {ctx['scope']}.")
+
+    doc.add_heading('5.1 Dataset Overview', 2)
+    overview_data = [
+        ('Total Entities', ctx['entities']),
+        ('Time Period', f"{ctx['first_year']}-{ctx['last_year']} ({ctx['year_span']} years)"),
+        ('Total Data Points', f"{ctx['row_count']} rows"),
+        ('File Size', ctx['file_size']),
+        ('Data Completeness', ctx['completeness']),
+        ('Temporal Coverage', f"{ctx['year_span']} consecutive years"),
+    ]
+    add_table(doc, ('Metric', 'Value'), overview_data)
+
+    doc.add_heading('5.2 Key Findings', 2)
+
+    doc.add_heading(f"5.2.1 Top 5 Most Populous Countries ({ctx['year']})", 3)
+    add_table(doc, ('Rank', 'Country', 'Population', '% of World Pop.'), ctx['top_population'])
+    doc.add_picture(ctx['charts']['population'], width=Inches(6))
+    doc.add_paragraph(f"Insight: {ctx['population_insight']}")
+
+    doc.add_heading(f"5.2.2 Top 5 Fastest Growing Countries ({ctx['year']})", 3)
+    add_table(doc, ('Rank', 'Country', 'Growth Rate', 'Region'), ctx['top_growth'])
+    doc.add_picture(ctx['charts']['growth'], width=Inches(6))
+    doc.add_paragraph(f"Insight: {ctx['growth_insight']} Rapid growth is typically driven by high immigration, young population structures, and economic development.")
+
+    doc.add_heading(f"5.2.3 Top 5 Highest Population Density ({ctx['year']})", 3)
+    add_table(doc, ('Rank', 'Country', 'Density (pop/km²)', 'Population'), ctx['top_density'])
+    doc.add_picture(ctx['charts']['density'], width=Inches(6))
+    doc.add_paragraph(f"Insight: {ctx['density_insight']} City-states and urban regions exhibit extreme population density due to geographic constraints and economic specialization.")
+
+    doc.add_heading('5.2.4 Data Quality Assessment', 3)
+    quality_data = [
+        ('Total Data Points', ctx['row_count'], '-'),
+        ('Missing Values', ctx['missing_cells'], ctx['missing_pct']),
+        ('Complete Time Series', ctx['complete_series'], ctx['complete_series_pct']),
+        ('Temporal Gaps', ctx['gaps'], ctx['gaps_pct']),
+        ('Data Accuracy', 'High', 'World Bank verified'),
+    ]
+    add_table(doc, ('Metric', 'Value', 'Assessment'), quality_data)
+    doc.add_picture(ctx['charts']['missing'], width=Inches(6))
+
+    doc.add_page_break()
+
+    # ===== 6. TECHNICAL CHALLENGES =====
+    doc.add_heading('6. TECHNICAL CHALLENGES AND SOLUTIONS', 1)
+
+    doc.add_heading('6.1 Challenge 1: API Rate Limiting and Network Stability', 2)
+    doc.add_paragraph('Problem: World Bank API connectivity issues, data fetching timeouts, multiple requests for indicator retrieval')
+    doc.add_paragraph('Solution: Implemented local caching mechanism using @st.cache_data decorator')
+    doc.add_paragraph('Result: Reduced API calls by 95%, improved load time from 5s to <1s, increased reliability through fallback to local data')
+
+    doc.add_heading('6.2 Challenge 2: Missing Data Handling', 2)
+    doc.add_paragraph('Problem: Plotly error with NaN values in size parameter, visualization failures')
+    doc.add_paragraph('Solution: Data validation and NaN handling before visualization using fillna(0)')
+    doc.add_paragraph('Result: Eliminated rendering errors, improved robustness of visualization pipeline')
+
+    doc.add_heading('6.3 Challenge 3: Module Import Structure', 2)
+    doc.add_paragraph('Problem: ModuleNotFoundError for src.data_fetcher, PYTHONPATH configuration issues')
+    doc.add_paragraph('Solution: Proper package structure with __init__.py files, clear module organization')
+    doc.add_paragraph('Result: Clean, maintainable code structure, professional project layout')
+
+    doc.add_heading('6.4 Challenge 4: Data Volume and Performance', 2)
+    doc.add_paragraph(f"Problem: {ctx['row_count']} rows × multiple indicators caused memory and rendering constraints")
+    doc.add_paragraph('Solution: Selective visualization and data sampling strategies')
+    doc.add_paragraph('Result: Maintained real-time interactivity, preserved analytical fidelity')
+
+    doc.add_page_break()
+
+    # ===== 7. PROJECT TIMELINE =====
+    doc.add_heading('7. PROJECT TIMELINE', 1)
+
+    doc.add_heading('Week 1: Foundation & Data Collection', 2)
+    week1_table = doc.add_table(rows=6, cols=3)
+    week1_table.style = 'Light Grid Accent 1'
+    w1_header = week1_table.rows[0].cells
+    w1_header[0].text = 'Day'
+    w1_header[1].text = 'Task'
+    w1_header[2].text = 'Status'
+
+    week1_data = [
+        ('Nov 27', 'Project setup, environment configuration', '✓ Complete'),
+        ('Nov 28', 'World Bank API integration', '✓ Complete'),
+        ('Nov 29', 'Data processing pipeline implementation', '✓ Complete'),
+        ('Nov 30', 'Initial Streamlit dashboard structure', '✓ Complete'),
+        ('Dec 1', 'Data Health & Cleaning tab', '✓ Complete'),
+    ]
+
+    for i, (day, task, status) in enumerate(week1_data, 1):
+        row = week1_table.rows[i].cells
+        row[0].text = day
+        row[1].text = task
+        row[2].text = status
+
+    doc.add_heading('Week 2: Analysis & Enhancement', 2)
+    week2_table = doc.add_table(rows=8, cols=3)
+    week2_table.style = 'Light Grid Accent 1'
+    w2_header = week2_table.rows[0].cells
+    w2_header[0].text = 'Day'
+    w2_header[1].text = 'Task'
+    w2_header[2].text = 'Status'
+
+    week2_data = [
+        ('Dec 2', 'Overview tab with choropleth map', '✓ Complete'),
+        ('Dec 3', 'Rankings & Growth tab', '✓ Complete'),
+        ('Dec 4', 'Time Series Analysis tab', '✓ Complete'),
+        ('Dec 5', 'Bug fixes and error handling', '✓ Complete'),
+        ('Dec 6', 'Code documentation and UI translation', '✓ Complete'),
+        ('Dec 7', 'Final testing and optimization', '✓ Complete'),
+        ('Dec 8-11', 'Final refinements and report preparation', '✓ Complete'),
+    ]
+
+    for i, (day, task, status) in enumerate(week2_data, 1):
+        row = week2_table.rows[i].cells
+        row[0].text = day
+        row[1].text = task
+        row[2].text = status
+
+    doc.add_paragraph('Total Development Time: 15 days')
+    doc.add_paragraph('Estimated Development Hours: 60 hours')
+
+    doc.add_page_break()
+
+    # ===== 8. PROJECT BUDGET =====
+    doc.add_heading('8. PROJECT BUDGET', 1)
+
+    budget_table = doc.add_table(rows=10, cols=4)  # 9 satırdan 10 satıra değiştir
+    budget_table.style = 'Light Grid Accent 1'
+    b_header = budget_table.rows[0].cells
+    b_header[0].text = 'Category'
+    b_header[1].text = 'Item'
+    b_header[2].text = 'Cost'
+    b_header[3].text = 'Notes'
+
+    budget_data = [
+        ('Software', 'Streamlit', '$0', 'Open source'),
+        ('Software', 'Pandas', '$0', 'Open source'),
+        ('Software', 'Plotly', '$0', 'Free tier'),
+        ('Software', 'Matplotlib/Seaborn', '$0', 'Open source'),
+        ('Software', 'wbdata', '$0', 'Open source'),
+        ('Infrastructure', 'Cloud Hosting', '$0', 'Free tier available'),
+        ('Data', 'World Bank API', '$0', 'Public data, no fees'),
+        ('Development', 'IDE/Tools', '$0', 'VS Code (free)'),
+    ]
+
+    for i, (cat, item, cost, notes) in enumerate(budget_data, 1):
+        row = budget_table.rows[i].cells
+        row[0].text = cat
+        row[1].text = item
+        row[2].text = cost
+        row[3].text = notes
+
+    total_row = budget_table.rows[9].cells  # Şimdi 10 satırdan 9. satır var
+    total_row[0].text = 'TOTAL BUDGET'
+    total_row[2].text = '$0'
+    total_row[3].text = 'Fully open-source solution'
+
+    doc.add_paragraph('Budget Efficiency: 100% open-source technology stack with no licensing fees.')
+
+    doc.add_page_break()
+
+    # ===== 9. REFERENCES =====
+    doc.add_heading('9. REFERENCES', 1)
+
+    doc.add_heading('9.1 Data Sources', 2)
+
+    references = [
+        ('World Bank Open Data. (2024). World Bank API. Retrieved from https://data.worldbank.org/', 'Creative Commons Attribution 4.0'),
+        ('World Bank. (2024). SP.POP.TOTL - Total Population Indicator. https://data.worldbank.org/indicator/SP.POP.TOTL', 'Standardized population statistics'),
+        ('World Bank. (2024). AG.LND.TOTL.K2 - Land Area Indicator. https://data.worldbank.org/indicator/AG.LND.TOTL.K2', 'Measured in square kilometers'),
+    ]
+
+    for ref, note in references:
+        p = doc.add_paragraph(ref)
+        p.paragraph_format.left_indent = Inches(0.5)
+
+    doc.add_heading('9.2 Software Documentation', 2)
+
+    software_refs = [
+        'Streamlit. (2024). "Streamlit Documentation." https://docs.streamlit.io/',
+        'Pandas Development Team. (2024). "Pandas Documentation." https://pandas.pydata.org/docs/',
+        'Plotly Technologies. (2024). "Plotly Python Documentation." https://plotly.com/python/',
+        'Matplotlib Development Team. (2024). "Matplotlib Documentation." https://matplotlib.org/',
+        'Seaborn Development Team. (2024). "Seaborn Documentation." https://seaborn.pydata.org/',
+        'wbdata Library. (2024). "World Bank Data Library." https://github.com/mwouts/world_bank_data',
+    ]
+
+    for ref in software_refs:
+        p = doc.add_paragraph(ref)
+        p.paragraph_format.left_indent = Inches(0.5)
+
+    doc.add_heading('9.3 Academic References', 2)
+
+    academic_refs = [
+        'United Nations. (2023). "World Population Prospects 2022." ISBN: 978-92-1-148364-8',
+        'Keyfitz, N., & Flieger, W. (1990). "World Population Growth and Aging." University of Chicago Press',
+        'Lee, R. D. (2011). "The Outlook for Population Growth." Science, 333(6042), 569-573.',
+        'McKinney, W. (2012). "Python for Data Analysis." O\'Reilly Media',
+        'VanderPlas, J. (2016). "Python Data Science Handbook." O\'Reilly Media',
+    ]
+
+    for ref in academic_refs:
+        p = doc.add_paragraph(ref)
+        p.paragraph_format.left_indent = Inches(0.5)
+
+    doc.add_page_break()
+
+    # ===== 10. CONCLUSION =====
+    doc.add_heading('10. CONCLUSION', 1)
+
+    conclusion = f"""This project successfully demonstrates comprehensive data science competencies through the development of an interactive web application for analyzing historical world population dynamics. The application processes {ctx['row_count']} data points spanning {ctx['year_span']} years across {ctx['entity_count']} countries and regions, implementing sophisticated data cleaning, statistical analysis, and interactive visualization techniques.
 
 Key Achievements:
 • Data Integration: Successfully integrated World Bank API with local caching for robust data access
@@ -698,15 +632,28 @@ Future Enhancements:
 
 This project provides a solid foundation for further data science exploration and demonstrates the practical application of analytical techniques in real-world demographic analysis."""
 
-doc.add_paragraph(conclusion)
+    doc.add_paragraph(conclusion)
+
+    doc.add_paragraph()
+    doc.add_paragraph()
+    doc.add_paragraph('Submitted by: Arda ÇAM (ID: 220208002)')
+    doc.add_paragraph('Date: December 11, 2025')
+    doc.add_paragraph('Instructor: Lect. Muhammet Mustafa Ölmez')
+    doc.add_paragraph('Course: SENG 419 (1) - Introduction to Data Science')
+
+    # Dosyayı kaydet
+    doc.save(output)
+
 
-doc.add_paragraph()
-doc.add_paragraph()
-doc.add_paragraph('Submitted by: Arda ÇAM (ID: 220208002)')
-doc.add_paragraph('Date: December 11, 2025')
-doc.add_paragraph('Instructor: Lect. Muhammet Mustafa Ölmez')
-doc.add_paragraph('Course: SENG 419 (1) - Introduction to Data Science')
+if __name__ == "__main__":
+    # Rapordaki sayılar canlı veri setinden hesaplanır (bkz. src/reporting.py)
+    parser = argparse.ArgumentParser(description="Build the DOCX report from the live dataset")
+    parser.add_argument('--region', default=None, help="report on one region instead of the world")
+    parser.add_argument('--output', default=None)
+    args = parser.parse_args()
+    output = args.output or output_path(args.region, 'docx')
 
-# Dosyayı kaydet
-doc.save('World_Population_Insights_Final_Report.docx')
-print("✓ DOCX raporu başarıyla oluşturuldu: World_Population_Insights_Final_Report.docx")
\ No newline at end of file
+    ctx = report_context(prepare_dataset(load_dataset()), args.region)
+    render_charts([ctx])
+    build_docx(ctx, output)
+    print(f"✓ DOCX raporu başarıyla oluşturuldu: {output}")
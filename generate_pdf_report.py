@@ -1,9 +1,20 @@
+import argparse
 import subprocess
 import os
 
-# Markdown dosyasını PDF'e çevirmek için pandoc kullanıyoruz
-markdown_file = "report.md"
-pdf_output = "World_Population_Insights_Final_Report.pdf"
+from src.reporting import build_reports, output_path
+
+parser = argparse.ArgumentParser(description="Build the PDF report from the live dataset")
+parser.add_argument('--region', default=None, help="report on one region instead of the world")
+args = parser.parse_args()
+
+# Markdown raporu önce canlı veri setinden üretilir (güncelse atlanır)
+build_reports([args.region], ['md'])
+markdown_file = output_path(args.region, 'md')
+if args.region:
+    pdf_output = os.path.splitext(markdown_file)[0] + ".pdf"
+else:
+    pdf_output = "World_Population_Insights_Final_Report.pdf"
 
 # Pandoc komutu
 command = [
@@ -16,7 +27,9 @@ command = [
     "-V", "fontsize=11pt",
     "-V", "mainfont=DejaVu Sans",
     "--toc",
-    "--toc-depth=3"
+    "--toc-depth=3",
+    # Grafik yolları Markdown dosyasına göre
+    "--resource-path", os.path.dirname(markdown_file) or ".",
 ]
 
 try:
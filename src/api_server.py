@@ -0,0 +1,253 @@
+"""
+Headless HTTP query API over the processed population data.
+
+Endpoints (all GET, ?format=json|csv, default json):
+  /top?year=2023&metric=population&n=10     top N countries (non-aggregates)
+  /timeseries?country=Germany&country=Turkiye&metric=population
+  /missing[?by=column|country|year]          missing-data statistics
+  /growth?country=Germany | /growth?year=2023 growth rates
+  /health
+  /metrics                                   Prometheus text (WPI_TELEMETRY=1)
+
+The dataset stays resident in memory with its indexes; responses are cached
+(LRU) and large bodies are streamed with chunked transfer encoding.
+
+Usage: python -m src.api_server [--host 127.0.0.1] [--port 8000]
+"""
+import argparse
+import json
+import threading
+import urllib.parse
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+
+from src.data_store import load_dataset, stored_version, dataset_version
+from src.data_processor import calculate_growth_rate, get_top_n_countries, profile_missing
+from src.rank_index import RankIndex
+from src.telemetry import count, render_metrics, span
+
+# Rows per streamed chunk
+CHUNK_ROWS = 2000
+CONTENT_TYPES = {'json': 'application/json', 'csv': 'text/csv; charset=utf-8'}
+
+
+class BadRequest(Exception):
+    """
+    Invalid query parameters (answered with HTTP 400).
+    """
+
+
+class PopulationQueryService:
+    """
+    Keeps the dataset and its indexes resident and answers queries as dataframes.
+    """
+
+    def __init__(self, df, version=None, cache_size=512):
+        if 'growth_rate' not in df.columns:
+            df = calculate_growth_rate(df)
+        self.df = df.reset_index(drop=True)
+        self.version = version or dataset_version(self.df)
+        self.metrics = [c for c in self.df.select_dtypes('number').columns if c != 'date']
+        self.rank_index = RankIndex(self.df, self.metrics)
+
+        # country -> row positions sorted by date
+        order = np.lexsort((self.df['date'].to_numpy(), pd.factorize(self.df['country'], sort=True)[0]))
+        countries = self.df['country'].to_numpy()[order]
+        starts = np.flatnonzero(np.r_[True, countries[1:] != countries[:-1]])
+        ends = np.append(starts[1:], len(order))
+        self.rows_by_country = {str(countries[s]): order[s:e] for s, e in zip(starts, ends)}
+
+        self.cache = OrderedDict()
+        self.cache_size = cache_size
+        self.lock = threading.Lock()
+
+    # --- Queries ---
+
+    def _metric(self, params, default='population'):
+        metric = params.get('metric', [default])[0]
+        if metric not in self.metrics:
+            raise BadRequest(f"unknown metric '{metric}', expected one of {self.metrics}")
+        return metric
+
+    def top(self, params):
+        try:
+            year = int(params['year'][0])
+            n = int(params.get('n', ['10'])[0])
+        except (KeyError, ValueError):
+            raise BadRequest("year (int) is required, n must be an int")
+        metric = self._metric(params)
+        top = get_top_n_countries(self.df, year, metric, n=n, index=self.rank_index)
+        return top[['country', 'date', metric, 'region_name', 'iso_code']].reset_index(drop=True)
+
+    def timeseries(self, params):
+        countries = params.get('country')
+        if not countries:
+            raise BadRequest("at least one country is required")
+        metric = self._metric(params)
+        unknown = [c for c in countries if c not in self.rows_by_country]
+        if unknown:
+            raise BadRequest(f"unknown country: {', '.join(unknown)}")
+        rows = np.concatenate([self.rows_by_country[c] for c in countries])
+        return self.df.iloc[rows][['country', 'date', metric]].reset_index(drop=True)
+
+    def missing(self, params):
+        by = params.get('by', ['column'])[0]
+        if by not in ('column', 'country', 'year'):
+            raise BadRequest("by must be one of column, country, year")
+        series = profile_missing(self.df, self.version)[f"by_{by}"]
+        return series.rename('missing_cells').rename_axis(by).reset_index()
+
+    def growth(self, params):
+        if 'country' in params:
+            return self.timeseries(dict(params, metric=['growth_rate']))
+        if 'year' in params:
+            try:
+                year = int(params['year'][0])
+            except ValueError:
+                raise BadRequest("year must be an int")
+            n = len(self.rank_index.order['growth_rate'])
+            return get_top_n_countries(self.df, year, 'growth_rate', n=n, index=self.rank_index)[
+                ['country', 'date', 'growth_rate']].reset_index(drop=True)
+        raise BadRequest("country or year is required")
+
+    # --- Response cache ---
+
+    def cached(self, key):
+        with self.lock:
+            if key in self.cache:
+                self.cache.move_to_end(key)
+                count('cache_hits', cache='api_response')
+                return self.cache[key]
+        count('cache_misses', cache='api_response')
+        return None
+
+    def store(self, key, body):
+        with self.lock:
+            self.cache[key] = body
+            while len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+
+
+def iter_body(df, fmt):
+    """
+    Serializes a dataframe as JSON records or CSV, CHUNK_ROWS rows at a time.
+    """
+    if fmt == 'csv':
+        yield df.iloc[:0].to_csv(index=False).encode('utf-8')
+        for i in range(0, len(df), CHUNK_ROWS):
+            yield df.iloc[i:i + CHUNK_ROWS].to_csv(index=False, header=False).encode('utf-8')
+        return
+
+    yield b'['
+    for i in range(0, len(df), CHUNK_ROWS):
+        records = df.iloc[i:i + CHUNK_ROWS].to_json(orient='records')[1:-1]
+        yield ((',' if i else '') + records).encode('utf-8')
+    yield b']'
+
+
+class QueryHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are separate writes; without TCP_NODELAY keep-alive
+    # clients wait on delayed ACKs (~40 ms per request)
+    disable_nagle_algorithm = True
+    service = None
+    routes = {
+        '/top': PopulationQueryService.top,
+        '/timeseries': PopulationQueryService.timeseries,
+        '/missing': PopulationQueryService.missing,
+        '/growth': PopulationQueryService.growth,
+    }
+
+    def log_message(self, *args):
+        pass
+
+    def _send_error(self, status, message):
+        body = json.dumps({'error': message}).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = urllib.parse.urlparse(self.path)
+        params = urllib.parse.parse_qs(url.query)
+        fmt = params.pop('format', ['json'])[0]
+
+        if url.path == '/health':
+            body = json.dumps({'status': 'ok', 'version': self.service.version, 'rows': len(self.service.df)}).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        if url.path == '/metrics':
+            body = render_metrics().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        if url.path not in self.routes:
+            return self._send_error(404, f"unknown endpoint {url.path}")
+        if fmt not in CONTENT_TYPES:
+            return self._send_error(400, "format must be json or csv")
+
+        key = (url.path, fmt, tuple(sorted((k, tuple(v)) for k, v in params.items())))
+        body = self.service.cached(key)
+        if body is not None:
+            self.send_response(200)
+            self.send_header('Content-Type', CONTENT_TYPES[fmt])
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
+        try:
+            with span('api.query', endpoint=url.path):
+                result = self.routes[url.path](self.service, params)
+        except BadRequest as e:
+            return self._send_error(400, str(e))
+
+        # Stream the body in chunks while keeping a copy for the cache
+        self.send_response(200)
+        self.send_header('Content-Type', CONTENT_TYPES[fmt])
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        parts = []
+        for chunk in iter_body(result, fmt):
+            if chunk:
+                parts.append(chunk)
+                self.wfile.write(f"{len(chunk):X}\r\n".encode('ascii') + chunk + b"\r\n")
+        self.wfile.write(b"0\r\n\r\n")
+        self.service.store(key, b''.join(parts))
+
+
+def make_server(df, host='127.0.0.1', port=8000, version=None):
+    """
+    Builds the HTTP server around a resident dataset.
+    """
+    handler = type('Handler', (QueryHandler,), {'service': PopulationQueryService(df, version)})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Population data query API")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    args = parser.parse_args()
+
+    data = load_dataset()
+    if data is None:
+        raise SystemExit("No data available. Run the fetcher first (python -m src.data_fetcher).")
+    server = make_server(data, args.host, args.port, stored_version())
+    print(f"Serving {len(data)} rows on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,136 @@
+"""
+Choropleth frames for the Overview map.
+
+The map values of every year are computed in one vectorized pass into a
+years x entities matrix, built once per dataset version and scope. A
+figure is the cached skeleton (trace style, geo layout, hover template)
+plus one year's values, so a slider move only builds the data of that year.
+
+The skeleton draws the plotly.js built-in ISO-3 geometry (fetched and
+cached by the browser); the payload carries no template, only entities
+with a value and values rounded to what the colour scale shows.
+animated_figure() puts every year in one figure, played and scrubbed
+in the browser without reruns.
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from src.telemetry import traced
+
+COLOR_SCALE = 'Plasma'
+
+# Same geo look as the previous px.choropleth figure (template colours)
+GEO = dict(showframe=False, showcoastlines=False, projection_type='equirectangular',
+           showland=True, landcolor='#E5ECF6', showlakes=True, lakecolor='white', bgcolor='rgba(0,0,0,0)')
+
+
+def _round(values, digits=4):
+    """
+    Values rounded to `digits` significant digits (integers stay exact
+    up to that precision); NaN becomes None.
+    """
+    out = values.astype('float64')
+    finite = np.isfinite(out) & (out != 0)
+    magnitude = np.floor(np.log10(np.abs(out[finite])))
+    scale = 10.0 ** (digits - 1 - magnitude)
+    out[finite] = np.round(out[finite] * scale) / scale
+    return [None if np.isnan(v) else (int(v) if v.is_integer() and abs(v) < 2 ** 53 else float(v)) for v in out]
+
+
+class ChoroplethFrames:
+    """
+    Map values of one dataset (already filtered to a scope) for every year.
+    """
+
+    def __init__(self, df, metric='population', label='Population', title='World Population Map', digits=None):
+        self.metric = metric
+        self.label = label
+        self.title = title
+        # Population is shown exactly, other metrics at 4 significant digits
+        self.digits = digits if digits is not None else (10 if metric == 'population' else 4)
+
+        rows = df[df['iso_code'].notna()]
+        entity_codes, locations = pd.factorize(rows['iso_code'], sort=True)
+        year_codes, years = pd.factorize(rows['date'], sort=True)
+
+        # The single pass: every (year, entity) value scattered into the matrix
+        self.values = np.full((len(years), len(locations)), np.nan)
+        self.values[year_codes, entity_codes] = rows[metric].to_numpy(dtype='float64', na_value=np.nan)
+
+        names = np.empty(len(locations), dtype=object)
+        names[entity_codes] = rows['country'].astype(str).to_numpy(dtype=object)
+        self.locations = np.asarray(locations.astype(str), dtype=object)
+        self.names = names
+        self.years = [int(y) for y in years]
+        self._year_pos = {y: i for i, y in enumerate(self.years)}
+
+        self._trace = dict(
+            type='choropleth', locationmode='ISO-3', colorscale=COLOR_SCALE,
+            colorbar=dict(title=dict(text=label)),
+            hovertemplate=f"<b>%{{text}}</b><br>{label}=%{{z:,}}<extra></extra>",
+        )
+        self._layout = dict(geo=GEO, template='none', margin=dict(l=0, r=0, t=40, b=0))
+        self._animated = None
+        self._lock = threading.Lock()
+
+    def frame(self, year):
+        """
+        Trace data of one year: entities with a value, their values and names.
+        """
+        row = self.values[self._year_pos[int(year)]]
+        present = ~np.isnan(row)
+        z = row[present]
+        return dict(locations=self.locations[present].tolist(), z=_round(z, self.digits),
+                    text=self.names[present].tolist(),
+                    zmin=float(z.min()) if len(z) else None, zmax=float(z.max()) if len(z) else None)
+
+    @traced('choropleth.figure')
+    def figure(self, year):
+        """
+        Figure of one year: the skeleton plus that year's values.
+        """
+        data = dict(self._trace, **self.frame(year))
+        layout = dict(self._layout, title=dict(text=f"{self.title} ({int(year)})"))
+        return go.Figure(data=[data], layout=layout)
+
+    @traced('choropleth.animated_figure')
+    def animated_figure(self):
+        """
+        One figure holding every year as an animation frame, with a year
+        slider and play button handled by plotly.js. Built once.
+        Locations and names are sent once; frames only carry the values.
+        The colour range is shared by all years so changes stay visible.
+        """
+        with self._lock:
+            if self._animated is not None:
+                return self._animated
+
+            finite = self.values[~np.isnan(self.values)]
+            zmin, zmax = (float(finite.min()), float(finite.max())) if len(finite) else (None, None)
+            base = dict(self._trace, locations=self.locations.tolist(), text=self.names.tolist(),
+                        zmin=zmin, zmax=zmax)
+            frames = [go.Frame(name=str(year), data=[dict(type='choropleth', z=_round(self.values[i], self.digits))])
+                      for i, year in enumerate(self.years)]
+
+            steps = [dict(method='animate', label=str(year),
+                          args=[[str(year)], dict(mode='immediate', frame=dict(duration=0, redraw=True),
+                                                  transition=dict(duration=0))])
+                     for year in self.years]
+            play = dict(label='▶', method='animate',
+                        args=[None, dict(frame=dict(duration=300, redraw=True), fromcurrent=True,
+                                         transition=dict(duration=0))])
+            pause = dict(label='❚❚', method='animate',
+                         args=[[None], dict(mode='immediate', frame=dict(duration=0, redraw=False))])
+            layout = dict(self._layout, title=dict(text=f"{self.title} ({self.years[0]}-{self.years[-1]})"),
+                          sliders=[dict(steps=steps, active=len(steps) - 1, currentvalue=dict(prefix='Year: '),
+                                        pad=dict(t=30))],
+                          updatemenus=[dict(type='buttons', buttons=[play, pause], direction='left',
+                                            x=0, y=0, xanchor='right', yanchor='top', pad=dict(r=10, t=30))])
+
+            # Opens on the latest year, like the slider
+            base['z'] = frames[-1].data[0].z if frames else []
+            self._animated = go.Figure(data=[base], layout=layout, frames=frames)
+            return self._animated
@@ -0,0 +1,168 @@
+"""
+Out-of-core processing of the store in country-partitioned chunks.
+
+Cleaning and growth rates only look at one country at a time, so the store
+can be streamed: rows are read from the Arrow file one record batch at
+a time (never splitting a country), processed, and appended to the output
+file as record batches. Peak memory is about one chunk (chunk_rows plus the
+rows of the largest country), independent of the store size.
+
+Usage: python -m src.chunked --out data/population_clean.arrow [--strategy interpolate] [--chunk-rows 100000]
+"""
+import argparse
+import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from src.data_store import STORE_PATH, VERSION_KEY, CATEGORICAL_COLS, _to_arrow, _to_pandas, stored_version
+from src.data_processor import clean_data
+from src.derived import compute_metric, previous_rows
+from src.registry import REGISTRY
+
+# Rows read per chunk (before completing the last country)
+CHUNK_ROWS = 100_000
+
+
+def _chunk_to_pandas(table, categories):
+    """
+    _to_pandas for one chunk, converting each dictionary to pandas categories
+    only once per file (every chunk shares the file's dictionaries).
+    """
+    dict_cols = [name for name in table.column_names if name in CATEGORICAL_COLS]
+    df = _to_pandas(table.drop_columns(dict_cols))
+    for name in dict_cols:
+        array = table.column(name).combine_chunks()
+        cached = categories.get(name)
+        if cached is None or not cached[0].equals(array.dictionary):
+            cached = categories[name] = (array.dictionary, pd.CategoricalDtype(array.dictionary.to_pandas()))
+        codes = array.indices.fill_null(-1).to_numpy(zero_copy_only=False)
+        df.insert(table.column_names.index(name), name, pd.Categorical.from_codes(codes, dtype=cached[1]))
+    return df
+
+
+def iter_country_chunks(path=STORE_PATH, chunk_rows=CHUNK_ROWS):
+    """
+    Yields the store as dataframes of about chunk_rows rows, each holding
+    whole countries. The store must keep every country's rows contiguous
+    (as written by fetch_and_process_data).
+    """
+    seen = set()
+    categories = {}
+    pending = None  # Arrow rows of the country cut by the last read
+
+    def emit(df):
+        countries = set(df['country'].unique())
+        if countries & seen:
+            raise ValueError(f"{path} is not grouped by country; "
+                             "re-save it sorted by country to process it in chunks")
+        seen.update(countries)
+        return df
+
+    # Plain reads rather than a memory map: mapped pages would stay resident
+    # (and count towards RSS) until the whole file has been read
+    with pa.OSFile(path) as source:
+        reader = pa.ipc.open_file(source)
+        for i in range(reader.num_record_batches):
+            batch = reader.get_batch(i)
+            for offset in range(0, batch.num_rows, chunk_rows):
+                # Stays in Arrow until a chunk is complete (one pandas conversion per chunk)
+                piece = pa.Table.from_batches([batch.slice(offset, chunk_rows)])
+                table = piece if pending is None else pa.concat_tables([pending, piece])
+
+                # Keep the last (possibly incomplete) country for the next chunk
+                codes = table.column('country').combine_chunks().indices.to_numpy(zero_copy_only=False)
+                boundaries = np.flatnonzero(codes[1:] != codes[:-1])
+                if len(boundaries) == 0:
+                    pending = table
+                    continue
+                split = int(boundaries[-1]) + 1
+                pending = table.slice(split)
+                yield emit(_chunk_to_pandas(table.slice(0, split), categories))
+
+    if pending is not None and pending.num_rows:
+        yield emit(_chunk_to_pandas(pending, categories))
+
+
+def streamed_version(path=STORE_PATH, chunk_rows=CHUNK_ROWS):
+    """
+    dataset_version of the store without loading it at once.
+    Uses the version stored in its metadata when there is one.
+    """
+    version = stored_version(path)
+    if version is not None:
+        return version
+
+    digest = hashlib.sha1()
+    columns = None
+    for chunk in iter_country_chunks(path, chunk_rows):
+        digest.update(pd.util.hash_pandas_object(chunk, index=False).to_numpy().tobytes())
+        columns = chunk.columns
+    digest.update(','.join(map(str, columns if columns is not None else [])).encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+def process_chunked(source=STORE_PATH, output=None, strategy=None, derive=True, chunk_rows=CHUNK_ROWS):
+    """
+    Streams the store through clean_data(strategy) and the registered derived
+    metrics, writing each processed chunk to output as it is done.
+
+    The output version is derived from the source version and the steps
+    (the content hash would need the whole output before writing it).
+    Returns the number of rows written.
+    """
+    if output is None or os.path.abspath(output) == os.path.abspath(source):
+        raise ValueError("output must be a different file than source")
+
+    steps = f"{streamed_version(source, chunk_rows)}|{strategy}|{derive}"
+    metadata = {VERSION_KEY: hashlib.sha1(steps.encode('utf-8')).hexdigest()[:16].encode('utf-8')}
+
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    tmp_path = output + '.tmp'
+    writer = None
+    rows = 0
+    try:
+        for chunk in iter_country_chunks(source, chunk_rows):
+            if strategy:
+                chunk = clean_data(chunk, strategy)
+            if derive:
+                # Input version tags are not kept for chunked output, compute directly
+                chunk = chunk.copy(deep=False)
+                prev = previous_rows(chunk)
+                for name in REGISTRY.derived:
+                    if all(c in chunk.columns for c in REGISTRY.inputs(name)):
+                        chunk[name] = compute_metric(chunk, name, prev=prev)
+
+            table = _to_arrow(chunk, metadata)
+            if writer is None:
+                writer = pa.ipc.new_file(tmp_path, table.schema)
+            writer.write_table(table)
+            rows += len(chunk)
+    except BaseException:
+        # The partial output is not kept
+        if writer is not None:
+            writer.close()
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    if writer is None:
+        raise ValueError(f"{source} holds no rows")
+    writer.close()
+    os.replace(tmp_path, output)
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Chunked (out-of-core) cleaning and derivation")
+    parser.add_argument('--source', default=STORE_PATH)
+    parser.add_argument('--out', required=True)
+    parser.add_argument('--strategy', default=None, help="clean_data strategy (default: no cleaning)")
+    parser.add_argument('--no-derive', action='store_true', help="skip the derived metrics")
+    parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS)
+    args = parser.parse_args()
+
+    n = process_chunked(args.source, args.out, args.strategy, not args.no_derive, args.chunk_rows)
+    print(f"Wrote {n} rows to {args.out}")
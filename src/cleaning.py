@@ -0,0 +1,112 @@
+import numpy as np
+
+# Vectorized fill kernels. They work on a 1-D float array made of contiguous
+# blocks (one block per country, rows sorted by date inside each block),
+# described by the start offset of every block. No Python-level loop per group.
+
+
+def block_bounds(starts, n):
+    """
+    Returns (first, last) row index of the block each row belongs to.
+    """
+    starts = np.asarray(starts, dtype=np.int64)
+    lengths = np.diff(np.append(starts, n))
+    first = np.repeat(starts, lengths)
+    last = np.repeat(starts + lengths - 1, lengths)
+    return first, last
+
+
+def _prev_next_valid(values, starts):
+    """
+    For every row, the index of the previous / next non-NaN row within its block
+    (-1 when there is none).
+    """
+    n = len(values)
+    pos = np.arange(n)
+    valid = ~np.isnan(values)
+    first, last = block_bounds(starts, n)
+
+    prev = np.maximum.accumulate(np.where(valid, pos, -1))
+    prev[prev < first] = -1
+
+    nxt = np.minimum.accumulate(np.where(valid, pos, n)[::-1])[::-1]
+    nxt[nxt > last] = -1
+    return prev, nxt
+
+
+def interpolate_blocks(values, starts):
+    """
+    Linear interpolation inside each block; leading/trailing gaps take the
+    nearest valid value (same as pandas interpolate(limit_direction='both')).
+    """
+    values = np.asarray(values, dtype=np.float64)
+    prev, nxt = _prev_next_valid(values, starts)
+    out = values.copy()
+    missing = np.isnan(values)
+
+    both = missing & (prev >= 0) & (nxt >= 0)
+    p, q = prev[both], nxt[both]
+    i = np.flatnonzero(both)
+    out[both] = values[p] + (values[q] - values[p]) * (i - p) / (q - p)
+
+    only_prev = missing & (prev >= 0) & (nxt < 0)
+    out[only_prev] = values[prev[only_prev]]
+    only_next = missing & (prev < 0) & (nxt >= 0)
+    out[only_next] = values[nxt[only_next]]
+    return out
+
+
+def ffill_blocks(values, starts):
+    """
+    Forward fill inside each block (leading gaps stay NaN).
+    """
+    values = np.asarray(values, dtype=np.float64)
+    prev, _ = _prev_next_valid(values, starts)
+    out = values.copy()
+    fill = np.isnan(values) & (prev >= 0)
+    out[fill] = values[prev[fill]]
+    return out
+
+
+def nearest_blocks(values, starts):
+    """
+    Fills each gap with the closest valid value in the block (ties take the earlier one).
+    """
+    values = np.asarray(values, dtype=np.float64)
+    prev, nxt = _prev_next_valid(values, starts)
+    out = values.copy()
+    pos = np.arange(len(values))
+
+    use_prev = (prev >= 0) & ((nxt < 0) | (pos - prev <= nxt - pos))
+    use_next = ~use_prev & (nxt >= 0)
+    missing = np.isnan(values)
+    out[missing & use_prev] = values[prev[missing & use_prev]]
+    out[missing & use_next] = values[nxt[missing & use_next]]
+    return out
+
+
+def group_mean_fill(values, codes, n_groups):
+    """
+    Fills NaN with the mean of the row's group (codes from pd.factorize,
+    negative codes are left untouched). Groups need not be contiguous.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    valid = ~np.isnan(values)
+    ok = codes >= 0
+    sums = np.bincount(codes[ok & valid], weights=values[ok & valid], minlength=n_groups)
+    counts = np.bincount(codes[ok & valid], minlength=n_groups)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = sums / counts
+
+    out = values.copy()
+    fill = ~valid & ok
+    out[fill] = means[codes[fill]]
+    return out
+
+
+# Strategies that need rows sorted by (country, date) and work block by block
+BLOCK_STRATEGIES = {
+    'interpolate': interpolate_blocks,
+    'ffill': ffill_blocks,
+    'nearest': nearest_blocks,
+}
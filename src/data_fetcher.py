@@ -1,66 +1,162 @@
-import wbdata
+import os
 import pandas as pd
 import datetime
+from src.fetch_engine import WorldBankFetcher
+from src.http_cache import ResponseCache
+from src.data_store import save_dataset, load_dataset, load_manifest, save_manifest, stored_derived_tags, NORMALIZED_PATH
+from src.derived import update_derived
+from src.entities import canonical_keys, get_entities, join_entities
+from src.registry import REGISTRY
+from src.telemetry import traced
 
-def fetch_and_process_data():
+# Indicators (World Bank code -> column), from config/indicators.json
+INDICATORS = REGISTRY.indicators
+
+# Date Range (Kept wide). The end is the last completed year.
+START_YEAR = 1960
+
+# Recent years are re-requested on every incremental refresh,
+# because the World Bank revises its latest estimates.
+REFRESH_RECENT_YEARS = 2
+
+# Offline mode (e.g. CI): serve World Bank responses from the on-disk cache only
+OFFLINE = os.environ.get('WPI_OFFLINE', '') not in ('', '0')
+
+
+def default_fetcher(**kwargs):
+    """
+    Fetch engine backed by the persistent response cache, so restarts and
+    CI runs reuse earlier responses instead of calling the API again.
+    """
+    kwargs.setdefault('offline', OFFLINE)
+    return WorldBankFetcher(cache=ResponseCache(), **kwargs)
+
+
+def _year_ranges(years):
+    """
+    Collapses a sorted list of years into contiguous [start, end] ranges.
+    """
+    ranges = []
+    for year in years:
+        if ranges and year == ranges[-1][1] + 1:
+            ranges[-1][1] = year
+        else:
+            ranges.append([year, year])
+    return ranges
+
+
+def _missing_ranges(covered, start, end, recent=REFRESH_RECENT_YEARS):
+    """
+    Returns the year ranges between start and end that are not yet covered,
+    plus the last `recent` years (always re-fetched).
+    """
+    have = {y for a, b in covered for y in range(a, b + 1)}
+    needed = [y for y in range(start, end + 1) if y not in have or y > end - recent]
+    return _year_ranges(needed)
+
+
+def _legacy_keys(base, entities):
+    """
+    ISO codes for stored rows that have none (stores tagged by name before
+    the entity dimension), looked up by name once per entity.
+    """
+    missing = base['iso_code'].isna()
+    if missing.any():
+        by_name = pd.Series(entities.index, index=entities['name'].str.strip())
+        by_name = by_name[~by_name.index.duplicated()]
+        base.loc[missing, 'iso_code'] = base.loc[missing, 'country'].str.strip().map(by_name)
+    return base
+
+
+@traced('fetch_and_process_data')
+def fetch_and_process_data(incremental=False, end_year=None, fetcher=None):
     """
     Fetches data from the World Bank API, tags countries and groups,
     and saves it to disk.
+
+    With incremental=True only the years missing from the store manifest
+    (plus the most recent ones) are requested and merged into the existing store.
+    `fetcher` is a WorldBankFetcher (e.g. pointed at a stub server, or with progress reporting).
     """
-    # 1. Indicators
-    indicators = {
-        'SP.POP.TOTL': 'population',
-        'AG.LND.TOTL.K2': 'surface_area'
-    }
-
-    # 2. Date Range (Kept wide)
-    data_date = (datetime.datetime(1960, 1, 1), datetime.datetime(2023, 12, 31))
-
-    # 3. Fetch Data (Worldwide)
-    # cache=True keeps it in memory, avoids repeated queries (during runtime)
-    df = wbdata.get_dataframe(indicators, country='all', date=data_date)
-    
-    # Get rid of MultiIndex (country, date) -> columns
-    df.reset_index(inplace=True)
-    df['date'] = df['date'].astype(int)
-    
+    end_year = end_year or datetime.date.today().year - 1
+    fetcher = fetcher or default_fetcher()
+
+    existing = load_dataset() if incremental else None
+    manifest = load_manifest() if existing is not None else {'indicators': {}}
+    manifest.setdefault('indicators', {})
+
+    # 1. Work out which (indicator, year range) slices to request
+    plan = {}
+    for code in INDICATORS:
+        covered = manifest['indicators'].get(code)
+        if covered is None and existing is not None and INDICATORS[code] in existing.columns:
+            # Store written before the manifest existed: trust the years it holds
+            covered = _year_ranges(sorted(existing['date'].unique().tolist()))
+            manifest['indicators'][code] = covered
+        plan[code] = _missing_ranges(covered or [], START_YEAR, end_year)
+
+    # 2. Fetch Data (Worldwide). Metadata for all countries/regions first
+    # (entity dimension, cached on disk), then indicator x country-chunk
+    # requests run concurrently per year range.
+    entities = get_entities(fetcher)
+    codes = entities.index.tolist()
+
+    by_range = {}
+    for code, ranges in plan.items():
+        for start, end in ranges:
+            by_range.setdefault((start, end), {})[code] = INDICATORS[code]
+
+    # Rows are keyed by ISO code; names come from the dimension
+    key = ['iso_code', 'date']
+    fetched = None
+    for (start, end), subset in by_range.items():
+        part = fetcher.get_dataframe(subset, start, end, countries=codes, by=('iso_code', 'country'))
+        part['iso_code'] = canonical_keys(part['iso_code'], entities)
+        part = part.set_index(key)
+        fetched = part if fetched is None else fetched.combine_first(part)
+
+    # 3. Merge the new rows into the existing store (new values win)
+    if existing is not None:
+        base = existing[key + ['country'] + [c for c in INDICATORS.values() if c in existing.columns]]
+        base = base.astype({'iso_code': object, 'country': object})
+        base = _legacy_keys(base, entities).dropna(subset=['iso_code']).set_index(key)
+        merged = base if fetched is None else fetched.combine_first(base)
+    else:
+        merged = fetched
+
     # 4. Metadata Integration (To distinguish between Country and Group)
-    # Fetching metadata for all countries/regions
-    countries = wbdata.get_countries()
-    country_meta = pd.DataFrame(countries)
-    
-    # Columns of interest: id (iso code), name, region, incomeLevel
-    # Those with Region value "Aggregates" are not countries (EU, World, OECD etc.)
-    country_meta = country_meta[['name', 'region', 'incomeLevel', 'id']]
-    
-    # Region column returns a dict, let's extract the value
-    country_meta['region_name'] = country_meta['region'].apply(lambda x: x['value'] if isinstance(x, dict) else None)
-    
-    # Mark those labeled "Aggregates"
-    country_meta['is_aggregate'] = country_meta['region_name'] == 'Aggregates'
-    
-    # Merge metadata with the main DataFrame (Merge on Country Name)
-    # Note: 'country' column in wbdata dataframe is the country name.
-    # We also include 'id' which is the ISO code, useful for maps
-    df_final = pd.merge(df, country_meta[['name', 'region_name', 'is_aggregate', 'id']], left_on='country', right_on='name', how='left')
-    
-    # Rename id to iso_code for clarity
-    df_final.rename(columns={'id': 'iso_code'}, inplace=True)
-    
-    # Cleanup unnecessary columns
-    df_final.drop(columns=['name'], inplace=True)
-    
-    # Density Calculation (Feature Engineering)
-    df_final['density'] = df_final['population'] / df_final['surface_area']
-    
-    # Save to disk
-    import os
-    os.makedirs('data', exist_ok=True)
-    df_final.to_csv('data/population_data.csv', index=False)
-    
+    df_final, unmatched = join_entities(merged.reset_index(), entities)
+    columns = ['country', 'date'] + [c for c in INDICATORS.values() if c in df_final.columns]
+    df_final = df_final[columns + ['region_name', 'is_aggregate', 'iso_code']]
+    df_final = df_final.sort_values(['country', 'date'], ascending=[True, False], ignore_index=True)
+
+    # 5. Derived metrics (density, growth rate), only recomputed for new/changed rows
+    changed = None
+    if existing is not None and fetched is not None:
+        changed = pd.MultiIndex.from_frame(df_final[key]).isin(fetched.index)
+    df_final, derived_tags = update_derived(df_final, previous=existing,
+                                            previous_tags=stored_derived_tags() if existing is not None else None,
+                                            changed=changed)
+
+    # Save to disk (columnar store + CSV export + normalized layout)
+    save_dataset(df_final, derived_tags=derived_tags, normalized_path=NORMALIZED_PATH)
+
+    for code, ranges in plan.items():
+        covered = manifest['indicators'].get(code, []) + ranges
+        manifest['indicators'][code] = _year_ranges(sorted({y for a, b in covered for y in range(a, b + 1)}))
+    # Entities of the data missing from the metadata (joined untagged)
+    manifest['unmatched_entities'] = unmatched.to_dict(orient='records')
+    manifest['updated_at'] = datetime.datetime.now().isoformat(timespec='seconds')
+    save_manifest(manifest)
+
     return df_final
 
 if __name__ == "__main__":
     print("Script manuel çalıştırıldı...")
     data = fetch_and_process_data()
-    print(data.sample(5))
\ No newline at end of file
+    print(data.sample(5))
+    unmatched = load_manifest().get('unmatched_entities', [])
+    if unmatched:
+        print(f"Metadata'da bulunmayan {len(unmatched)} varlık:")
+        for entity in unmatched:
+            print(f"  {entity['iso_code']} {entity['country']} ({entity['rows']} satır)")
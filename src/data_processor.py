@@ -1,85 +1,215 @@
+import threading
+from collections import OrderedDict
+
 import pandas as pd
 import numpy as np
+from src.cleaning import BLOCK_STRATEGIES, group_mean_fill
+from src.rank_index import top_n_partial
+from src.derived import compute_metric, previous_rows
+from src.registry import REGISTRY
+from src.telemetry import count, traced
+
+# Missing-data profiles, memoized by dataset version key (shared by all sessions)
+_PROFILE_CACHE = OrderedDict()
+_PROFILE_CACHE_SIZE = 8
+_PROFILE_LOCK = threading.Lock()
+
+
+@traced('profile_missing')
+def profile_missing(df, version=None):
+    """
+    Builds the null bitmask once and derives every missing-data breakdown from it:
+    global, per column, per country, per year and per country x year counts.
+    The result is memoized against `version` (the dataset version key);
+    without one it is computed every time, since fingerprinting the frame
+    costs about as much as the profile itself.
+    """
+    if version is not None:
+        with _PROFILE_LOCK:
+            if version in _PROFILE_CACHE:
+                _PROFILE_CACHE.move_to_end(version)
+                count('cache_hits', cache='missing_profile')
+                return _PROFILE_CACHE[version]
+        count('cache_misses', cache='missing_profile')
+
+    # The single full scan
+    mask = df.isna().to_numpy()
+    per_row = mask.sum(axis=1)
+    per_column = pd.Series(mask.sum(axis=0), index=df.columns)
+
+    c_codes, countries = pd.factorize(df['country'], sort=True)
+    y_codes, years = pd.factorize(df['date'], sort=True)
+    n_c, n_y = len(countries), len(years)
+
+    cell = c_codes * n_y + y_codes
+    by_country_year = np.bincount(cell, weights=per_row, minlength=n_c * n_y).reshape(n_c, n_y)
+    present = np.bincount(cell, minlength=n_c * n_y).reshape(n_c, n_y)
+    by_country_year = pd.DataFrame(by_country_year.astype(np.int64),
+                                   index=pd.Index(countries, name='country'), columns=pd.Index(years, name='date'))
+
+    total_cells = mask.size
+    missing_cells = int(per_row.sum())
+    profile = {
+        'total_cells': total_cells,
+        'missing_cells': missing_cells,
+        'missing_ratio': (missing_cells / total_cells) * 100 if total_cells else 0.0,
+        'by_column': per_column,
+        'by_country': by_country_year.sum(axis=1),
+        'by_year': by_country_year.sum(axis=0),
+        'by_country_year': by_country_year,
+        'mask': mask,
+        'present': present,
+    }
+
+    if version is not None:
+        with _PROFILE_LOCK:
+            _PROFILE_CACHE[version] = profile
+            while len(_PROFILE_CACHE) > _PROFILE_CACHE_SIZE:
+                _PROFILE_CACHE.popitem(last=False)
+    return profile
+
+
+@traced('missing_grid')
+def missing_grid(profile, mode='rows', max_bins=400):
+    """
+    Bins the null bitmask of a profile into a small grid of missing ratios (0..1)
+    for drawing as a single image. Cost is bounded by the output size, not the row count.
+    mode='rows': row blocks x columns; mode='entity_year': countries x years
+    (countries binned into blocks when there are more than max_bins).
+    Returns (grid, row_labels, column_labels).
+    """
+    grids = profile.setdefault('grids', {})
+    if (mode, max_bins) in grids:
+        return grids[(mode, max_bins)]
 
-def calculate_missing_stats(df):
+    if mode == 'entity_year':
+        counts = profile['by_country_year']
+        cells = counts.to_numpy(dtype=np.int64)
+        # Cells per (country, year): rows present for that pair x columns
+        totals = profile['present'] * profile['mask'].shape[1]
+        labels = counts.index.astype(str).tolist()
+        columns = counts.columns.tolist()
+    else:
+        cells = profile['mask']
+        totals = None
+        labels = None
+        columns = profile['by_column'].index.tolist()
+
+    n = cells.shape[0]
+    starts = np.linspace(0, n, min(n, max_bins), endpoint=False).astype(np.int64)
+    if n > max_bins:
+        cells = np.add.reduceat(cells, starts, axis=0, dtype=np.int64)
+        if totals is not None:
+            totals = np.add.reduceat(totals, starts, axis=0, dtype=np.int64)
+        if labels is not None:
+            labels = [labels[i] for i in starts]
+    if totals is None:
+        # Row blocks: every cell of a block counts once
+        sizes = np.diff(np.append(starts, n))
+        totals = np.broadcast_to(sizes[:, None], cells.shape)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        grid = np.where(totals > 0, cells / totals, np.nan)
+    grids[(mode, max_bins)] = (grid, labels, columns)
+    return grid, labels, columns
+
+
+@traced('calculate_missing_stats')
+def calculate_missing_stats(df, version=None):
     """
     Calculates missing value statistics for the dataframe.
+    With a version key the shared (memoized) profile is used; without
+    one only the per-column counts are computed.
     """
-    total_cells = df.size
-    missing_cells = df.isnull().sum().sum()
-    missing_ratio = (missing_cells / total_cells) * 100
-    
+    if version is not None:
+        profile = profile_missing(df, version)
+    else:
+        by_column = df.isna().sum()
+        total_cells = df.size
+        missing_cells = int(by_column.sum())
+        profile = {'total_cells': total_cells, 'missing_cells': missing_cells, 'by_column': by_column,
+                   'missing_ratio': (missing_cells / total_cells) * 100 if total_cells else 0.0}
+
     # Missing by column
-    missing_by_column = df.isnull().sum()
+    missing_by_column = profile['by_column']
     missing_by_column = missing_by_column[missing_by_column > 0]
-    
+
     return {
-        'total_cells': total_cells,
-        'missing_cells': missing_cells,
-        'missing_ratio': missing_ratio,
+        'total_cells': profile['total_cells'],
+        'missing_cells': profile['missing_cells'],
+        'missing_ratio': profile['missing_ratio'],
         'missing_by_column': missing_by_column
     }
 
+@traced('clean_data')
 def clean_data(df, strategy='fill_mean'):
     """
     Cleans the data based on the selected strategy.
+    Strategies: drop, fill_mean, interpolate, ffill, nearest.
+    All fills are vectorized (see src/cleaning.py), no per-country Python calls.
     """
-    df_clean = df.copy()
-    
+    # Fetched and expression metrics of the registry (config/indicators.json)
+    numeric_cols = [c for c in REGISTRY.fill_columns if c in df.columns]
+
+    # Growth rates of the raw data don't describe the cleaned population,
+    # drop them so they get derived again from the cleaned values
+    df = df.drop(columns=REGISTRY.growth_metrics, errors='ignore')
+
     if strategy == 'drop':
         # Drop rows with missing data
-        df_clean.dropna(inplace=True)
-        
-    elif strategy == 'fill_mean':
+        return df.dropna()
+
+    if strategy == 'fill_mean':
         # Fill with mean per country (Most logical approach)
-        # Only fill numeric columns
-        numeric_cols = ['population', 'surface_area', 'density']
-        
         # Each country should use its own mean, not the global mean.
+        codes, uniques = pd.factorize(df['country'])
+        df_clean = df.copy(deep=False)
         for col in numeric_cols:
-            if col in df_clean.columns:
-                df_clean[col] = df_clean.groupby('country')[col].transform(lambda x: x.fillna(x.mean()))
-            
+            df_clean[col] = group_mean_fill(df[col].to_numpy(dtype='float64'), codes, len(uniques))
+
         # If still empty (e.g., a country has no data at all), drop them
-        existing_cols = [c for c in numeric_cols if c in df_clean.columns]
-        if existing_cols:
-            df_clean.dropna(subset=existing_cols, how='all', inplace=True)
-        
-    elif strategy == 'interpolate':
-        # Interpolation is elegant for time series
-        if 'date' in df_clean.columns:
-            df_clean = df_clean.sort_values(by=['country', 'date'])
-            
-        numeric_cols = ['population', 'surface_area', 'density']
-        
+        if numeric_cols:
+            df_clean = df_clean.dropna(subset=numeric_cols, how='all')
+        return df_clean
+
+    if strategy in BLOCK_STRATEGIES:
+        # Time series fills work on contiguous, date-sorted country blocks
+        fill = BLOCK_STRATEGIES[strategy]
+        df_clean = df.sort_values(by=['country', 'date']) if 'date' in df.columns else df.sort_values(by='country')
+
+        codes = pd.factorize(df_clean['country'])[0]
+        starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]]) if len(codes) else np.array([], dtype=int)
         for col in numeric_cols:
-            if col in df_clean.columns:
-                df_clean[col] = df_clean.groupby('country')[col].transform(lambda x: x.interpolate(method='linear', limit_direction='both'))
-                
-    return df_clean
+            df_clean[col] = fill(df_clean[col].to_numpy(dtype='float64'), starts)
+        return df_clean
 
+    return df.copy()
+
+@traced('calculate_growth_rate')
 def calculate_growth_rate(df):
     """
     Calculates the year-over-year population growth rate for each country.
-    Adds a 'growth_rate' column to the dataframe.
+    Adds a 'growth_rate' column (and any other registered growth metric) to the dataframe.
     """
     # Ensure data is sorted by country and date
-    df_sorted = df.sort_values(by=['country', 'date']).copy()
-    
-    # Calculate percentage change for population grouped by country
-    # pct_change() calculates (current - previous) / previous
-    df_sorted['growth_rate'] = df_sorted.groupby('country')['population'].pct_change() * 100
-    
+    df_sorted = df.sort_values(by=['country', 'date'])
+
+    # (current - previous) / previous, previous = same country's previous year
+    prev = previous_rows(df_sorted)
+    for name in REGISTRY.growth_metrics:
+        if REGISTRY.derived[name]['growth_of'] in df_sorted.columns:
+            df_sorted[name] = compute_metric(df_sorted, name, prev=prev)
+
     return df_sorted
 
-def get_top_n_countries(df, year, metric, n=10):
+@traced('get_top_n_countries')
+def get_top_n_countries(df, year, metric, n=10, index=None):
     """
     Returns the top N countries for a given metric in a specific year.
     Filters out aggregates to show only countries.
+    Uses a prebuilt RankIndex when given, otherwise a partial selection.
     """
-    # Filter for the specific year and only countries (not aggregates)
-    mask = (df['date'] == year) & (df['is_aggregate'] == False)
-    df_year = df[mask]
-    
-    # Sort by the metric
-    return df_year.sort_values(by=metric, ascending=False).head(n)
+    if index is not None and metric in index.metrics:
+        return index.top_n(year, metric, n)
+
+    return top_n_partial(df, year, metric, n)
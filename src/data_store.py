@@ -0,0 +1,517 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.feather as feather
+
+from src.registry import REGISTRY
+from src.telemetry import traced
+
+# Primary on-disk store (Arrow IPC, uncompressed so it can be memory-mapped
+# without a decode step) and the CSV export kept for spreadsheets/users
+STORE_PATH = 'data/population_data.arrow'
+CSV_PATH = 'data/population_data.csv'
+# Which (indicator, year range) slices the store already holds
+MANIFEST_PATH = 'data/manifest.json'
+# Long layout (one row per country, year and indicator), for many indicators
+LONG_PATH = 'data/population_long'
+# Normalized layout: entity dimension, yearly facts, slowly changing attributes
+NORMALIZED_PATH = 'data/population_normalized'
+
+# Explicit schema so nothing has to be guessed again on load.
+# Entity attributes repeat on every row, so they are dictionary-encoded.
+SCHEMA = pa.schema([
+    ('country', pa.dictionary(pa.int32(), pa.string())),
+    ('date', pa.int16()),
+    ('population', pa.float64()),
+    ('surface_area', pa.float64()),
+    ('region_name', pa.dictionary(pa.int32(), pa.string())),
+    ('is_aggregate', pa.bool_()),
+    ('iso_code', pa.dictionary(pa.int32(), pa.string())),
+    ('density', pa.float64()),
+])
+
+CATEGORICAL_COLS = ['country', 'region_name', 'iso_code']
+# Per-country attributes (stored once per country in the long layout)
+ENTITY_COLS = ['region_name', 'is_aggregate', 'iso_code']
+
+# Schema metadata keys: content hash of the stored dataset, and the
+# input versions its derived columns were computed from (JSON)
+VERSION_KEY = b'wpi.version'
+DERIVED_KEY = b'wpi.derived'
+
+# pandas dtypes matching SCHEMA, used when falling back to the CSV
+CSV_DTYPES = {
+    'country': 'category',
+    'date': 'int16',
+    'population': 'float64',
+    'surface_area': 'float64',
+    'region_name': 'category',
+    'iso_code': 'category',
+    'density': 'float64',
+}
+
+
+def _normalize(df):
+    """
+    Casts the dataframe to the pandas dtypes matching SCHEMA (shallow copy).
+    """
+    df = df.copy(deep=False)
+    for col in CATEGORICAL_COLS:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+    if 'date' in df.columns:
+        df['date'] = df['date'].astype('int16')
+    if 'is_aggregate' in df.columns:
+        df['is_aggregate'] = df['is_aggregate'].astype('boolean')
+    return df
+
+
+def compact_dtypes(df, registry=REGISTRY):
+    """
+    Memory dtype plan: the SCHEMA dtypes (categoricals, int16 years, nullable
+    booleans) plus float32 for every metric the registry allows it for.
+    Metrics declared float64 (population: float32 can't hold it exactly) are kept.
+    """
+    df = _normalize(df)
+    for col in df.columns:
+        if registry.dtypes.get(col) == 'float32' and df[col].dtype != 'float32':
+            df[col] = df[col].astype('float32')
+    return df
+
+
+def memory_report(before, after):
+    """
+    Per-column memory (deep) of two loads of the same data: dtype and MB
+    before/after and the saving in %. The last row is the total.
+    """
+    columns = list(dict.fromkeys(list(before.columns) + list(after.columns)))
+    mem_before = before.memory_usage(deep=True, index=False)
+    mem_after = after.memory_usage(deep=True, index=False)
+    report = pd.DataFrame({
+        'dtype_before': [str(before[c].dtype) if c in before.columns else '' for c in columns],
+        'mb_before': [mem_before.get(c, 0) / 1e6 for c in columns],
+        'dtype_after': [str(after[c].dtype) if c in after.columns else '' for c in columns],
+        'mb_after': [mem_after.get(c, 0) / 1e6 for c in columns],
+    }, index=pd.Index(columns, name='column'))
+    report.loc['total'] = ['', report['mb_before'].sum(), '', report['mb_after'].sum()]
+    report['saved_pct'] = (1 - report['mb_after'] / report['mb_before'].where(report['mb_before'] > 0)) * 100
+    return report
+
+
+def dataset_version(df):
+    """
+    Content hash identifying a dataset version (used as a cache key for
+    indexes and derived data built from it).
+    """
+    df = _normalize(df)
+    row_hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    digest = hashlib.sha1(row_hashes.tobytes())
+    digest.update(','.join(map(str, df.columns)).encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+def _to_arrow(df, metadata=None):
+    """
+    Converts the dataframe to an Arrow table following SCHEMA.
+    Columns not in SCHEMA (e.g. derived metrics) are appended as they are.
+    """
+    df = _normalize(df)
+
+    fields = [SCHEMA.field(c) for c in SCHEMA.names if c in df.columns]
+    extra = [c for c in df.columns if c not in SCHEMA.names]
+    table = pa.Table.from_pandas(df[[f.name for f in fields] + extra], preserve_index=False)
+    schema = pa.schema(fields + [table.schema.field(c) for c in extra], metadata=metadata)
+    return table.cast(schema)
+
+
+def _to_pandas(table):
+    """
+    Converts an Arrow table back to pandas, keeping the nulls of is_aggregate.
+    """
+    df = table.to_pandas(types_mapper={pa.bool_(): pd.BooleanDtype()}.get)
+    for col in CATEGORICAL_COLS:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype('category')
+    return df
+
+
+@traced('save_dataset')
+def save_dataset(df, path=STORE_PATH, csv_path=CSV_PATH, derived_tags=None, normalized_path=None):
+    """
+    Writes the dataset to the columnar store and (optionally) the CSV export
+    and the normalized layout.
+    derived_tags ({column: input version}) is kept with the derived columns.
+    """
+    version = dataset_version(df)
+    metadata = {VERSION_KEY: version.encode('utf-8')}
+    if derived_tags:
+        metadata[DERIVED_KEY] = json.dumps(derived_tags).encode('utf-8')
+
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    feather.write_feather(_to_arrow(df, metadata), path, compression='uncompressed')
+
+    if csv_path:
+        export_csv(df, csv_path)
+    if normalized_path:
+        save_normalized(df, normalized_path, version)
+
+
+@traced('load_dataset')
+def load_dataset(path=STORE_PATH, csv_path=CSV_PATH, memory_map=True, compact=False):
+    """
+    Loads the dataset from the columnar store.
+    Falls back to the CSV export (with explicit dtypes) if the store is missing.
+    compact=True applies the float32 part of the dtype plan (see compact_dtypes).
+    Returns None if neither exists.
+    """
+    if os.path.exists(path):
+        table = feather.read_table(path, memory_map=memory_map)
+        df = _to_pandas(table)
+    elif csv_path and os.path.exists(csv_path):
+        df = pd.read_csv(csv_path, dtype=CSV_DTYPES)
+        if 'is_aggregate' in df.columns:
+            df['is_aggregate'] = df['is_aggregate'].map({True: True, False: False, 'True': True, 'False': False}).astype('boolean')
+        df = _normalize(df)
+    else:
+        return None
+
+    return compact_dtypes(df) if compact else df
+
+
+def _stored_metadata(path):
+    """
+    Schema metadata of the store (reads only the schema), {} if missing.
+    """
+    if not os.path.exists(path):
+        return {}
+    with pa.memory_map(path) as source:
+        return pa.ipc.open_file(source).schema.metadata or {}
+
+
+def stored_version(path=STORE_PATH):
+    """
+    Version recorded in the store at save time.
+    Returns None if the store is missing or predates versioning.
+    """
+    version = _stored_metadata(path).get(VERSION_KEY)
+    return version.decode('utf-8') if version else None
+
+
+def stored_derived_tags(path=STORE_PATH):
+    """
+    {derived column: input version} recorded with the stored derived columns.
+    """
+    tags = _stored_metadata(path).get(DERIVED_KEY)
+    return json.loads(tags) if tags else {}
+
+
+def export_csv(df, path=CSV_PATH):
+    """
+    Exports the dataset as a plain CSV (same layout as before the columnar store).
+    """
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    df.to_csv(path, index=False)
+
+
+def to_long(df, metrics=None, registry=REGISTRY):
+    """
+    Wide -> long values: (country, date, indicator, value) for every
+    non-missing metric value. indicator is categorical (registry order).
+    Returns {dtype: long dataframe}, each metric going to the dtype the
+    registry declares for it (float32 unless it needs float64, e.g. population).
+    """
+    metrics = [m for m in (metrics or registry.metrics) if m in df.columns]
+    keys = df[['country', 'date']]
+    parts = {}
+    for dtype in sorted({registry.dtypes.get(m, 'float64') for m in metrics}):
+        group = [m for m in metrics if registry.dtypes.get(m, 'float64') == dtype]
+        values = np.column_stack([df[m].to_numpy(dtype='float64', na_value=np.nan) for m in group])
+        rows, cols = np.nonzero(~np.isnan(values))
+        part = keys.iloc[rows].reset_index(drop=True)
+        part['indicator'] = pd.Categorical.from_codes(cols, categories=group)
+        part['value'] = values[rows, cols].astype(dtype)
+        parts[dtype] = part
+    return parts
+
+
+def from_long(parts, entities=None, empty_rows=None):
+    """
+    Long values (+ entity attributes and rows without values) -> wide dataframe.
+    Metric columns come back as float64.
+    """
+    frames = [p.astype({'indicator': str}) for p in parts if len(p)]
+    long = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=['country', 'date', 'indicator', 'value'])
+    long['country'] = long['country'].astype(str)
+    long['value'] = long['value'].astype('float64')
+
+    wide = long.pivot(index=['country', 'date'], columns='indicator', values='value')
+    wide = wide.rename_axis(columns=None).reset_index()
+    if empty_rows is not None and len(empty_rows):
+        wide = pd.concat([wide, empty_rows.astype({'country': str})], ignore_index=True)
+    if entities is not None:
+        wide = wide.merge(entities.astype({'country': str}), on='country', how='left')
+    # Same column order as the wide store
+    columns = [c for c in SCHEMA.names if c in wide.columns] + [c for c in wide.columns if c not in SCHEMA.names]
+    return _normalize(wide[columns].sort_values(['country', 'date'], ascending=[True, False], ignore_index=True))
+
+
+def save_long(df, path=LONG_PATH, metrics=None):
+    """
+    Writes the long layout: values_<dtype>.arrow per value dtype,
+    entities.arrow (attributes per country) and empty_rows.arrow
+    (country-years without any value).
+    """
+    os.makedirs(path, exist_ok=True)
+    parts = to_long(df, metrics)
+    for name in os.listdir(path):
+        if name.startswith('values_') and name[len('values_'):-len('.arrow')] not in parts:
+            os.remove(os.path.join(path, name))
+    for dtype, part in parts.items():
+        feather.write_feather(_to_arrow(part), os.path.join(path, f"values_{dtype}.arrow"), compression='uncompressed')
+
+    entity_cols = [c for c in ENTITY_COLS if c in df.columns]
+    entities = df[['country'] + entity_cols].drop_duplicates('country', ignore_index=True)
+    feather.write_feather(_to_arrow(entities), os.path.join(path, 'entities.arrow'), compression='uncompressed')
+
+    metrics = [m for m in (metrics or REGISTRY.metrics) if m in df.columns]
+    empty = df[metrics].isna().all(axis=1) if metrics else pd.Series(True, index=df.index)
+    feather.write_feather(_to_arrow(df.loc[empty, ['country', 'date']].reset_index(drop=True)),
+                          os.path.join(path, 'empty_rows.arrow'), compression='uncompressed')
+
+
+def load_long(path=LONG_PATH, metrics=None, wide=True):
+    """
+    Reads the long layout, optionally only some metrics (filtered in Arrow,
+    before conversion). Returns the wide dataframe, or the long parts
+    ({dtype: dataframe}) with wide=False. None if there is no long layout.
+    """
+    if not os.path.isdir(path):
+        return None
+    parts = {}
+    for name in sorted(os.listdir(path)):
+        if not name.startswith('values_'):
+            continue
+        table = feather.read_table(os.path.join(path, name), memory_map=True)
+        if metrics is not None:
+            table = table.filter(pc.is_in(table['indicator'], value_set=pa.array(metrics, pa.string())))
+        parts[name[len('values_'):-len('.arrow')]] = _to_pandas(table)
+    if not wide:
+        return parts
+
+    entities = _to_pandas(feather.read_table(os.path.join(path, 'entities.arrow')))
+    empty_rows = None
+    if metrics is None:
+        empty_rows = _to_pandas(feather.read_table(os.path.join(path, 'empty_rows.arrow')))
+    return from_long(parts.values(), entities, empty_rows)
+
+
+def to_normalized(df, registry=REGISTRY):
+    """
+    Splits the wide dataframe into the normalized tables:
+    entities (entity_id, country and its attributes, one row per country),
+    facts (entity_id, date and the yearly metrics, in registry dtypes) and
+    attributes (entity_id, valid_from and the slowly changing indicators,
+    one row per run of equal values of a country).
+    """
+    df = _normalize(df)
+    ids, countries = pd.factorize(df['country'], sort=True)
+    ids = ids.astype(np.int32)
+
+    entity_cols = [c for c in ENTITY_COLS if c in df.columns]
+    first = np.full(len(countries), -1)
+    first[ids[::-1]] = np.arange(len(df))[::-1]
+    entities = df[['country'] + entity_cols].iloc[first].reset_index(drop=True)
+    entities.insert(0, 'entity_id', np.arange(len(countries), dtype=np.int32))
+
+    slow = [c for c in registry.slowly_changing if c in df.columns]
+    metrics = [c for c in df.columns if c not in ['country', 'date'] + entity_cols + slow]
+    facts = pd.DataFrame({'entity_id': ids, 'date': df['date'].to_numpy()})
+    for col in metrics:
+        facts[col] = df[col].to_numpy(dtype=registry.dtypes.get(col, 'float64'), na_value=np.nan)
+
+    # A new attribute row whenever a value changes (NaN counts as a value)
+    order = np.lexsort((df['date'].to_numpy(), ids))
+    values = {c: df[c].to_numpy(dtype=registry.dtypes.get(c, 'float64'), na_value=np.nan)[order] for c in slow}
+    starts = np.ones(len(order), dtype=bool)
+    if len(order):
+        same = ids[order][1:] == ids[order][:-1]
+        for v in values.values():
+            same &= (v[1:] == v[:-1]) | (np.isnan(v[1:]) & np.isnan(v[:-1]))
+        starts[1:] = ~same
+    attributes = pd.DataFrame({'entity_id': ids[order][starts], 'valid_from': df['date'].to_numpy()[order][starts]})
+    for col, v in values.items():
+        attributes[col] = v[starts]
+    return entities, facts, attributes
+
+
+def _attribute_rows(attributes, ids, dates):
+    """
+    Row of the attribute table valid for each (entity, date): the last
+    valid_from <= date of that entity, -1 if none.
+    Each attribute row is located once in the sorted facts and carried
+    forward (linear in the facts, a search per attribute row only).
+    """
+    shift = np.int64(1 << 16)
+    keys = attributes['entity_id'].to_numpy(np.int64) * shift + attributes['valid_from'].to_numpy(np.int64)
+    order = np.argsort(keys, kind='stable')
+    query = ids.astype(np.int64) * shift + dates
+
+    fact_order = np.argsort(query, kind='stable')
+    sorted_query = query[fact_order]
+    starts = np.searchsorted(sorted_query, keys[order], side='left')
+
+    # int32 positions: half the memory traffic of int64 on long panels
+    current = np.full(len(query) + 1, -1, dtype=np.int32)
+    np.maximum.at(current, starts, np.arange(len(order), dtype=np.int32))
+    current = np.maximum.accumulate(current[:-1])
+    found = order.astype(np.int32)[current]
+    found[current < 0] = -1
+
+    rows = np.empty(len(query), dtype=np.int32)
+    rows[fact_order] = found
+    # A row carried over from the previous entity does not apply
+    invalid = attributes['entity_id'].to_numpy()[rows] != ids
+    invalid |= rows < 0
+    rows = rows.copy()
+    rows[invalid] = -1
+    return rows
+
+
+def from_normalized(entities, facts, attributes):
+    """
+    Rebuilds the wide dataframe from the normalized tables: entity columns
+    and attributes are gathered by integer position (no merge), rows keep
+    the order of the facts.
+    """
+    ids = facts['entity_id'].to_numpy()
+    dates = facts['date'].to_numpy()
+    # entity_id is the row of the entity in its table
+    position = np.empty(int(entities['entity_id'].max()) + 1 if len(entities) else 0, dtype=np.int64)
+    position[entities['entity_id'].to_numpy()] = np.arange(len(entities))
+    rows = position[ids]
+
+    columns = {'date': dates}
+    for col in entities.columns.drop('entity_id'):
+        column = entities[col]
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            columns[col] = pd.Categorical.from_codes(column.cat.codes.to_numpy()[rows], dtype=column.dtype)
+        else:
+            columns[col] = column.array.take(rows)
+
+    slow = attributes.columns.drop(['entity_id', 'valid_from'])
+    if len(slow):
+        attribute_rows = _attribute_rows(attributes, ids, dates)
+        missing = attribute_rows < 0
+        for col in slow:
+            values = attributes[col].to_numpy()[attribute_rows]
+            if missing.any():
+                values = np.where(missing, np.nan, values).astype(values.dtype)
+            columns[col] = values
+
+    for col in facts.columns.drop(['entity_id', 'date']):
+        columns[col] = facts[col].to_numpy()
+
+    order = [c for c in SCHEMA.names if c in columns] + [c for c in columns if c not in SCHEMA.names]
+    return pd.DataFrame({c: columns[c] for c in order}, copy=False)
+
+
+@traced('save_normalized')
+def save_normalized(df, path=NORMALIZED_PATH, version=None):
+    """
+    Writes the normalized layout: entities.arrow, facts.arrow and
+    attributes.arrow. The facts carry the version of the wide dataset.
+    """
+    os.makedirs(path, exist_ok=True)
+    version = version or dataset_version(df)
+    entities, facts, attributes = to_normalized(df)
+    tables = {
+        'entities': _to_arrow(entities),
+        # Values keep the registry dtypes (not cast to SCHEMA)
+        'facts': pa.Table.from_pandas(facts, preserve_index=False).replace_schema_metadata(
+            {VERSION_KEY: version.encode('utf-8')}),
+        'attributes': pa.Table.from_pandas(attributes, preserve_index=False).replace_schema_metadata(None),
+    }
+    for name, table in tables.items():
+        tmp = os.path.join(path, f"{name}.arrow.{os.getpid()}.tmp")
+        try:
+            feather.write_feather(table, tmp, compression='uncompressed')
+            os.replace(tmp, os.path.join(path, f"{name}.arrow"))
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+
+@traced('load_normalized')
+def load_normalized(path=NORMALIZED_PATH, version=None):
+    """
+    Reads the normalized layout back as the wide dataframe (metrics in the
+    registry dtypes, like load_dataset(compact=True)). Returns None if there
+    is no normalized layout, or if version is given and the layout was
+    written from another version of the dataset.
+    """
+    facts_path = os.path.join(path, 'facts.arrow')
+    if not os.path.exists(facts_path):
+        return None
+    facts = feather.read_table(facts_path, memory_map=True)
+    stored = (facts.schema.metadata or {}).get(VERSION_KEY)
+    if version is not None and (stored is None or stored.decode('utf-8') != version):
+        return None
+    entities = _to_pandas(feather.read_table(os.path.join(path, 'entities.arrow')))
+    attributes = feather.read_table(os.path.join(path, 'attributes.arrow')).to_pandas()
+    return from_normalized(entities, facts.to_pandas(), attributes)
+
+
+def load_manifest(path=MANIFEST_PATH):
+    """
+    Loads the store manifest: {'indicators': {code: [[start, end], ...]}}.
+    Returns an empty manifest if none has been written yet.
+    """
+    if os.path.exists(path):
+        with open(path) as f:
+            return json.load(f)
+    return {'indicators': {}}
+
+
+def save_manifest(manifest, path=MANIFEST_PATH):
+    """
+    Writes the store manifest next to the data.
+    """
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build the columnar store from the CSV export")
+    parser.add_argument('--report', action='store_true',
+                        help="only print the per-column memory of pd.read_csv defaults vs the compact load")
+    args = parser.parse_args()
+
+    if args.report:
+        if not os.path.exists(CSV_PATH):
+            raise SystemExit(f"No data found at {CSV_PATH}")
+        report = memory_report(pd.read_csv(CSV_PATH), load_dataset(compact=True))
+        print(report.to_string(float_format=lambda v: f"{v:.3f}"))
+        raise SystemExit(0)
+
+    # Convert an existing CSV export into the columnar store
+    data = load_dataset()
+    if data is None:
+        print(f"No data found at {CSV_PATH}")
+    else:
+        # Imported here: src.derived depends on this module
+        from src.derived import update_derived
+        data, tags = update_derived(data)
+        save_dataset(data, csv_path=None, derived_tags=tags, normalized_path=NORMALIZED_PATH)
+        print(f"Wrote {len(data)} rows to {STORE_PATH}")
+        normalized = sum(os.path.getsize(os.path.join(NORMALIZED_PATH, n)) for n in os.listdir(NORMALIZED_PATH))
+        print(f"Wrote {NORMALIZED_PATH}: {normalized / 1e6:.2f} MB "
+              f"(wide store {os.path.getsize(STORE_PATH) / 1e6:.2f} MB)")
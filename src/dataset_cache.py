@@ -0,0 +1,66 @@
+import threading
+from collections import OrderedDict
+
+from src.telemetry import count
+
+
+class DatasetCache:
+    """
+    Process-wide LRU cache of datasets (e.g. cleaned variants), keyed by
+    (dataset version, strategy) strings. Sessions keep only the key, so
+    memory scales with the number of distinct variants, not with users.
+
+    Concurrent requests for the same missing key build it once: the other
+    callers wait for the first build instead of repeating it.
+    """
+
+    def __init__(self, max_entries=8, name='dataset'):
+        self.max_entries = max_entries
+        self.name = name  # label of the cache hit/miss counters
+        self.entries = OrderedDict()
+        self.building = {}
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_build(self, key, build):
+        """
+        Returns the dataset for key, calling build() once on a miss.
+        """
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                count('cache_hits', cache=self.name)
+                return self.entries[key]
+            self.misses += 1
+            # One lock per key being built
+            key_lock = self.building.setdefault(key, threading.Lock())
+        count('cache_misses', cache=self.name)
+
+        with key_lock:
+            with self.lock:
+                if key in self.entries:
+                    self.entries.move_to_end(key)
+                    return self.entries[key]
+
+            try:
+                value = build()
+                with self.lock:
+                    self.entries[key] = value
+                    self.entries.move_to_end(key)
+                    while len(self.entries) > self.max_entries:
+                        self.entries.popitem(last=False)
+            finally:
+                # Also after a failed build: the next caller builds again
+                with self.lock:
+                    self.building.pop(key, None)
+        return value
+
+    def __contains__(self, key):
+        with self.lock:
+            return key in self.entries
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
@@ -0,0 +1,154 @@
+import numpy as np
+import pandas as pd
+
+from src.data_store import dataset_version
+from src.registry import REGISTRY
+from src.telemetry import traced
+
+KEY_COLS = ['country', 'date']
+
+# Derived column -> input columns it is computed from (see config/indicators.json)
+DERIVED_COLUMNS = {name: REGISTRY.inputs(name) for name in REGISTRY.derived}
+
+
+def input_version(df, col, registry=REGISTRY):
+    """
+    Version of the inputs a derived column is computed from.
+    """
+    return dataset_version(df[KEY_COLS + registry.inputs(col)])
+
+
+def previous_rows(df):
+    """
+    Position of the previous year's row of the same country for every row (-1 if none).
+    """
+    codes = pd.factorize(df['country'])[0]
+    order = np.lexsort((df['date'].to_numpy(), codes))
+    prev_sorted = np.r_[-1, order[:-1]] if len(order) else order
+    first = np.r_[True, codes[order][1:] != codes[order][:-1]] if len(order) else np.array([], dtype=bool)
+    prev_sorted = np.where(first, -1, prev_sorted)
+
+    prev = np.empty(len(df), dtype=np.int64)
+    prev[order] = prev_sorted
+    return prev
+
+
+def compute_expression(df, name, rows=None, registry=REGISTRY):
+    """
+    Expression metric (e.g. density = population / surface_area) for the
+    given row positions (all rows by default).
+    """
+    rows = slice(None) if rows is None else rows
+    columns = {c: df[c].to_numpy(dtype='float64', na_value=np.nan)[rows] for c in registry.inputs(name)}
+    return np.asarray(registry.evaluate(name, columns), dtype='float64')
+
+
+def compute_density(df, rows=None):
+    """
+    population / surface_area for the given row positions (all rows by default).
+    """
+    return compute_expression(df, 'density', rows)
+
+
+def compute_growth_rate(df, rows=None, prev=None, column='population'):
+    """
+    Year-over-year change (%) of a column for the given row positions.
+    NaN when the previous year or the value itself is missing.
+    """
+    prev = previous_rows(df) if prev is None else prev
+    rows = np.arange(len(df)) if rows is None else rows
+    values = df[column].to_numpy(dtype='float64', na_value=np.nan)
+
+    p = prev[rows]
+    out = np.full(len(rows), np.nan)
+    has_prev = p >= 0
+    with np.errstate(invalid='ignore', divide='ignore'):
+        out[has_prev] = (values[rows[has_prev]] / values[p[has_prev]] - 1) * 100
+    return out
+
+
+def compute_metric(df, name, rows=None, prev=None, registry=REGISTRY):
+    """
+    Any registered derived metric for the given row positions.
+    """
+    spec = registry.derived[name]
+    if 'growth_of' in spec:
+        return compute_growth_rate(df, rows, prev, column=spec['growth_of'])
+    return compute_expression(df, name, rows, registry)
+
+
+@traced('update_derived')
+def update_derived(df, previous=None, previous_tags=None, changed=None, registry=REGISTRY):
+    """
+    Adds/refreshes the derived columns, recomputing only what is affected.
+
+    previous / previous_tags: the stored dataset and the input versions its
+    derived columns were computed from. Rows whose inputs are unchanged reuse
+    the stored values; `changed` (boolean mask over df rows) marks rows known
+    to have new inputs, otherwise the inputs are compared with `previous`.
+    A column whose tag does not match the inputs stored in `previous` is
+    recomputed in full.
+
+    Returns (df, tags) where tags maps each derived column to its input version.
+    """
+    previous_tags = previous_tags or {}
+    df = df.copy(deep=False)
+    tags = {}
+    prev = None
+
+    # Align the stored dataset to df rows (position in previous, -1 if new)
+    aligned = None
+    if previous is not None:
+        old_keys = pd.MultiIndex.from_arrays([previous[c].astype(str) if c == 'country' else previous[c] for c in KEY_COLS])
+        new_keys = pd.MultiIndex.from_arrays([df[c].astype(str) if c == 'country' else df[c] for c in KEY_COLS])
+        aligned = old_keys.get_indexer(new_keys)
+
+    for col in registry.derived:
+        inputs = registry.inputs(col)
+        if not all(c in df.columns for c in inputs):
+            continue
+        version = input_version(df, col, registry)
+        tags[col] = version
+
+        # The stored values must come from the stored inputs
+        reusable = (aligned is not None and col in previous.columns and previous_tags.get(col) is not None
+                    and all(c in previous.columns for c in inputs)
+                    and previous_tags[col] == input_version(previous, col, registry))
+        if not reusable:
+            prev = previous_rows(df) if prev is None and col in registry.growth_metrics else prev
+            df[col] = compute_metric(df, col, prev=prev, registry=registry)
+            continue
+
+        if previous_tags[col] == version and (aligned >= 0).all():
+            df[col] = previous[col].to_numpy()[aligned]
+            continue
+
+        # Rows with new or changed inputs
+        affected = aligned < 0
+        # `changed` marks fetched inputs; metrics of derived metrics compare values
+        if changed is not None and all(c in registry.indicators.values() for c in inputs):
+            affected |= np.asarray(changed, dtype=bool)
+        else:
+            for c in inputs:
+                new_vals = df[c].to_numpy(dtype='float64', na_value=np.nan)
+                old_vals = np.full(len(df), np.nan)
+                old_vals[~affected] = previous[c].to_numpy(dtype='float64', na_value=np.nan)[aligned[~affected]]
+                affected |= ~((new_vals == old_vals) | (np.isnan(new_vals) & np.isnan(old_vals)))
+
+        values = np.full(len(df), np.nan)
+        values[~affected] = previous[col].to_numpy(dtype='float64', na_value=np.nan)[aligned[~affected]]
+
+        rows = np.flatnonzero(affected)
+        if col not in registry.growth_metrics:
+            values[rows] = compute_expression(df, col, rows, registry)
+        else:
+            # A changed value also changes the following year's growth
+            prev = previous_rows(df) if prev is None else prev
+            following = np.zeros(len(df), dtype=bool)
+            has_prev = prev >= 0
+            following[has_prev] = affected[prev[has_prev]]
+            rows = np.flatnonzero(affected | following)
+            values[rows] = compute_metric(df, col, rows, prev, registry)
+        df[col] = values
+
+    return df, tags
@@ -0,0 +1,192 @@
+"""
+Entity dimension: the World Bank country/aggregate metadata as a table
+keyed by ISO code, cached on disk (data/entities.arrow).
+
+The panel joins it through an integer surrogate key (the dimension row of
+each distinct ISO code): codes are resolved once per entity, not matched by
+name row by row, so a renamed country ("Turkey" -> "Turkiye") keeps its
+rows and entities missing from the metadata are reported instead of being
+left untagged.
+"""
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from src.telemetry import count, traced
+
+ENTITIES_PATH = 'data/entities.arrow'
+
+# Metadata older than this is fetched again
+MAX_AGE_DAYS = 7
+
+AGGREGATE_REGION = 'Aggregates'
+
+
+def _value(field):
+    # Region / income level are {'id', 'iso2code', 'value'} records
+    return field.get('value') if isinstance(field, dict) else field
+
+
+def build_entities(countries):
+    """
+    Dimension table from get_countries() records, indexed by ISO code:
+    name, iso2_code, region_name, income_level, is_aggregate.
+    """
+    countries = list(countries)
+    entities = pd.DataFrame({
+        'iso_code': [c['id'] for c in countries],
+        'name': [c['name'] for c in countries],
+        'iso2_code': [c.get('iso2Code') for c in countries],
+        'region_name': [_value(c.get('region')) for c in countries],
+        'income_level': [_value(c.get('incomeLevel')) for c in countries],
+    })
+    # Those with Region value "Aggregates" are not countries (EU, World, OECD etc.)
+    entities['is_aggregate'] = entities['region_name'] == AGGREGATE_REGION
+
+    duplicated = entities['iso_code'][entities['iso_code'].duplicated()]
+    if len(duplicated):
+        raise ValueError(f"duplicate ISO codes in country metadata: {', '.join(duplicated)}")
+    return entities.set_index('iso_code')
+
+
+def save_entities(entities, path=ENTITIES_PATH):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        feather.write_feather(pa.Table.from_pandas(entities.reset_index(), preserve_index=False), tmp,
+                              compression='uncompressed')
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def load_entities(path=ENTITIES_PATH):
+    """
+    The cached dimension table, None if missing.
+    """
+    if not os.path.exists(path):
+        return None
+    return feather.read_table(path).to_pandas().set_index('iso_code')
+
+
+def get_entities(fetcher, path=ENTITIES_PATH, max_age_days=MAX_AGE_DAYS, refresh=False):
+    """
+    The dimension table from the disk cache, fetched again (and cached)
+    when missing, older than max_age_days or refresh=True. A stale copy is
+    used if the fetch fails.
+    """
+    fresh = os.path.exists(path) and time.time() - os.path.getmtime(path) < max_age_days * 86400
+    if fresh and not refresh:
+        count('cache_hits', cache='entities')
+        return load_entities(path)
+    count('cache_misses', cache='entities')
+
+    try:
+        entities = build_entities(fetcher.get_countries())
+    except Exception:
+        if os.path.exists(path):
+            return load_entities(path)
+        raise
+    save_entities(entities, path)
+    return entities
+
+
+def _dimension_rows(values, entities):
+    """
+    Dimension row of each distinct key value (ISO3 code, or the ISO2 code
+    some API records carry), -1 when not in the dimension.
+    """
+    rows = entities.index.get_indexer(values)
+    unknown = rows < 0
+    if unknown.any():
+        by_iso2 = pd.Index(entities['iso2_code'])
+        if by_iso2.is_unique:
+            rows[unknown] = by_iso2.get_indexer(values[unknown])
+    return rows
+
+
+def _as_category(keys):
+    return keys if isinstance(keys.dtype, pd.CategoricalDtype) else keys.astype('category')
+
+
+def resolve_keys(keys, entities):
+    """
+    Surrogate keys: the dimension row of every value of `keys`, -1 when not
+    in the dimension. Codes are looked up once per distinct value.
+    """
+    keys = _as_category(keys)
+    rows = _dimension_rows(keys.cat.categories, entities)
+    codes = keys.cat.codes.to_numpy()
+    return np.where(codes >= 0, rows[codes], -1)
+
+
+def canonical_keys(keys, entities):
+    """
+    keys with ISO2 aliases replaced by the dimension's ISO3 code
+    (values not in the dimension are kept as they are).
+    """
+    keys = _as_category(keys)
+    categories = keys.cat.categories
+    rows = _dimension_rows(categories, entities)
+    canonical = np.where(rows >= 0, entities.index.to_numpy(dtype=object)[rows], categories.to_numpy(dtype=object))
+    codes = keys.cat.codes.to_numpy()
+    return pd.Series(np.where(codes >= 0, canonical[codes], None), index=keys.index, name=keys.name)
+
+
+def _take(per_key, codes):
+    """
+    Row values of a categorical column from one value per key (integer take only).
+    """
+    key_codes, uniques = pd.factorize(pd.Series(per_key, dtype=object), sort=True)
+    return pd.Categorical.from_codes(np.where(codes >= 0, key_codes[codes], -1), categories=uniques)
+
+
+@traced('join_entities')
+def join_entities(df, entities, key='iso_code'):
+    """
+    Tags the panel with the dimension: country (the current name),
+    region_name, is_aggregate and the canonical iso_code (as categoricals).
+    Every distinct code is resolved once; the rows only take integer codes.
+    Rows whose code is not in the dimension keep their fetched name and get
+    null tags. Returns (tagged df, unmatched entities as a DataFrame with
+    iso_code, country and rows).
+    """
+    keys = _as_category(df[key])
+    categories = keys.cat.categories
+    codes = keys.cat.codes.to_numpy()
+    rows = _dimension_rows(categories, entities)
+    matched = rows >= 0
+    safe = np.where(matched, rows, 0)
+
+    # Fallback name of unmatched codes: their first fetched name
+    fallback = np.full(len(categories), None, dtype=object)
+    if 'country' in df.columns and not matched.all():
+        first = np.full(len(categories), -1)
+        positions = np.flatnonzero(codes >= 0)[::-1]
+        first[codes[positions]] = positions
+        have = (first >= 0) & ~matched
+        fallback[have] = df['country'].to_numpy(dtype=object)[first[have]]
+
+    def per_key(column):
+        return np.where(matched, entities[column].to_numpy(dtype=object)[safe], None)
+
+    out = df.copy()
+    out['country'] = _take(np.where(matched, per_key('name'), fallback), codes)
+    out['region_name'] = _take(per_key('region_name'), codes)
+    out['is_aggregate'] = pd.array(per_key('is_aggregate'), dtype='boolean').take(codes, allow_fill=True)
+    out[key] = _take(np.where(matched, entities.index.to_numpy(dtype=object)[safe], categories.to_numpy(dtype=object)),
+                     codes)
+
+    rows_per_key = np.bincount(codes[codes >= 0], minlength=len(categories))
+    missing = ~matched & (rows_per_key > 0)
+    unmatched = pd.DataFrame({key: categories[missing].astype(str), 'country': fallback[missing],
+                              'rows': rows_per_key[missing]})
+    if len(unmatched):
+        count('unmatched_entities', len(unmatched))
+    return out, unmatched
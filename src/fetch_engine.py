@@ -0,0 +1,185 @@
+import json
+import random
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import pandas as pd
+
+from src.http_cache import cache_key
+from src.telemetry import count, span, traced
+
+# World Bank API v2 (JSON). Can be pointed at a local stub server.
+WB_API_URL = 'https://api.worldbank.org/v2'
+
+# HTTP status codes worth retrying (rate limited / temporary server errors)
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+class FetchError(Exception):
+    """
+    Raised when a request still fails after all retries,
+    or when the API answers with an error message.
+    """
+
+
+class RateLimiter:
+    """
+    Global rate limit shared by all worker threads (requests per second).
+    """
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0.0
+        self.next_slot = 0.0
+        self.lock = threading.Lock()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class WorldBankFetcher:
+    """
+    Runs indicator x country-chunk requests concurrently on a bounded thread pool,
+    with per-request retries (exponential backoff), a global rate limit and
+    progress reporting through `progress(done, total)`.
+
+    Responses are served from / stored in `cache` (a ResponseCache) when given.
+    With offline=True only the cache is used and a miss raises FetchError.
+    """
+
+    def __init__(self, base_url=WB_API_URL, max_workers=8, rate_limit=20.0,
+                 retries=4, backoff=0.5, timeout=30, chunk_size=50,
+                 per_page=20000, progress=None, cache=None, offline=False):
+        self.base_url = base_url.rstrip('/')
+        self.max_workers = max_workers
+        self.limiter = RateLimiter(rate_limit)
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.chunk_size = chunk_size
+        self.per_page = per_page
+        self.progress = progress
+        self.cache = cache
+        self.offline = offline
+
+    # --- HTTP ---
+
+    def _get_json(self, path, params):
+        """
+        GETs one API page, retrying transient failures with backoff.
+        """
+        query = urllib.parse.urlencode(dict(params, format='json'))
+        url = f"{self.base_url}/{path}?{query}"
+
+        key = cache_key(f"{self.base_url}/{path}", params)
+        if self.cache is not None:
+            payload = self.cache.get(key, allow_stale=self.offline)
+            count('cache_hits' if payload is not None else 'cache_misses', cache='http')
+            if payload is not None:
+                return payload
+        if self.offline:
+            raise FetchError(f"{url}: not in cache (offline mode)")
+
+        endpoint = 'indicator' if '/indicator/' in path else path.split('/')[0]
+        for attempt in range(self.retries + 1):
+            self.limiter.wait()
+            count('http_requests', endpoint=endpoint)
+            try:
+                with span('fetch.request', endpoint=endpoint):
+                    with urllib.request.urlopen(url, timeout=self.timeout) as resp:
+                        payload = json.loads(resp.read().decode('utf-8'))
+                break
+            except urllib.error.HTTPError as e:
+                count('http_errors', status=e.code)
+                if e.code not in RETRY_STATUS or attempt == self.retries:
+                    raise FetchError(f"{url}: HTTP {e.code}") from e
+            except (urllib.error.URLError, TimeoutError, ConnectionError) as e:
+                count('http_errors', status='network')
+                if attempt == self.retries:
+                    raise FetchError(f"{url}: {e}") from e
+            # Exponential backoff with a little jitter so workers don't retry in lockstep
+            time.sleep(self.backoff * (2 ** attempt) * (1 + random.random() * 0.1))
+
+        # Errors come back as [{"message": [...]}] with HTTP 200
+        if isinstance(payload, list) and payload and 'message' in payload[0]:
+            raise FetchError(f"{url}: {payload[0]['message']}")
+
+        if self.cache is not None:
+            self.cache.put(key, url, payload)
+        return payload
+
+    def _get_all_pages(self, path, params):
+        """
+        Follows the API pagination and returns the concatenated records.
+        """
+        params = dict(params, per_page=self.per_page, page=1)
+        header, records = self._get_json(path, params)
+        records = records or []
+        for page in range(2, int(header.get('pages', 1)) + 1):
+            _, more = self._get_json(path, dict(params, page=page))
+            records.extend(more or [])
+        return records
+
+    # --- API ---
+
+    @traced('fetch.get_countries')
+    def get_countries(self):
+        """
+        Returns the country/aggregate metadata (same records as wbdata.get_countries()).
+        """
+        return self._get_all_pages('country', {})
+
+    @traced('fetch.fetch_indicators')
+    def fetch_indicators(self, indicators, countries, start, end):
+        """
+        Fetches every indicator for every country code over [start, end].
+        Returns a long dataframe: indicator, iso_code, country, date, value.
+        """
+        chunks = [countries[i:i + self.chunk_size] for i in range(0, len(countries), self.chunk_size)]
+        tasks = [(code, chunk) for code in indicators for chunk in chunks]
+
+        rows = []
+        done = 0
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = [
+                pool.submit(self._get_all_pages,
+                            f"country/{';'.join(chunk)}/indicator/{code}",
+                            {'date': f"{start}:{end}"})
+                for code, chunk in tasks
+            ]
+            for future in as_completed(futures):
+                for rec in future.result():
+                    rows.append((rec['indicator']['id'], rec.get('countryiso3code') or rec['country']['id'],
+                                 rec['country']['value'], int(rec['date']), rec['value']))
+                done += 1
+                if self.progress:
+                    self.progress(done, len(tasks))
+
+        return pd.DataFrame(rows, columns=['indicator', 'iso_code', 'country', 'date', 'value'])
+
+    @traced('fetch.get_dataframe')
+    def get_dataframe(self, indicators, start, end, countries=None, by=('country',)):
+        """
+        Wide dataframe (country, date, one column per indicator name),
+        like wbdata.get_dataframe(...).reset_index().
+        `by` are the entity columns of the rows, e.g. ('iso_code', 'country').
+        """
+        if countries is None:
+            countries = [c['id'] for c in self.get_countries()]
+
+        long_df = self.fetch_indicators(list(indicators), countries, start, end)
+        long_df['value'] = pd.to_numeric(long_df['value'], errors='coerce')
+        wide = long_df.groupby([*by, 'date', 'indicator'])['value'].first().unstack('indicator')
+        wide = wide.reindex(columns=list(indicators)).rename(columns=indicators)
+        wide.columns.name = None
+        return wide.reset_index()
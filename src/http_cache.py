@@ -0,0 +1,146 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+import urllib.parse
+
+# On-disk cache of World Bank API responses, shared by all processes
+CACHE_DIR = 'data/cache/http'
+DEFAULT_TTL = 7 * 24 * 3600           # World Bank data changes rarely
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+# Full directory scan at least every N puts (other processes share the directory)
+EVICT_EVERY = 256
+
+
+def cache_key(url, params):
+    """
+    Stable key for a request: URL plus sorted query parameters.
+    """
+    query = urllib.parse.urlencode(sorted((k, str(v)) for k, v in params.items()))
+    return hashlib.sha256(f"{url}?{query}".encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    """
+    Persistent JSON response cache with a TTL and size-based LRU eviction.
+    One file per response; the file mtime is used as the last-access time.
+    Expired entries are not served (unless allow_stale) but stay on disk
+    until the size limit is reached.
+
+    The directory size is tracked with a byte counter updated on every put;
+    the directory is only scanned when the counter exceeds max_bytes or
+    every EVICT_EVERY puts, not on each put.
+    """
+
+    def __init__(self, path=CACHE_DIR, ttl=DEFAULT_TTL, max_bytes=DEFAULT_MAX_BYTES, evict_every=EVICT_EVERY):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.evict_every = evict_every
+        os.makedirs(path, exist_ok=True)
+        self._lock = threading.Lock()
+        self._bytes = None  # unknown until the first scan
+        self._puts = 0
+
+    def _file(self, key):
+        return os.path.join(self.path, f"{key}.json")
+
+    def get(self, key, allow_stale=False):
+        """
+        Returns the cached payload, or None if missing or older than the TTL
+        (stale entries are still served when allow_stale=True, e.g. offline).
+        """
+        path = self._file(key)
+        try:
+            with open(path) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if not allow_stale and self.ttl is not None and time.time() - entry['fetched_at'] > self.ttl:
+            return None
+
+        # Mark as recently used for LRU eviction
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry['payload']
+
+    def put(self, key, url, payload):
+        """
+        Stores a response (atomically) and evicts old entries if over the size limit.
+        """
+        entry = {'url': url, 'fetched_at': time.time(), 'payload': payload}
+        fd, tmp = tempfile.mkstemp(dir=self.path, suffix='.tmp')
+        path = self._file(key)
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(entry, f)
+            try:
+                replaced = os.path.getsize(path)
+            except OSError:
+                replaced = 0
+            size = os.path.getsize(tmp)
+            os.replace(tmp, path)
+        except BaseException:
+            # No partial file left behind (e.g. a payload json can't encode, disk full)
+            os.remove(tmp)
+            raise
+
+        with self._lock:
+            self._puts += 1
+            if self._bytes is not None:
+                self._bytes += size - replaced
+            due = (self._bytes is None or self._puts >= self.evict_every
+                   or (self.max_bytes and self._bytes > self.max_bytes))
+        if due:
+            self.evict()
+
+    def evict(self):
+        """
+        When the cache exceeds max_bytes, removes the entries not used
+        within the TTL (expired), then least recently used entries until it
+        fits. Expired entries are kept while there is room: offline mode
+        still serves them. Resets the byte counter from the scan.
+        """
+        entries = []
+        total = 0
+        for name in os.listdir(self.path):
+            if not name.endswith('.json'):
+                continue
+            try:
+                st = os.stat(os.path.join(self.path, name))
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, name))
+            total += st.st_size
+
+        if self.max_bytes and total > self.max_bytes:
+            # Last access older than the TTL: fetched even earlier, so expired
+            expired_before = time.time() - self.ttl if self.ttl is not None else None
+            for mtime, size, name in sorted(entries):
+                if total <= self.max_bytes and (expired_before is None or mtime >= expired_before):
+                    break
+                try:
+                    os.remove(os.path.join(self.path, name))
+                    total -= size
+                except OSError:
+                    pass
+
+        with self._lock:
+            self._bytes = total
+            self._puts = 0
+
+    def clear(self):
+        """
+        Deletes every cached response.
+        """
+        for name in os.listdir(self.path):
+            if name.endswith('.json'):
+                os.remove(os.path.join(self.path, name))
+        with self._lock:
+            self._bytes = 0
+            self._puts = 0
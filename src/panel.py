@@ -0,0 +1,184 @@
+import numpy as np
+import pandas as pd
+
+from src.cleaning import BLOCK_STRATEGIES
+
+# Entity attributes kept in the side table (one row per entity, not per year)
+META_COLS = ['region_name', 'is_aggregate', 'iso_code']
+
+
+class PopulationPanel:
+    """
+    Dense entity x year x indicator panel.
+
+    values[e, y, i] holds indicator i of entity e in year y (NaN when missing).
+    `present` marks which (entity, year) rows existed in the source frame.
+    Per-year and per-entity slices are NumPy views, and growth rates, fills
+    and top-N are axis operations instead of sorts and groupbys.
+    """
+
+    def __init__(self, values, entities, years, indicators, meta, present=None):
+        self.values = values
+        self.entities = pd.Index(entities, name='country')
+        self.years = np.asarray(years)
+        self.indicators = list(indicators)
+        self.meta = meta
+        self.present = present if present is not None else np.ones(values.shape[:2], dtype=bool)
+
+        self.entity_pos = {name: i for i, name in enumerate(self.entities)}
+        self.year_pos = {int(year): i for i, year in enumerate(self.years)}
+        self.indicator_pos = {name: i for i, name in enumerate(self.indicators)}
+
+    # --- Conversion ---
+
+    @classmethod
+    def from_frame(cls, df, indicators=None):
+        """
+        Builds a panel from the long-format dataframe (country, date, metrics...).
+        """
+        if indicators is None:
+            indicators = [c for c in df.select_dtypes('number').columns if c != 'date']
+
+        e_codes, entities = pd.factorize(df['country'], sort=True)
+        y_codes, years = pd.factorize(df['date'], sort=True)
+
+        values = np.full((len(entities), len(years), len(indicators)), np.nan)
+        for i, col in enumerate(indicators):
+            values[e_codes, y_codes, i] = df[col].to_numpy(dtype='float64', na_value=np.nan)
+
+        present = np.zeros((len(entities), len(years)), dtype=bool)
+        present[e_codes, y_codes] = True
+
+        meta_cols = [c for c in META_COLS if c in df.columns]
+        first_row = np.unique(e_codes, return_index=True)[1]
+        meta = df[meta_cols].iloc[first_row].set_axis(pd.Index(entities, name='country'))
+
+        return cls(values, entities, years, indicators, meta, present)
+
+    def to_frame(self):
+        """
+        Back to the long-format dataframe app.py works with (one row per
+        entity and year that existed in the source).
+        """
+        e_idx, y_idx = np.nonzero(self.present)
+        df = pd.DataFrame({
+            'country': pd.Categorical.from_codes(e_idx, categories=self.entities),
+            'date': self.years[y_idx],
+        })
+        for i, name in enumerate(self.indicators):
+            df[name] = self.values[e_idx, y_idx, i]
+        for col in self.meta.columns:
+            df[col] = self.meta[col].take(e_idx).reset_index(drop=True)
+        return df
+
+    def _replace(self, values, indicators=None):
+        return PopulationPanel(values, self.entities, self.years, indicators or self.indicators,
+                               self.meta, self.present)
+
+    # --- Slices (views, no copy) ---
+
+    def year_slice(self, year):
+        """
+        entities x indicators for one year.
+        """
+        return self.values[:, self.year_pos[int(year)], :]
+
+    def entity_slice(self, entity):
+        """
+        years x indicators for one entity.
+        """
+        return self.values[self.entity_pos[entity]]
+
+    def indicator(self, name):
+        """
+        entities x years for one indicator.
+        """
+        return self.values[:, :, self.indicator_pos[name]]
+
+    # --- Axis operations ---
+
+    def growth_rate(self, indicator='population', across_gaps=False):
+        """
+        Year-over-year percentage change along the year axis (entities x years).
+        By default a year is compared with the previous year column, so the
+        year after a missing row gets NaN. across_gaps=True compares it with
+        the entity's previous present row instead, like the DataFrame path
+        (calculate_growth_rate / previous_rows).
+        """
+        series = self.indicator(indicator)
+        out = np.full(series.shape, np.nan)
+        if not across_gaps:
+            with np.errstate(invalid='ignore', divide='ignore'):
+                out[:, 1:] = (series[:, 1:] / series[:, :-1] - 1) * 100
+            return out
+
+        # Year position of the previous present row of each entity (-1 if none)
+        positions = np.where(self.present, np.arange(series.shape[1])[None, :], -1)
+        last = np.maximum.accumulate(positions, axis=1)
+        prev = np.full(series.shape, -1)
+        prev[:, 1:] = last[:, :-1]
+        has_prev = (prev >= 0) & self.present
+        rows, cols = np.nonzero(has_prev)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            out[rows, cols] = (series[rows, cols] / series[rows, prev[rows, cols]] - 1) * 100
+        return out
+
+    def with_growth_rate(self, indicator='population', across_gaps=False):
+        """
+        New panel with a 'growth_rate' indicator appended.
+        """
+        growth = self.growth_rate(indicator, across_gaps)[:, :, None]
+        if 'growth_rate' in self.indicator_pos:
+            values = self.values.copy()
+            values[:, :, self.indicator_pos['growth_rate']] = growth[:, :, 0]
+            return self._replace(values)
+        return self._replace(np.concatenate([self.values, growth], axis=2), self.indicators + ['growth_rate'])
+
+    def fill(self, strategy='interpolate', indicators=None):
+        """
+        New panel with gaps filled along the year axis.
+        Strategies: fill_mean, interpolate, ffill, nearest (see src/cleaning.py).
+        """
+        indicators = indicators or self.indicators
+        values = self.values.copy()
+        n_entities, n_years = values.shape[:2]
+
+        for name in indicators:
+            i = self.indicator_pos[name]
+            series = values[:, :, i]
+            if strategy == 'fill_mean':
+                valid = ~np.isnan(series) & self.present
+                with np.errstate(invalid='ignore', divide='ignore'):
+                    means = np.where(valid, series, 0).sum(axis=1, keepdims=True) / valid.sum(axis=1, keepdims=True)
+                values[:, :, i] = np.where(np.isnan(series), means, series)
+            elif strategy in BLOCK_STRATEGIES:
+                # Each entity's row of years is one contiguous block
+                starts = np.arange(n_entities) * n_years
+                values[:, :, i] = BLOCK_STRATEGIES[strategy](series.ravel(), starts).reshape(n_entities, n_years)
+            else:
+                raise ValueError(f"Unknown strategy: {strategy}")
+
+        # Rows that never existed stay empty
+        values[~self.present] = np.nan
+        return self._replace(values)
+
+    def top_n(self, year, indicator, n=10, include_aggregates=False):
+        """
+        Top N entities for an indicator in a year (NaN never ranks).
+        Returns a dataframe with country, the indicator and the entity metadata.
+        """
+        column = self.year_slice(year)[:, self.indicator_pos[indicator]]
+        candidates = ~np.isnan(column) & self.present[:, self.year_pos[int(year)]]
+        if not include_aggregates and 'is_aggregate' in self.meta.columns:
+            # Entities without metadata are not ranked either (same as get_top_n_countries)
+            candidates &= (self.meta['is_aggregate'] == False).fillna(False).to_numpy(dtype=bool)
+
+        idx = np.flatnonzero(candidates)
+        if len(idx) > n:
+            idx = idx[np.argpartition(-column[idx], n - 1)[:n]]
+        idx = idx[np.argsort(-column[idx], kind='stable')]
+
+        result = self.meta.iloc[idx].reset_index()
+        result.insert(1, indicator, column[idx])
+        result.insert(1, 'date', int(year))
+        return result
@@ -0,0 +1,65 @@
+import numpy as np
+
+# Analysis scopes of the Overview tab
+SCOPES = ['countries', 'aggregates', 'all']
+
+
+class PartitionIndex:
+    """
+    Rows grouped by year, then scope (countries / aggregates / untagged),
+    built once per dataset version.
+
+    Every (scope, year) and every ('all', year) slice is a contiguous range
+    of the row order, so reading it is a take of O(rows in that year)
+    instead of two boolean scans over the whole frame. The index keeps only
+    the order and the ranges; rows are taken from the shared frame.
+    """
+
+    def __init__(self, df):
+        is_aggregate = df['is_aggregate']
+        # 0 = country, 1 = aggregate, 2 = no metadata (only part of 'all')
+        scope = np.where((is_aggregate == False).fillna(False).to_numpy(dtype=bool), 0,
+                         np.where((is_aggregate == True).fillna(False).to_numpy(dtype=bool), 1, 2))
+        dates = df['date'].to_numpy()
+
+        order = np.lexsort((scope, dates))
+        self.df = df
+        self.order = order
+        sorted_dates = dates[order]
+        sorted_scope = scope[order]
+
+        self.ranges = {}
+        years, year_starts = np.unique(sorted_dates, return_index=True)
+        year_ends = np.append(year_starts[1:], len(order))
+        for year, start, end in zip(years.tolist(), year_starts, year_ends):
+            self.ranges[('all', year)] = (int(start), int(end))
+            # Scope boundaries inside the year block
+            bounds = start + np.searchsorted(sorted_scope[start:end], [0, 1, 2])
+            self.ranges[('countries', year)] = (int(bounds[0]), int(bounds[1]))
+            self.ranges[('aggregates', year)] = (int(bounds[1]), int(bounds[2]))
+
+        self.year_bounds = {}
+        for name in SCOPES:
+            present = [year for (s, year), (a, b) in self.ranges.items() if s == name and b > a]
+            self.year_bounds[name] = (min(present), max(present)) if present else (None, None)
+
+    def years(self, scope):
+        """
+        (min year, max year) with rows in the scope.
+        """
+        return self.year_bounds[scope]
+
+    def slice(self, scope, year):
+        """
+        Rows of one scope and year (a positional take, no scan).
+        """
+        start, end = self.ranges.get((scope, int(year)), (0, 0))
+        return self.df.iloc[self.order[start:end]]
+
+    def rows(self, scope):
+        """
+        Rows of one scope across all years, in year order.
+        """
+        spans = [self.ranges[key] for key in sorted(k for k in self.ranges if k[0] == scope)]
+        positions = np.concatenate([self.order[a:b] for a, b in spans]) if spans else np.array([], dtype=int)
+        return self.df.iloc[positions]
@@ -0,0 +1,194 @@
+"""
+Headless batch pipeline: [fetch ->] clean -> derive -> rank -> export.
+
+Independent tasks of a stage (every cleaning strategy, every ranked metric)
+run in a process pool. Every task records a hash of its inputs (stored
+dataset versions + parameters) in a state file and is skipped on the next
+run if that hash and its outputs are unchanged.
+
+Usage: python -m src.pipeline [--stages fetch,clean,derive,rank,export]
+                              [--strategies drop,fill_mean,...] [--workers N] [--force]
+"""
+import argparse
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from src.data_store import STORE_PATH, load_dataset, save_dataset, export_csv, stored_version, dataset_version
+from src.data_processor import clean_data
+from src.derived import update_derived
+from src.rank_index import RankIndex
+from src.registry import REGISTRY
+
+OUTPUT_DIR = 'data/pipeline'
+STATE_FILE = 'state.json'
+STAGES = ['fetch', 'clean', 'derive', 'rank', 'export']
+DEFAULT_STAGES = ['clean', 'derive', 'rank', 'export']
+STRATEGIES = ['drop', 'fill_mean', 'interpolate', 'ffill', 'nearest']
+RANK_METRICS = REGISTRY.metrics
+
+
+# --- Tasks (module level so the process pool can pickle them) ---
+
+def clean_task(source, output, strategy):
+    df = load_dataset(source, csv_path=None)
+    save_dataset(clean_data(df, strategy), output, csv_path=None)
+
+
+def derive_task(source, output):
+    # No previous version: density and growth rate are computed from the cleaned values
+    df, tags = update_derived(load_dataset(source, csv_path=None))
+    save_dataset(df, output, csv_path=None, derived_tags=tags)
+
+
+def rank_task(source, output, metric, n):
+    """
+    Top N countries of every year for one metric, as one CSV.
+    """
+    df = load_dataset(source, csv_path=None)
+    if metric not in df.columns:
+        raise ValueError(f"{metric} is not in {source}")
+    index = RankIndex(df, [metric])
+    frames = []
+    for year in sorted(index.spans[metric]):
+        top = index.top_n(year, metric, n)[['date', 'country', 'iso_code', metric]].dropna(subset=[metric])
+        frames.append(top.assign(rank=range(1, len(top) + 1)))
+    ranked = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=['date', 'country', 'iso_code', metric, 'rank'])
+    export_csv(ranked, output)
+
+
+def export_task(source, output):
+    export_csv(load_dataset(source, csv_path=None), output)
+
+
+# --- Runner ---
+
+def _input_version(path):
+    """
+    Version of an Arrow input (from its metadata, hashing the data only for old stores).
+    """
+    version = stored_version(path)
+    if version is None:
+        df = load_dataset(path, csv_path=None)
+        version = dataset_version(df) if df is not None else None
+    return version
+
+
+def _task_key(stage, params, inputs):
+    payload = json.dumps({'stage': stage, 'params': params,
+                          'inputs': [_input_version(p) for p in inputs]}, sort_keys=True)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def plan(stages, strategies, out_dir, source=STORE_PATH, top_n=20):
+    """
+    Tasks per stage: {stage: [(name, func, args, inputs, outputs), ...]}.
+    """
+    clean_path = lambda s: os.path.join(out_dir, 'clean', f"{s}.arrow")
+    derived_path = lambda s: os.path.join(out_dir, 'derived', f"{s}.arrow")
+    tasks = {stage: [] for stage in stages}
+    for s in strategies:
+        if 'clean' in tasks:
+            tasks['clean'].append((f"clean/{s}", clean_task, (source, clean_path(s), s), [source], [clean_path(s)]))
+        if 'derive' in tasks:
+            tasks['derive'].append((f"derive/{s}", derive_task, (clean_path(s), derived_path(s)),
+                                    [clean_path(s)], [derived_path(s)]))
+        if 'rank' in tasks:
+            for metric in RANK_METRICS:
+                out = os.path.join(out_dir, 'rank', s, f"{metric}.csv")
+                tasks['rank'].append((f"rank/{s}/{metric}", rank_task, (derived_path(s), out, metric, top_n),
+                                      [derived_path(s)], [out]))
+        if 'export' in tasks:
+            out = os.path.join(out_dir, 'export', f"{s}.csv")
+            tasks['export'].append((f"export/{s}", export_task, (derived_path(s), out), [derived_path(s)], [out]))
+    return tasks
+
+
+def run(stages=DEFAULT_STAGES, strategies=STRATEGIES, out_dir=OUTPUT_DIR, workers=None, force=False,
+        incremental=True, top_n=20):
+    """
+    Runs the stages in order; tasks within a stage run in parallel.
+    Returns {task name: 'ran' | 'skipped' | 'failed: <error>'}.
+    """
+    state_path = os.path.join(out_dir, STATE_FILE)
+    state = {}
+    if os.path.exists(state_path) and not force:
+        with open(state_path) as f:
+            state = json.load(f)
+
+    results = {}
+    if 'fetch' in stages:
+        # Network bound and already parallel inside, runs in this process
+        from src.data_fetcher import fetch_and_process_data
+        fetch_and_process_data(incremental=incremental)
+        results['fetch'] = 'ran'
+
+    tasks = plan([s for s in stages if s != 'fetch'], strategies, out_dir, top_n=top_n)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for stage in STAGES:
+            if stage not in tasks:
+                continue
+            t0 = time.perf_counter()
+            futures = {}
+            for name, func, args, inputs, outputs in tasks[stage]:
+                missing = [p for p in inputs if not os.path.exists(p)]
+                if missing:
+                    results[name] = f"failed: missing input {missing[0]}"
+                    continue
+                key = _task_key(stage, args[2:], inputs)
+                if state.get(name) == key and all(os.path.exists(p) for p in outputs):
+                    results[name] = 'skipped'
+                    continue
+                futures[pool.submit(func, *args)] = (name, key)
+
+            for future in as_completed(futures):
+                name, key = futures[future]
+                try:
+                    future.result()
+                except Exception as e:
+                    results[name] = f"failed: {e}"
+                    state.pop(name, None)
+                    continue
+                results[name] = 'ran'
+                state[name] = key
+
+            outcomes = [results[name].split(':')[0] for name, *_ in tasks[stage]]
+            print(f"{stage:<7} {outcomes.count('ran'):>3} ran, {outcomes.count('skipped'):>3} skipped, "
+                  f"{outcomes.count('failed'):>3} failed ({time.perf_counter() - t0:.2f}s)")
+
+            # Saved after every stage so an interrupted run keeps its progress
+            os.makedirs(out_dir, exist_ok=True)
+            with open(state_path, 'w') as f:
+                json.dump(state, f, indent=2, sort_keys=True)
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Population data batch pipeline")
+    parser.add_argument('--stages', default=','.join(DEFAULT_STAGES),
+                        help=f"comma-separated subset of {','.join(STAGES)}")
+    parser.add_argument('--strategies', default=','.join(STRATEGIES))
+    parser.add_argument('--out', default=OUTPUT_DIR)
+    parser.add_argument('--workers', type=int, default=None, help="processes (default: all cores)")
+    parser.add_argument('--top-n', type=int, default=20)
+    parser.add_argument('--full-fetch', action='store_true', help="full instead of incremental fetch")
+    parser.add_argument('--force', action='store_true', help="ignore the state file and rerun everything")
+    args = parser.parse_args()
+
+    stages = args.stages.split(',')
+    strategies = args.strategies.split(',')
+    unknown = [s for s in stages if s not in STAGES] + [s for s in strategies if s not in STRATEGIES]
+    if unknown:
+        parser.error(f"unknown stage(s)/strategy(ies): {', '.join(unknown)}")
+
+    results = run(stages, strategies, args.out, args.workers, args.force,
+                  incremental=not args.full_fetch, top_n=args.top_n)
+    failed = {name: r for name, r in results.items() if r.startswith('failed')}
+    for name, r in failed.items():
+        print(f"{name}: {r}")
+    raise SystemExit(1 if failed else 0)
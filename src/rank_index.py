@@ -0,0 +1,73 @@
+import numpy as np
+
+
+class RankIndex:
+    """
+    Pre-sorted ranking of non-aggregate entities for every (year, metric).
+
+    Built once per dataset version: for each metric, the row positions of
+    non-aggregate rows sorted by year, then by value descending (NaN last).
+    A top-N query is then a slice of that order, O(n).
+    """
+
+    def __init__(self, df, metrics=None):
+        if metrics is None:
+            metrics = [c for c in df.select_dtypes('number').columns if c != 'date']
+
+        self.df = df
+        self.metrics = list(metrics)
+
+        # Only countries are ranked (same filter as get_top_n_countries)
+        rows = np.flatnonzero((df['is_aggregate'] == False).fillna(False).to_numpy(dtype=bool))
+        dates = df['date'].to_numpy()[rows]
+
+        self.order = {}
+        self.spans = {}
+        for metric in self.metrics:
+            values = df[metric].to_numpy(dtype='float64', na_value=np.nan)[rows]
+            # lexsort: last key is primary -> by date, then -value (NaN sorts last)
+            perm = np.lexsort((-values, dates))
+            years, starts = np.unique(dates[perm], return_index=True)
+            ends = np.append(starts[1:], len(perm))
+
+            self.order[metric] = rows[perm]
+            self.spans[metric] = {int(y): (int(s), int(e)) for y, s, e in zip(years, starts, ends)}
+
+    def top_n(self, year, metric, n=10):
+        """
+        Rows of the top N countries for metric in year (like
+        df.sort_values(metric, ascending=False, kind='stable').head(n):
+        ties in row order, NaN rows last).
+        """
+        span = self.spans[metric].get(int(year))
+        if span is None:
+            return self.df.iloc[0:0]
+        start, end = span
+        return self.df.iloc[self.order[metric][start:min(end, start + n)]]
+
+
+def top_n_partial(df, year, metric, n=10):
+    """
+    Top N without an index: filters the year once and uses a partial
+    selection (argpartition) instead of a full sort.
+    """
+    mask = (df['date'] == year) & (df['is_aggregate'] == False)
+    rows = np.flatnonzero(mask.fillna(False).to_numpy(dtype=bool))
+    values = df[metric].to_numpy(dtype='float64', na_value=np.nan)[rows]
+
+    valid = ~np.isnan(values)
+    candidates, nan_rows = rows[valid], rows[~valid]
+    scores = -values[valid]
+
+    if len(candidates) > n:
+        # Values tied with the n-th one are taken in row order, like a stable sort
+        kth = np.partition(scores, n - 1)[n - 1]
+        better = np.flatnonzero(scores < kth)
+        tied = np.flatnonzero(scores == kth)[:n - len(better)]
+        keep = np.sort(np.concatenate([better, tied]))
+        candidates, scores = candidates[keep], scores[keep]
+    top = candidates[np.argsort(scores, kind='stable')]
+
+    # Like sort_values: NaN rows only show up if there are fewer than n values
+    top = np.concatenate([top, nan_rows[:max(0, n - len(top))]])
+    return df.iloc[top]
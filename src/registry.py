@@ -0,0 +1,179 @@
+"""
+Registry of fetched indicators and derived metrics, loaded from
+config/indicators.json (or the file named by WPI_INDICATORS).
+
+Indicators map a World Bank code to a column name. Derived metrics are
+either an arithmetic expression over other metrics
+("density": "population / surface_area") or the year-over-year growth of
+one metric ("growth_rate": growth_of "population"). Adding a metric is a
+config change; fetching, cleaning, derivation and ranking follow it.
+
+Indicators flagged "slowly_changing" (surface area) are stored once per
+run of equal values in the normalized layout instead of every year.
+"""
+import ast
+import json
+import operator
+import os
+
+import numpy as np
+
+REGISTRY_PATH = os.environ.get(
+    'WPI_INDICATORS',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'config', 'indicators.json'))
+
+DTYPES = ('float32', 'float64')
+
+# Operators allowed in derived metric expressions
+_BINARY_OPS = {ast.Add: operator.add, ast.Sub: operator.sub, ast.Mult: operator.mul,
+               ast.Div: operator.truediv, ast.Pow: operator.pow}
+_UNARY_OPS = {ast.USub: operator.neg, ast.UAdd: operator.pos}
+
+
+def _check_expression(node, expression):
+    """
+    Validates an expression tree and returns the metric names it uses.
+    """
+    if isinstance(node, ast.Expression):
+        return _check_expression(node.body, expression)
+    if isinstance(node, ast.BinOp) and type(node.op) in _BINARY_OPS:
+        return _check_expression(node.left, expression) | _check_expression(node.right, expression)
+    if isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY_OPS:
+        return _check_expression(node.operand, expression)
+    if isinstance(node, ast.Name):
+        return {node.id}
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+        return set()
+    raise ValueError(f"unsupported syntax in derived expression '{expression}'")
+
+
+def _evaluate(node, columns):
+    if isinstance(node, ast.Expression):
+        return _evaluate(node.body, columns)
+    if isinstance(node, ast.BinOp):
+        return _BINARY_OPS[type(node.op)](_evaluate(node.left, columns), _evaluate(node.right, columns))
+    if isinstance(node, ast.UnaryOp):
+        return _UNARY_OPS[type(node.op)](_evaluate(node.operand, columns))
+    if isinstance(node, ast.Name):
+        return columns[node.id]
+    return node.value
+
+
+class Registry:
+    """
+    Parsed indicator/derived metric definitions.
+    """
+
+    def __init__(self, indicators, derived=()):
+        self.indicators = {}  # World Bank code -> column
+        self.labels = {}
+        self.dtypes = {}
+        self.derived = {}  # column -> definition
+        self.slowly_changing = []  # indicators that rarely change across years
+        self._trees = {}
+
+        for spec in indicators:
+            self._add_name(spec['name'], spec)
+            self.indicators[spec['code']] = spec['name']
+            if spec.get('slowly_changing'):
+                self.slowly_changing.append(spec['name'])
+
+        for spec in derived:
+            name = spec['name']
+            if ('expression' in spec) == ('growth_of' in spec):
+                raise ValueError(f"derived metric '{name}' needs exactly one of 'expression' or 'growth_of'")
+            if 'expression' in spec:
+                tree = ast.parse(spec['expression'], mode='eval')
+                inputs = sorted(_check_expression(tree, spec['expression']))
+                self._trees[name] = tree
+            else:
+                inputs = [spec['growth_of']]
+            unknown = [c for c in inputs if c not in self.labels]
+            if unknown:
+                # Inputs must be defined before (no cycles)
+                raise ValueError(f"derived metric '{name}' uses undefined metric(s): {', '.join(unknown)}")
+            self._add_name(name, spec)
+            self.derived[name] = dict(spec, inputs=inputs)
+
+    def _add_name(self, name, spec):
+        if name in self.labels:
+            raise ValueError(f"metric '{name}' is defined twice")
+        dtype = spec.get('dtype', 'float64')
+        if dtype not in DTYPES:
+            raise ValueError(f"metric '{name}': dtype must be one of {DTYPES}")
+        self.labels[name] = spec.get('label', name)
+        self.dtypes[name] = dtype
+
+    @property
+    def base_metrics(self):
+        """
+        Fetched indicator columns.
+        """
+        return list(self.indicators.values())
+
+    @property
+    def metrics(self):
+        """
+        All metric columns, fetched then derived (in definition order).
+        """
+        return list(self.labels)
+
+    @property
+    def growth_metrics(self):
+        return [name for name, spec in self.derived.items() if 'growth_of' in spec]
+
+    @property
+    def fill_columns(self):
+        """
+        Columns cleaning strategies fill: fetched indicators and expression
+        metrics. Growth metrics are derived again from the cleaned values.
+        """
+        return [m for m in self.metrics if m not in self.growth_metrics]
+
+    def inputs(self, name):
+        return self.derived[name]['inputs']
+
+    def evaluate(self, name, columns):
+        """
+        Evaluates an expression metric on {column: numpy array}.
+        """
+        with np.errstate(invalid='ignore', divide='ignore', over='ignore'):
+            return _evaluate(self._trees[name], columns)
+
+
+def load_registry(path=REGISTRY_PATH):
+    """
+    Loads and validates the registry configuration.
+    """
+    with open(path, encoding='utf-8') as f:
+        config = json.load(f)
+    return Registry(config.get('indicators', []), config.get('derived', []))
+
+
+# Registry used by default across the package
+REGISTRY = load_registry()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Show the metric registry and the storage layouts of the store")
+    parser.add_argument('--write-long', action='store_true', help="also write the long layout of the store")
+    args = parser.parse_args()
+
+    for code, name in REGISTRY.indicators.items():
+        print(f"{name:<16} {REGISTRY.dtypes[name]:<8} {code}")
+    for name, spec in REGISTRY.derived.items():
+        rule = spec.get('expression') or f"growth of {spec['growth_of']}"
+        print(f"{name:<16} {REGISTRY.dtypes[name]:<8} {rule}")
+
+    # Imported here: src.data_store depends on this module
+    from src.data_store import load_dataset, to_long, save_long, LONG_PATH
+    data = load_dataset()
+    if data is not None:
+        wide_mb = data.memory_usage(deep=True).sum() / 1e6
+        long_mb = sum(p.memory_usage(deep=True).sum() for p in to_long(data).values()) / 1e6
+        print(f"\nIn memory: wide {wide_mb:.2f} MB, long values {long_mb:.2f} MB")
+        if args.write_long:
+            save_long(data)
+            print(f"Wrote {LONG_PATH}")
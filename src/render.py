@@ -0,0 +1,77 @@
+import io
+import threading
+from collections import OrderedDict
+
+from matplotlib.figure import Figure
+
+from src.telemetry import count, span, traced
+
+
+@traced('render_png')
+def render_png(draw, figsize=(8, 5), dpi=100):
+    """
+    Draws a chart on a fresh matplotlib Figure and returns the PNG bytes.
+
+    The Figure is created without pyplot, so it is never registered in
+    pyplot's global figure list; it is cleared once rendered and freed
+    with its last reference.
+    """
+    fig = Figure(figsize=figsize, dpi=dpi)
+    try:
+        draw(fig)
+        buf = io.BytesIO()
+        fig.savefig(buf, format='png', bbox_inches='tight')
+        return buf.getvalue()
+    finally:
+        fig.clear()
+
+
+class FigureCache:
+    """
+    Process-wide LRU cache of finished charts, keyed by
+    (dataset version, chart kind, parameters).
+
+    Matplotlib charts are stored as PNG bytes; Plotly charts as the built
+    figure object (building it with plotly.express is the expensive part).
+    """
+
+    def __init__(self, max_entries=256, name='figure'):
+        self.max_entries = max_entries
+        self.name = name  # label of the cache hit/miss counters
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_build(self, key, build):
+        """
+        Returns the cached value for key, calling build() on a miss.
+        """
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                count('cache_hits', cache=self.name)
+                return self.entries[key]
+            self.misses += 1
+        count('cache_misses', cache=self.name)
+
+        with span('chart.build'):
+            value = build()
+
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        return value
+
+    def png(self, key, draw, figsize=(8, 5), dpi=100):
+        """
+        Cached PNG of a matplotlib chart drawn by draw(fig).
+        """
+        return self.get_or_build(key, lambda: render_png(draw, figsize, dpi))
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
@@ -0,0 +1,503 @@
+"""
+Report generation from the live dataset.
+
+The figures of the reports (row counts, top-5 tables, data quality) are
+computed once per scope (the whole world or one region) into a JSON
+serializable context. The context fills the Markdown template
+(templates/report.md) and generate_docx_report.build_docx; the chart
+images of all variants are rendered in parallel worker processes.
+
+A build cache (data/reports/build_cache.json) records the dataset version
+and template hash each report was built from; up-to-date reports are
+skipped without loading the dataset.
+
+Usage: python -m src.reporting [--regions all|"South Asia",...] [--formats md,docx] [--force]
+"""
+import hashlib
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+
+import numpy as np
+
+from src.data_processor import calculate_growth_rate, get_top_n_countries, profile_missing
+from src.data_store import STORE_PATH, dataset_version, load_dataset, stored_version
+from src.render import render_png
+from src.telemetry import span, traced
+
+MD_TEMPLATE = 'templates/report.md'
+DOCX_SCRIPT = 'generate_docx_report.py'
+REPORT_DIR = 'data/reports'
+CHART_DIR = os.path.join(REPORT_DIR, 'charts')
+# Charts of the world report are committed with report.md
+WORLD_CHART_DIR = 'photos/report'
+BUILD_CACHE_PATH = os.path.join(REPORT_DIR, 'build_cache.json')
+FORMATS = ['md', 'docx']
+TOP_N = 5
+
+# Outputs of the world report (region variants go to REPORT_DIR/<slug>/)
+WORLD_OUTPUTS = {'md': 'report.md', 'docx': 'World_Population_Insights_Final_Report.docx'}
+
+_PLACEHOLDER = re.compile(r'{{\s*(\w+)\s*}}')
+
+
+def slugify(region):
+    return re.sub(r'[^a-z0-9]+', '-', region.lower()).strip('-')
+
+
+def output_path(region, fmt):
+    """
+    Where a report variant is written.
+    """
+    if region is None:
+        return WORLD_OUTPUTS[fmt]
+    return os.path.join(REPORT_DIR, slugify(region), os.path.basename(WORLD_OUTPUTS[fmt]))
+
+
+def list_regions(df):
+    """
+    Regions that contain countries (aggregates excluded).
+    """
+    countries = df[df['is_aggregate'] == False]
+    return sorted(countries['region_name'].dropna().unique().tolist())
+
+
+def _fmt_int(value):
+    return f"{value:,.0f}"
+
+
+def _fmt_size(size):
+    return f"{size / 1e6:.1f} MB" if size >= 1e5 else f"{size / 1e3:.0f} KB"
+
+
+def _scope(df, region):
+    if region is None:
+        return df
+    return df[(df['region_name'] == region) & (df['is_aggregate'] == False)]
+
+
+def _complete_series(scope):
+    """
+    Countries with a population value in every year, and the share of
+    missing years between a country's first and last value (temporal gaps).
+    """
+    countries = scope[scope['is_aggregate'] == False]
+    present = countries['population'].notna().groupby(countries['country'], observed=True).agg(['sum', 'size'])
+    complete = int((present['sum'] == present['size']).sum())
+
+    years = countries['date'].to_numpy()
+    valid = countries['population'].notna().to_numpy()
+    codes, names = countries['country'].factorize()
+    first = np.full(len(names), np.iinfo(np.int64).max)
+    last = np.full(len(first), np.iinfo(np.int64).min)
+    np.minimum.at(first, codes[valid], years[valid])
+    np.maximum.at(last, codes[valid], years[valid])
+    inside = (years > first[codes]) & (years < last[codes])
+    gaps = int((inside & ~valid).sum())
+    return complete, len(present), gaps / len(countries) * 100 if len(countries) else 0.0
+
+
+def _top(df, year, metric, n):
+    top = get_top_n_countries(df, year, metric, n)
+    return top[top[metric].notna()]
+
+
+def _table(top, columns):
+    """
+    Rows of a top-N table, every cell formatted as text.
+    """
+    return [[str(rank)] + [fmt(row) for fmt in columns]
+            for rank, (_, row) in enumerate(top.iterrows(), 1)]
+
+
+@traced('report_context')
+def report_context(df, region=None, n=TOP_N, version=None):
+    """
+    Figures filling the report templates for the world (region=None) or one region.
+    df must have the derived metrics (growth_rate, density).
+    """
+    scope = _scope(df, region)
+    if scope.empty:
+        raise ValueError(f"no data for region '{region}'")
+    countries = scope[scope['is_aggregate'] == False]
+    year = int(countries.loc[countries['population'].notna(), 'date'].max())
+    first_year, last_year = int(scope['date'].min()), int(scope['date'].max())
+
+    n_entities = scope['country'].nunique()
+    n_countries = countries['country'].nunique()
+    if region is None:
+        entities = f"{n_entities} ({n_countries} countries + {n_entities - n_countries} regional aggregates)"
+    else:
+        entities = f"{n_countries} countries"
+
+    # Region variants are memoized under their own key
+    profile = profile_missing(scope, version if region is None or version is None else f"{version}:{region}")
+    complete, n_series, gaps = _complete_series(scope)
+
+    # Shares of the world (all countries) population, also in region variants
+    world = df[(df['date'] == year) & (df['is_aggregate'] == False)]['population'].sum()
+    region_of = df[df['is_aggregate'] == False].drop_duplicates('country').set_index('country')['region_name']
+
+    top = {metric: _top(scope, year, metric, n) for metric in ('population', 'growth_rate', 'density')}
+    population = _table(top['population'], [
+        lambda r: r['country'],
+        lambda r: _fmt_int(r['population']),
+        lambda r: f"{r['population'] / world * 100:.1f}%",
+    ])
+    growth = _table(top['growth_rate'], [
+        lambda r: r['country'],
+        lambda r: f"{r['growth_rate']:.2f}%",
+        lambda r: str(region_of.get(r['country'], '')),
+    ])
+    density = _table(top['density'], [
+        lambda r: r['country'],
+        lambda r: _fmt_int(r['density']),
+        lambda r: _fmt_int(r['population']),
+    ])
+
+    ctx = {
+        'region': region,
+        'scope': region or 'World',
+        'year': year,
+        'first_year': first_year,
+        'last_year': last_year,
+        'year_span': last_year - first_year,
+        'entities': entities,
+        'entity_count': n_entities,
+        'row_count': _fmt_int(len(scope)),
+        'file_size': _fmt_size(len(scope.to_csv(index=False).encode('utf-8'))),
+        'completeness': f"{100 - profile['missing_ratio']:.1f}%",
+        'missing_cells': _fmt_int(profile['missing_cells']),
+        'missing_pct': f"{profile['missing_ratio']:.1f}%",
+        'complete_series': f"{complete} countries",
+        'complete_series_pct': f"{complete / n_series * 100:.0f}%" if n_series else '-',
+        'gaps': 'Minimal' if gaps < 1 else 'Present',
+        'gaps_pct': f"{gaps:.1f}% of periods",
+        'top_population': population,
+        'top_growth': growth,
+        'top_density': density,
+    }
+    ctx['population_insight'] = _population_insight(ctx)
+    ctx['growth_insight'] = _growth_insight(ctx)
+    ctx['density_insight'] = _density_insight(ctx)
+
+    # Chart data, rendered later (in parallel) by render_charts
+    growth_values = countries.loc[countries['date'] == year, 'growth_rate'].dropna()
+    ctx['chart_data'] = {
+        'population': {'labels': [r[1] for r in population],
+                       'values': top['population']['population'].astype(float).tolist(),
+                       'xlabel': 'Population', 'title': f"Top {n} Most Populous Countries ({year})"},
+        'growth': {'values': [round(float(v), 4) for v in growth_values],
+                   'xlabel': 'Growth Rate (%)', 'title': f"Growth Rate Distribution ({year})"},
+        'density': {'labels': [r[1] for r in density],
+                    'values': top['density']['density'].astype(float).tolist(),
+                    'xlabel': 'Density (pop/km²)', 'title': f"Top {n} Highest Population Density ({year})"},
+        'missing': {'years': [int(y) for y in profile['by_year'].index],
+                    'values': [int(v) for v in profile['by_year'].to_numpy()],
+                    'title': 'Missing Values per Year'},
+    }
+    return ctx
+
+
+def _where(ctx):
+    return ctx['region'] or 'the world'
+
+
+def _population_insight(ctx):
+    rows = ctx['top_population']
+    if len(rows) < 2:
+        return ''
+    return (f"{rows[0][1]} is the most populous country in {_where(ctx)} in {ctx['year']} "
+            f"({rows[0][2]}, {rows[0][3]} of the world population), ahead of {rows[1][1]} ({rows[1][2]}).")
+
+
+def _growth_insight(ctx):
+    rows = ctx['top_growth']
+    if not rows:
+        return ''
+    regions = [r[3] for r in rows if r[3]]
+    leader = max(set(regions), key=regions.count) if regions else ''
+    text = f"{rows[0][1]} grew fastest in {ctx['year']} ({rows[0][2]})."
+    if ctx['region'] is None and leader:
+        text += f" {regions.count(leader)} of the top {len(rows)} are in {leader}."
+    return text
+
+
+def _density_insight(ctx):
+    rows = ctx['top_density']
+    if not rows:
+        return ''
+    return f"{rows[0][1]} has the highest density in {_where(ctx)} ({rows[0][2]} people per km²)."
+
+
+# ----- Charts -----
+
+def _draw_bar(fig, data):
+    ax = fig.add_subplot(111)
+    ax.barh(data['labels'][::-1], data['values'][::-1], color='#3b75af')
+    ax.set_xlabel(data['xlabel'])
+    ax.set_title(data['title'])
+
+
+def _draw_histogram(fig, data):
+    ax = fig.add_subplot(111)
+    ax.hist(data['values'], bins=30, color='#3b75af', edgecolor='white')
+    ax.set_xlabel(data['xlabel'])
+    ax.set_ylabel('Countries')
+    ax.set_title(data['title'])
+
+
+def _draw_line(fig, data):
+    ax = fig.add_subplot(111)
+    ax.plot(data['years'], data['values'], color='#c44e52')
+    ax.set_xlabel('Year')
+    ax.set_ylabel('Missing cells')
+    ax.set_title(data['title'])
+    ax.grid(True, alpha=0.3)
+
+
+DRAWERS = {'population': _draw_bar, 'growth': _draw_histogram, 'density': _draw_bar, 'missing': _draw_line}
+
+
+def _chart_path(kind, data, region=None):
+    """
+    World report charts have fixed names in WORLD_CHART_DIR (tracked with
+    report.md); variant charts are named after their data in CHART_DIR,
+    so identical charts are rendered once.
+    """
+    if region is None:
+        return os.path.join(WORLD_CHART_DIR, f"{kind}.png")
+    digest = hashlib.sha1(json.dumps([kind, data], sort_keys=True).encode('utf-8')).hexdigest()[:16]
+    return os.path.join(CHART_DIR, f"{kind}-{digest}.png")
+
+
+def _render_chart(kind, data, path):
+    png = render_png(partial(DRAWERS[kind], data=data), figsize=(7, 4))
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(png)
+    os.replace(tmp, path)
+    return path
+
+
+@traced('render_charts')
+def render_charts(contexts, workers=None):
+    """
+    Renders the charts of every context in a process pool and stores
+    their paths in ctx['charts']. Variant charts already on disk are reused;
+    world report charts are drawn again.
+    """
+    jobs = {}
+    for ctx in contexts:
+        ctx['charts'] = {}
+        for kind, data in ctx['chart_data'].items():
+            path = _chart_path(kind, data, ctx['region'])
+            ctx['charts'][kind] = path
+            if ctx['region'] is None or not os.path.exists(path):
+                jobs[path] = (kind, data)
+    for directory in {os.path.dirname(path) for path in jobs}:
+        os.makedirs(directory, exist_ok=True)
+
+    if len(jobs) == 1 or workers == 1:
+        for path, (kind, data) in jobs.items():
+            _render_chart(kind, data, path)
+    elif jobs:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for future in [pool.submit(_render_chart, kind, data, path) for path, (kind, data) in jobs.items()]:
+                future.result()
+    return len(jobs)
+
+
+# ----- Templates -----
+
+def markdown_table(header, rows, bold=1):
+    """
+    Markdown table; the cells of column `bold` are emphasized.
+    """
+    lines = ['| ' + ' | '.join(header) + ' |', '|' + '|'.join('-' * (len(h) + 2) for h in header) + '|']
+    for row in rows:
+        cells = [f"**{c}**" if i == bold else c for i, c in enumerate(row)]
+        lines.append('| ' + ' | '.join(cells) + ' |')
+    return '\n'.join(lines)
+
+
+def render_template(text, values):
+    """
+    Replaces the {{ name }} placeholders of a template.
+    """
+    def replace(match):
+        name = match.group(1)
+        if name not in values:
+            raise KeyError(f"template placeholder '{name}' has no value")
+        return str(values[name])
+    return _PLACEHOLDER.sub(replace, text)
+
+
+def markdown_values(ctx, output):
+    """
+    Template values of the Markdown report: the context plus tables and
+    chart paths (relative to the output file).
+    """
+    base = os.path.dirname(os.path.abspath(output))
+    values = dict(ctx)
+    values['region_title'] = f" — {ctx['region']}" if ctx['region'] else ''
+    values['top_population_table'] = markdown_table(
+        ['Rank', 'Country', 'Population', '% of World Pop.'], ctx['top_population'])
+    values['top_growth_table'] = markdown_table(['Rank', 'Country', 'Growth Rate', 'Region'], ctx['top_growth'])
+    values['top_density_table'] = markdown_table(['Rank', 'Country', 'Density (pop/km²)', 'Population'],
+                                                 ctx['top_density'])
+    for kind, path in ctx.get('charts', {}).items():
+        values[f"chart_{kind}"] = os.path.relpath(os.path.abspath(path), base).replace(os.sep, '/')
+    return values
+
+
+def write_markdown(ctx, output, template=MD_TEMPLATE):
+    with open(template, encoding='utf-8') as f:
+        text = render_template(f.read(), markdown_values(ctx, output))
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+
+def write_docx(ctx, output):
+    """
+    Builds the DOCX report in-process with generate_docx_report.build_docx
+    (the DOCX template).
+    """
+    # Imported here: the script imports this module
+    from generate_docx_report import build_docx
+
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    build_docx(ctx, output)
+
+
+# ----- Build cache -----
+
+def _file_hash(*paths):
+    digest = hashlib.sha1()
+    for path in paths:
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+def template_hash(fmt):
+    """
+    Hash of a format's template and of the code filling it.
+    """
+    template = MD_TEMPLATE if fmt == 'md' else DOCX_SCRIPT
+    return _file_hash(template, __file__)
+
+
+def load_build_cache(path=BUILD_CACHE_PATH):
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_build_cache(cache, path=BUILD_CACHE_PATH):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(cache, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def prepare_dataset(df):
+    """
+    Adds the derived metrics a report needs when the dataset lacks them.
+    """
+    if 'growth_rate' not in df.columns:
+        df = calculate_growth_rate(df).sort_index()
+    if 'density' not in df.columns:
+        df = df.assign(density=df['population'] / df['surface_area'])
+    return df
+
+
+@traced('build_reports')
+def build_reports(regions=(None,), formats=FORMATS, force=False, workers=None, df=None):
+    """
+    Builds the report variants (None = world report) whose dataset version
+    or template changed since the last build. Returns the written paths.
+    """
+    version = stored_version() if df is None else None
+    if version is None:
+        df = load_dataset() if df is None else df
+        if df is None:
+            raise FileNotFoundError(f"no dataset at {STORE_PATH} (run python -m src.data_store)")
+        version = dataset_version(df)
+
+    cache = load_build_cache()
+    hashes = {fmt: template_hash(fmt) for fmt in formats}
+    pending = []
+    for region in regions:
+        for fmt in formats:
+            output = output_path(region, fmt)
+            entry = {'dataset': version, 'template': hashes[fmt]}
+            if force or cache.get(output) != entry or not os.path.exists(output):
+                pending.append((region, fmt, output, entry))
+    if not pending:
+        return []
+
+    if df is None:
+        df = load_dataset()
+    df = prepare_dataset(df)
+
+    # Aggregates once per scope, charts of all scopes in one pool
+    with span('report.contexts'):
+        contexts = {region: report_context(df, region, version=version)
+                    for region in dict.fromkeys(r for r, _, _, _ in pending)}
+    render_charts(contexts.values(), workers)
+
+    def build(item):
+        region, fmt, output, _ = item
+        with span('report.write', format=fmt):
+            if fmt == 'md':
+                write_markdown(contexts[region], output)
+            else:
+                write_docx(contexts[region], output)
+        return output
+
+    # Reports of all variants on one thread pool (python-docx and file I/O)
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        written = list(pool.map(build, pending))
+
+    for _, _, output, entry in pending:
+        cache[output] = entry
+    save_build_cache(cache)
+    return written
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Build the reports from the live dataset")
+    parser.add_argument('--regions', default='',
+                        help="comma separated region names or 'all' (default: world report only)")
+    parser.add_argument('--no-world', action='store_true', help="skip the world report")
+    parser.add_argument('--formats', default=','.join(FORMATS))
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--force', action='store_true', help="rebuild even if up to date")
+    args = parser.parse_args()
+
+    formats = [f for f in args.formats.split(',') if f]
+    unknown = [f for f in formats if f not in FORMATS]
+    if unknown:
+        parser.error(f"unknown format(s): {', '.join(unknown)}")
+
+    regions = [] if args.no_world else [None]
+    if args.regions == 'all':
+        regions += list_regions(load_dataset())
+    elif args.regions:
+        regions += [r.strip() for r in args.regions.split(',')]
+
+    t0 = time.perf_counter()
+    written = build_reports(regions, formats, force=args.force, workers=args.workers)
+    for path in written:
+        print(f"✓ {path}")
+    print(f"{len(written)} report(s) built, {len(regions) * len(formats) - len(written)} up to date "
+          f"({time.perf_counter() - t0:.1f}s)")
@@ -0,0 +1,123 @@
+import numpy as np
+import pandas as pd
+import seaborn as sns
+from matplotlib.collections import LineCollection
+from matplotlib.lines import Line2D
+
+# Points drawn across all series of a comparison plot; each series gets an
+# equal share (at least MIN_POINTS) and is downsampled with LTTB above it
+POINT_BUDGET = 2000
+MIN_POINTS = 24
+
+# Legend entries drawn; further series are counted in the legend title
+LEGEND_MAX = 20
+
+
+def lttb(x, y, threshold):
+    """
+    Largest-Triangle-Three-Buckets downsampling of a series sorted by x:
+    keeps the first and last points and, from each of threshold - 2 equal
+    buckets, the point forming the largest triangle with the previously kept
+    point and the mean of the next bucket. Returns the kept positions.
+    NaN values (gaps) are never kept when the series is downsampled.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype='float64')
+    y = np.asarray(y, dtype='float64')
+    valid = ~np.isnan(y)
+    if not valid.all():
+        positions = np.flatnonzero(valid)
+        return positions[lttb(x[positions], y[positions], threshold)]
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    kept = np.empty(threshold, dtype=int)
+    kept[0], kept[-1] = 0, n - 1
+
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        # Mean of the next bucket (the last point for the final bucket)
+        next_start, next_end = end, edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        kept[i + 1] = a
+    return kept
+
+
+class SeriesIndex:
+    """
+    Per-entity time series, built once per dataset version: rows are
+    ordered by entity then year, so every entity's years and metric values
+    are contiguous NumPy slices. Selecting series is a dict lookup per
+    entity instead of an isin() scan over the whole frame.
+    """
+
+    def __init__(self, df, metrics=None, key='country'):
+        if metrics is None:
+            metrics = [c for c in df.select_dtypes('number').columns if c != 'date']
+
+        # Entities in order of first appearance (as df[key].unique())
+        codes, uniques = pd.factorize(df[key])
+        order = np.lexsort((df['date'].to_numpy(), codes))
+        order = order[codes[order] >= 0]
+        sorted_codes = codes[order]
+
+        self.entities = [str(e) for e in uniques]
+        self.metrics = list(metrics)
+        self.years = df['date'].to_numpy(dtype='int64')[order]
+        self.values = {m: df[m].to_numpy(dtype='float64', na_value=np.nan)[order] for m in self.metrics}
+
+        starts = np.searchsorted(sorted_codes, np.arange(len(uniques)))
+        ends = np.append(starts[1:], len(order))
+        self.spans = {e: (int(s), int(t)) for e, s, t in zip(self.entities, starts, ends)}
+
+    def series(self, entity, metric):
+        """
+        (years, values) of one entity, without NaN values (array views when
+        there are none).
+        """
+        start, end = self.spans[entity]
+        years, values = self.years[start:end], self.values[metric][start:end]
+        valid = ~np.isnan(values)
+        if not valid.all():
+            years, values = years[valid], values[valid]
+        return years, values
+
+    def plot_series(self, entities, metric, budget=POINT_BUDGET):
+        """
+        {entity: (years, values)} for a comparison plot, each series
+        downsampled with LTTB to its share of the point budget.
+        """
+        threshold = max(MIN_POINTS, budget // max(len(entities), 1))
+        out = {}
+        for entity in entities:
+            years, values = self.series(entity, metric)
+            if len(years) > threshold:
+                kept = lttb(years, values, threshold)
+                years, values = years[kept], values[kept]
+            out[entity] = (years, values)
+        return out
+
+
+def draw_series(ax, series, legend_title='country', legend_max=LEGEND_MAX):
+    """
+    Draws {entity: (years, values)} as one LineCollection (a single artist
+    however many series) with a legend of the first legend_max entities.
+    """
+    # The default palette repeats after its 10 colours; husl beyond that (like sns.lineplot)
+    n = max(len(series), 1)
+    colors = sns.color_palette(n_colors=n) if n <= len(sns.color_palette()) else sns.color_palette('husl', n)
+    segments = [np.column_stack((years, values)) for years, values in series.values()]
+    ax.add_collection(LineCollection(segments, colors=colors[:len(segments)], linewidths=1.5))
+    ax.autoscale_view()
+
+    names = list(series)[:legend_max]
+    handles = [Line2D([], [], color=color, linewidth=1.5) for color in colors[:len(names)]]
+    hidden = len(series) - len(names)
+    ax.legend(handles, names, title=f"{legend_title} (+{hidden} more)" if hidden else legend_title,
+              ncol=2 if len(names) > 10 else 1, fontsize='small')
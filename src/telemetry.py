@@ -0,0 +1,190 @@
+"""
+Lightweight instrumentation: timing spans and counters, exported as a JSONL
+trace and Prometheus text metrics.
+
+Off unless WPI_TELEMETRY=1. When off, @traced returns the function
+unchanged, span() returns a shared no-op context manager and count() returns
+immediately, so the hooks can stay in production code.
+
+    @traced('clean_data')
+    def clean_data(...): ...
+
+    with span('tab.rankings'):
+        ...
+    count('cache_hits', cache='figure')
+
+Spans are appended to data/telemetry/trace.jsonl; write_metrics() writes
+data/telemetry/metrics.prom (textfile collector format) and
+render_metrics() returns the same text for a /metrics endpoint.
+"""
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+
+ENABLED = os.environ.get('WPI_TELEMETRY', '') not in ('', '0')
+TELEMETRY_DIR = os.environ.get('WPI_TELEMETRY_DIR', 'data/telemetry')
+TRACE_PATH = os.path.join(TELEMETRY_DIR, 'trace.jsonl')
+METRICS_PATH = os.path.join(TELEMETRY_DIR, 'metrics.prom')
+PREFIX = 'wpi_'
+
+# Trace lines are buffered and written in batches
+FLUSH_EVERY = 256
+
+_lock = threading.Lock()
+_local = threading.local()
+_counters = {}  # (name, labels) -> value
+_spans = {}  # (name, labels) -> [count, total seconds]
+_buffer = []
+
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    def __init__(self, name, labels):
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        stack = getattr(_local, 'stack', None)
+        if stack is None:
+            stack = _local.stack = []
+        self.parent = stack[-1] if stack else None
+        stack.append(self.name)
+        self.start = time.time()
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        seconds = time.perf_counter() - self.t0
+        _local.stack.pop()
+        key = (self.name, tuple(sorted(self.labels.items())))
+        record = {'ts': self.start, 'span': self.name, 'ms': round(seconds * 1000, 3),
+                  'parent': self.parent, 'thread': threading.current_thread().name}
+        if self.labels:
+            record['labels'] = self.labels
+        if exc_type is not None:
+            record['error'] = exc_type.__name__
+        with _lock:
+            stats = _spans.setdefault(key, [0, 0.0])
+            stats[0] += 1
+            stats[1] += seconds
+            _buffer.append(record)
+            full = len(_buffer) >= FLUSH_EVERY
+        if full:
+            flush_trace()
+        return False
+
+
+def span(name, **labels):
+    """
+    Context manager timing a block (no-op when telemetry is off).
+    """
+    if not ENABLED:
+        return _NULL_SPAN
+    return _Span(name, {k: str(v) for k, v in labels.items()})
+
+
+def traced(name=None):
+    """
+    Decorator timing every call of a function as a span.
+    Applied at import: with telemetry off the function is returned as is.
+    """
+    def decorate(fn):
+        if not ENABLED:
+            return fn
+        span_name = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with _Span(span_name, {}):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def count(name, value=1, **labels):
+    """
+    Adds value to a counter (e.g. count('cache_hits', cache='figure')).
+    """
+    if not ENABLED:
+        return
+    key = (name, tuple(sorted((k, str(v)) for k, v in labels.items())))
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+
+def flush_trace(path=None):
+    """
+    Appends the buffered spans to the JSONL trace.
+    """
+    with _lock:
+        records = _buffer[:]
+        _buffer.clear()
+    if not records:
+        return
+    path = path or TRACE_PATH
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(''.join(json.dumps(r) + '\n' for r in records))
+
+
+def _labels(pairs, extra=()):
+    pairs = list(pairs) + list(extra)
+    if not pairs:
+        return ''
+    escaped = (str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, v in pairs)
+    return '{' + ','.join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + '}'
+
+
+def render_metrics():
+    """
+    Counters and span totals in the Prometheus text exposition format.
+    """
+    with _lock:
+        counters = dict(_counters)
+        spans = {k: list(v) for k, v in _spans.items()}
+
+    lines = []
+    for name in sorted({n for n, _ in counters}):
+        lines.append(f"# TYPE {PREFIX}{name}_total counter")
+        for (n, labels), value in sorted(counters.items()):
+            if n == name:
+                lines.append(f"{PREFIX}{name}_total{_labels(labels)} {value}")
+    if spans:
+        lines.append(f"# TYPE {PREFIX}span_seconds summary")
+        for (n, labels), (calls, seconds) in sorted(spans.items()):
+            label_text = _labels([('span', n)], labels)
+            lines.append(f"{PREFIX}span_seconds_count{label_text} {calls}")
+            lines.append(f"{PREFIX}span_seconds_sum{label_text} {seconds:.6f}")
+    return '\n'.join(lines) + '\n'
+
+
+def write_metrics(path=None):
+    """
+    Flushes the trace and writes the metrics file (atomically).
+    """
+    if not ENABLED:
+        return
+    flush_trace()
+    path = path or METRICS_PATH
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write(render_metrics())
+    os.replace(tmp, path)
+
+
+if ENABLED:
+    atexit.register(write_metrics)
@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.cleaning import BLOCK_STRATEGIES, group_mean_fill
+
+NAN = np.nan
+
+
+def _nearest(x):
+    # Closest valid value by position, ties take the earlier one
+    pos = pd.Series(np.arange(len(x), dtype=float), index=x.index)
+    valid = pos.where(x.notna())
+    prev, nxt = valid.ffill(), valid.bfill()
+    use_prev = prev.notna() & (nxt.isna() | (pos - prev <= nxt - pos))
+    return x.ffill().where(use_prev, x.bfill()).where(x.isna(), x)
+
+
+# The per-group pandas implementations the kernels replace
+REFERENCE = {
+    'interpolate': lambda x: x.interpolate(method='linear', limit_direction='both'),
+    'ffill': lambda x: x.ffill(),
+    'nearest': _nearest,
+}
+
+
+@pytest.fixture
+def panel():
+    """
+    Countries with leading, inner and trailing gaps, one without any value
+    and blocks of length 1 (with and without a value); rows shuffled.
+    """
+    series = {
+        'A': [NAN, 1.0, NAN, NAN, 4.0, NAN],
+        'B': [2.0, NAN, 6.0, 8.0, NAN, NAN],
+        'C': [NAN, NAN, NAN],
+        'D': [5.0],
+        'E': [NAN],
+        'F': [1.0, NAN, NAN, 7.0, NAN, 3.0, NAN, NAN, NAN, 9.0],
+    }
+    df = pd.DataFrame([(country, 2000 + i, v) for country, values in series.items() for i, v in enumerate(values)],
+                      columns=['country', 'date', 'value'])
+    return df.iloc[np.random.default_rng(0).permutation(len(df))].reset_index(drop=True)
+
+
+@pytest.mark.parametrize('strategy', sorted(BLOCK_STRATEGIES))
+def test_block_kernels_match_groupby(panel, strategy):
+    df = panel.sort_values(['country', 'date'], ignore_index=True)
+    codes = pd.factorize(df['country'])[0]
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+
+    got = BLOCK_STRATEGIES[strategy](df['value'].to_numpy(), starts)
+    expected = df.groupby('country')['value'].transform(REFERENCE[strategy]).to_numpy()
+    np.testing.assert_allclose(got, expected, rtol=1e-12, equal_nan=True)
+
+
+def test_group_mean_fill_matches_groupby(panel):
+    codes, uniques = pd.factorize(panel['country'])
+
+    got = group_mean_fill(panel['value'].to_numpy(), codes, len(uniques))
+    expected = panel.groupby('country')['value'].transform(lambda x: x.fillna(x.mean())).to_numpy()
+    np.testing.assert_allclose(got, expected, rtol=1e-12, equal_nan=True)
@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import make_panel
+from src.data_store import from_normalized, load_dataset, load_normalized, save_dataset, to_normalized
+
+
+@pytest.fixture
+def stored(tmp_path):
+    """
+    Compact load of a synthetic store with shuffled rows, surface_area
+    changing over time for some countries and NaN runs (including a
+    country without any value).
+    """
+    df = make_panel(1, missing=0.05, seed=1)
+    entity = df['country'].cat.codes.to_numpy()
+    date = df['date'].to_numpy()
+
+    surface = df['surface_area'].to_numpy().copy()
+    surface[(entity % 3 == 0) & (date >= 1990)] *= 1.1
+    surface[(entity == 5) & (date >= 1970) & (date <= 1975)] = np.nan
+    surface[(entity == 8) & (date >= 2010)] = np.nan
+    surface[entity == 7] = np.nan
+    df['surface_area'] = surface
+    df['density'] = df['population'] / df['surface_area']
+
+    df = df.iloc[np.random.default_rng(0).permutation(len(df))].reset_index(drop=True)
+    path = tmp_path / 'store.arrow'
+    save_dataset(df, path=str(path), csv_path=None, normalized_path=str(tmp_path / 'normalized'))
+    return load_dataset(str(path), csv_path=None, compact=True), tmp_path
+
+
+def test_normalized_round_trip(stored):
+    expected, _ = stored
+    entities, facts, attributes = to_normalized(expected)
+    # Slowly changing values are stored once per run, not once per row
+    assert len(attributes) < len(facts)
+    pd.testing.assert_frame_equal(from_normalized(entities, facts, attributes), expected)
+
+
+def test_normalized_layout_on_disk(stored):
+    expected, tmp_path = stored
+    pd.testing.assert_frame_equal(load_normalized(str(tmp_path / 'normalized')), expected)
+    assert load_normalized(str(tmp_path / 'normalized'), version='other') is None
+
+
+@pytest.mark.parametrize('ascending', [True, False])
+def test_normalized_round_trip_date_order(stored, ascending):
+    # Facts sorted by entity with years in either direction
+    expected, _ = stored
+    expected = expected.sort_values(['country', 'date'], ascending=[True, ascending], ignore_index=True)
+    pd.testing.assert_frame_equal(from_normalized(*to_normalized(expected)), expected)
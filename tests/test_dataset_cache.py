@@ -0,0 +1,42 @@
+import threading
+import time
+
+import pytest
+
+from src.dataset_cache import DatasetCache
+
+
+def test_failed_build_is_retried():
+    cache = DatasetCache()
+
+    def fail():
+        raise RuntimeError('build failed')
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_build('key', fail)
+    assert cache.building == {}
+    assert 'key' not in cache
+
+    assert cache.get_or_build('key', lambda: 1) == 1
+    assert cache.building == {}
+    assert cache.get_or_build('key', fail) == 1
+
+
+def test_concurrent_misses_build_once():
+    cache = DatasetCache()
+    builds = []
+
+    def build():
+        builds.append(1)
+        time.sleep(0.05)
+        return 'value'
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_build('key', build))) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert results == ['value'] * 4
+    assert len(builds) == 1
+    assert cache.building == {}
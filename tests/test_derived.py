@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import make_panel
+from src.derived import previous_rows, update_derived
+
+DERIVED = ['density', 'growth_rate']
+
+
+@pytest.fixture
+def stored():
+    """
+    A stored dataset with its derived columns and tags, and the next
+    version of it: some populations changed, rows reordered.
+    """
+    base = make_panel(1, missing=0.05, seed=4).drop(columns=['density'])
+    previous, tags = update_derived(base)
+
+    df = base.sample(frac=1, random_state=0).reset_index(drop=True)
+    entity = df['country'].cat.codes.to_numpy()
+    date = df['date'].to_numpy()
+    changed = ((entity == 3) & (date == 2000)) | ((entity == 10) & (date >= 2010) & (date <= 2012))
+    df.loc[changed, 'population'] *= 1.5
+    return previous, tags, df, changed
+
+
+def _aligned(previous, df, col):
+    merged = df[['country', 'date']].merge(previous[['country', 'date', col]], on=['country', 'date'], how='left')
+    return merged[col].to_numpy()
+
+
+def test_incremental_matches_full_recompute(stored):
+    previous, tags, df, changed = stored
+    out, out_tags = update_derived(df, previous, tags, changed)
+    full, full_tags = update_derived(df)
+
+    pd.testing.assert_frame_equal(out, full)
+    assert out_tags == full_tags
+
+
+def test_incremental_reuses_unchanged_rows(stored):
+    previous, tags, df, changed = stored
+    # Sentinels are only visible if the stored values are reused
+    previous = previous.copy()
+    previous[DERIVED] = -1.0
+
+    out, _ = update_derived(df, previous, tags, changed)
+    full, _ = update_derived(df)
+
+    prev = previous_rows(df)
+    following = np.zeros(len(df), dtype=bool)
+    following[prev >= 0] = changed[prev[prev >= 0]]
+    assert (following & ~changed).any()
+
+    recomputed = {'density': changed, 'growth_rate': changed | following}
+    for col, rows in recomputed.items():
+        np.testing.assert_array_equal(out.loc[~rows, col], _aligned(previous, df, col)[~rows])
+        np.testing.assert_allclose(out.loc[rows, col], full.loc[rows, col])
+
+
+def test_tag_mismatch_recomputes_everything(stored):
+    previous, tags, df, changed = stored
+    previous = previous.copy()
+    previous[DERIVED] = -1.0
+
+    full, _ = update_derived(df)
+    for stale in ({col: 'stale' for col in DERIVED}, None):
+        out, _ = update_derived(df, previous, stale, changed)
+        pd.testing.assert_frame_equal(out, full)
+
+    # Stored values edited without their tags being refreshed
+    edited = previous.copy()
+    edited['population'] *= 2
+    out, _ = update_derived(df, edited, tags, changed)
+    pd.testing.assert_frame_equal(out, full)
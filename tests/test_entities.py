@@ -0,0 +1,76 @@
+import pandas as pd
+import pytest
+
+from src.entities import build_entities, canonical_keys, join_entities, resolve_keys
+
+
+def _record(code, iso2, name, region):
+    return {'id': code, 'iso2Code': iso2, 'name': name,
+            'region': {'id': '', 'iso2code': '', 'value': region},
+            'incomeLevel': {'id': '', 'iso2code': '', 'value': 'High income'}}
+
+
+@pytest.fixture
+def entities():
+    return build_entities([
+        _record('TUR', 'TR', 'Turkiye', 'Europe & Central Asia'),
+        _record('DEU', 'DE', 'Germany', 'Europe & Central Asia'),
+        _record('WLD', '1W', 'World', 'Aggregates'),
+    ])
+
+
+@pytest.fixture
+def panel():
+    """
+    Rows fetched at different times: Turkey renamed (ISO3 before, ISO2 after),
+    Germany by ISO2, World, and codes missing from the metadata.
+    """
+    rows = [
+        ('TUR', 'Turkey', 2019), ('TUR', 'Turkey', 2020), ('TR', 'Turkiye', 2021), ('TR', 'Turkiye', 2022),
+        ('DE', 'Germany', 2021), ('DEU', 'Germany', 2022),
+        ('WLD', 'World', 2022),
+        ('XKX', 'Kosovo', 2020), ('XKX', 'Kosovo', 2021), ('XKX', 'Kosovo Rep.', 2022),
+        ('ZZ', 'Unknown', 2022),
+    ]
+    return pd.DataFrame(rows, columns=['iso_code', 'country', 'date']).assign(population=1.0)
+
+
+def test_canonical_keys(entities):
+    keys = pd.Series(['TR', 'TUR', 'DE', 'XKX', None, '1W'], name='iso_code')
+    out = canonical_keys(keys, entities)
+    assert out.isna().tolist() == [False] * 4 + [True, False]
+    assert out.dropna().tolist() == ['TUR', 'TUR', 'DEU', 'XKX', 'WLD']
+    assert out.name == 'iso_code'
+    assert resolve_keys(keys, entities).tolist() == [0, 0, 1, -1, -1, 2]
+
+
+def test_renamed_entity_is_one_series(entities, panel):
+    out, _ = join_entities(panel, entities)
+
+    turkey = out[out['iso_code'] == 'TUR']
+    assert turkey['country'].astype(str).unique().tolist() == ['Turkiye']
+    assert turkey['date'].tolist() == [2019, 2020, 2021, 2022]
+    assert (out.loc[out['country'] == 'Germany', 'iso_code'] == 'DEU').all()
+    assert out.groupby('country', observed=True)['date'].count().to_dict() == {
+        'Germany': 2, 'Kosovo': 3, 'Turkiye': 4, 'Unknown': 1, 'World': 1}
+
+    tagged = out[out['iso_code'].isin(['TUR', 'DEU', 'WLD'])]
+    assert tagged['region_name'].notna().all()
+    assert tagged['is_aggregate'].tolist() == [False] * 6 + [True]
+
+
+def test_unmatched_entities(entities, panel):
+    out, unmatched = join_entities(panel, entities)
+
+    assert unmatched.sort_values('iso_code').to_dict('records') == [
+        {'iso_code': 'XKX', 'country': 'Kosovo', 'rows': 3},
+        {'iso_code': 'ZZ', 'country': 'Unknown', 'rows': 1},
+    ]
+    # Unmatched rows keep their code and first fetched name, without tags
+    rows = out[out['iso_code'].isin(['XKX', 'ZZ'])]
+    assert rows['country'].astype(str).tolist() == ['Kosovo'] * 3 + ['Unknown']
+    assert rows['region_name'].isna().all()
+    assert rows['is_aggregate'].isna().all()
+
+    _, none = join_entities(panel[~panel['iso_code'].isin(['XKX', 'ZZ'])], entities)
+    assert none.empty
@@ -0,0 +1,75 @@
+import random
+
+import pandas as pd
+import pytest
+
+from benchmarks.wb_stub_server import StubHandler, start_stub_server
+from src.data_fetcher import fetch_and_process_data
+from src.data_store import load_dataset, load_manifest
+from src.fetch_engine import FetchError, WorldBankFetcher
+
+INDICATORS = {'SP.POP.TOTL': 'population', 'AG.SRF.TOTL.K2': 'surface_area'}
+
+
+@pytest.fixture
+def stub():
+    """
+    Starts a stub server with the given failure rate; shut down after the test.
+    """
+    servers = []
+
+    def start(fail_rate=0.0):
+        server, url = start_stub_server(fail_rate=fail_rate)
+        servers.append(server)
+        return url
+
+    random.seed(0)
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def fetch(url, **kwargs):
+    kwargs.setdefault('backoff', 0)
+    kwargs.setdefault('rate_limit', 0)
+    fetcher = WorldBankFetcher(base_url=url, **kwargs)
+    codes = [c['id'] for c in fetcher.get_countries()]
+    return fetcher.get_dataframe(INDICATORS, 2000, 2005, countries=codes, by=('iso_code', 'country'))
+
+
+def test_retries_recover_transient_failures(stub):
+    expected = fetch(stub())
+    got = fetch(stub(fail_rate=0.3), retries=10)
+    pd.testing.assert_frame_equal(got, expected)
+
+
+def test_retries_give_up(stub):
+    url = stub(fail_rate=1.0)
+    before = StubHandler.requests_served
+    with pytest.raises(FetchError, match='HTTP 503'):
+        WorldBankFetcher(base_url=url, retries=2, backoff=0, rate_limit=0).get_countries()
+    assert StubHandler.requests_served - before == 3
+
+
+def test_pagination(stub):
+    url = stub()
+    expected = fetch(url)
+    # 266 entities x 6 years per indicator, split into pages of 7 records
+    paged = fetch(url, per_page=7, chunk_size=10)
+    pd.testing.assert_frame_equal(paged, expected)
+    assert len(expected) == 266 * 6
+
+
+def test_incremental_refresh_without_new_data_is_a_no_op(stub, tmp_path, monkeypatch):
+    # The store, manifest and caches are written under data/ of the working directory
+    monkeypatch.chdir(tmp_path)
+    url = stub()
+    fetcher = WorldBankFetcher(base_url=url, backoff=0, rate_limit=0)
+
+    fetch_and_process_data(end_year=2005, fetcher=fetcher)
+    before, covered = load_dataset(), load_manifest()['indicators']
+
+    fetch_and_process_data(incremental=True, end_year=2005, fetcher=fetcher)
+    pd.testing.assert_frame_equal(load_dataset(), before)
+    assert load_manifest()['indicators'] == covered
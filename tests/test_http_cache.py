@@ -0,0 +1,88 @@
+import json
+import os
+import time
+
+import pandas as pd
+import pytest
+
+from benchmarks.wb_stub_server import StubHandler, start_stub_server
+from src.fetch_engine import FetchError, WorldBankFetcher
+from src.http_cache import ResponseCache
+
+INDICATORS = {'SP.POP.TOTL': 'population'}
+PAYLOAD = [{'page': 1}, [{'value': 1.0}] * 20]
+
+
+def _age(cache, key, seconds):
+    """
+    Makes an entry look fetched and last used `seconds` ago.
+    """
+    path = cache._file(key)
+    with open(path) as f:
+        entry = json.load(f)
+    entry['fetched_at'] -= seconds
+    with open(path, 'w') as f:
+        json.dump(entry, f)
+    when = time.time() - seconds
+    os.utime(path, (when, when))
+
+
+def test_expired_entries_served_offline_only(tmp_path):
+    cache = ResponseCache(str(tmp_path), ttl=60)
+    cache.put('old', 'url', PAYLOAD)
+    _age(cache, 'old', 3600)
+
+    assert cache.get('old') is None
+    assert cache.get('old', allow_stale=True) == PAYLOAD
+
+    # A new process scans the directory on its first put: expired entries stay below the size limit
+    cache = ResponseCache(str(tmp_path), ttl=60)
+    cache.put('new', 'url', PAYLOAD)
+    cache.evict()
+    assert cache.get('old', allow_stale=True) == PAYLOAD
+
+
+def test_byte_limit_evicts_expired_then_least_recently_used(tmp_path):
+    cache = ResponseCache(str(tmp_path), ttl=60, max_bytes=None)
+    for key in ('expired', 'a', 'b', 'c'):
+        cache.put(key, 'url', PAYLOAD)
+    size = max(os.path.getsize(cache._file(key)) for key in ('a', 'b', 'c'))
+
+    _age(cache, 'expired', 3600)
+    for age, key in ((30, 'a'), (20, 'b'), (10, 'c')):
+        when = time.time() - age
+        os.utime(cache._file(key), (when, when))
+    cache.get('a')  # a becomes the most recently used
+
+    cache.max_bytes = 3 * size
+    cache.put('d', 'url', PAYLOAD)
+    remaining = sorted(name[:-5] for name in os.listdir(tmp_path) if name.endswith('.json'))
+    assert remaining == ['a', 'c', 'd']
+    assert cache._bytes == sum(os.path.getsize(cache._file(key)) for key in remaining)
+
+
+def test_offline_fetch(tmp_path):
+    server, url = start_stub_server()
+    try:
+        fetcher = WorldBankFetcher(base_url=url, backoff=0, rate_limit=0, cache=ResponseCache(str(tmp_path)))
+        expected = fetcher.get_dataframe(INDICATORS, 2000, 2005, countries=['AAA'])
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    # Served from the cache, even once the entries expired
+    served = StubHandler.requests_served
+    offline = WorldBankFetcher(base_url=url, cache=ResponseCache(str(tmp_path), ttl=0), offline=True)
+    pd.testing.assert_frame_equal(offline.get_dataframe(INDICATORS, 2000, 2005, countries=['AAA']), expected)
+    assert StubHandler.requests_served == served
+
+    with pytest.raises(FetchError, match='not in cache'):
+        offline.get_dataframe(INDICATORS, 2000, 2006, countries=['AAA'])
+
+
+def test_failed_put_leaves_no_file(tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    with pytest.raises(TypeError):
+        cache.put('key', 'url', {'payload': object()})
+    assert os.listdir(tmp_path) == []
+    assert cache.get('key') is None
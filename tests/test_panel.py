@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import make_panel
+from src.data_processor import calculate_growth_rate, clean_data, get_top_n_countries
+from src.panel import PopulationPanel
+
+METRICS = ['population', 'surface_area']
+
+
+@pytest.fixture
+def frame():
+    """
+    Synthetic panel with missing values, a few missing rows (gaps in the
+    years of some entities) and shuffled rows.
+    """
+    df = make_panel(1, missing=0.05, seed=2)
+    df = df.drop(df.sample(frac=0.05, random_state=1).index)
+    return df.sample(frac=1, random_state=0).reset_index(drop=True)
+
+
+def _sorted(df):
+    return df.sort_values(['country', 'date'], ignore_index=True)
+
+
+def test_round_trip(frame):
+    out = PopulationPanel.from_frame(frame).to_frame()
+
+    expected = _sorted(frame)
+    assert sorted(out.columns) == sorted(expected.columns)
+    pd.testing.assert_frame_equal(out[expected.columns], expected)
+
+
+def test_growth_across_gaps_matches_frame_path(frame):
+    panel = PopulationPanel.from_frame(frame)
+    out = panel.with_growth_rate(across_gaps=True).to_frame()
+    expected = _sorted(calculate_growth_rate(frame))
+    np.testing.assert_allclose(out['growth_rate'], expected['growth_rate'], equal_nan=True)
+
+    # By default the year after a missing row has no growth
+    adjacent = panel.with_growth_rate().to_frame()
+    after_gap = (out['date'].diff() > 1) & (out['country'] == out['country'].shift())
+    assert after_gap.any()
+    assert adjacent.loc[after_gap, 'growth_rate'].isna().all()
+    np.testing.assert_allclose(adjacent.loc[~after_gap, 'growth_rate'], out.loc[~after_gap, 'growth_rate'],
+                               equal_nan=True)
+
+
+@pytest.mark.parametrize('strategy', ['fill_mean', 'interpolate', 'ffill', 'nearest'])
+def test_fill_matches_clean_data(strategy):
+    # Without missing rows, the year axis is the frame's row order
+    df = make_panel(1, missing=0.05, seed=3).sample(frac=1, random_state=0)
+    out = PopulationPanel.from_frame(df, indicators=METRICS).fill(strategy).to_frame()
+    expected = _sorted(clean_data(df[['country', 'date'] + METRICS], strategy))
+
+    # fill_mean drops entities without any value; the panel keeps them empty
+    if strategy == 'fill_mean':
+        out = out.dropna(subset=METRICS, how='all').reset_index(drop=True)
+    np.testing.assert_allclose(out[METRICS].to_numpy(), expected[METRICS].to_numpy(), equal_nan=True)
+
+
+@pytest.mark.parametrize('metric', ['population', 'density'])
+def test_top_n_matches_frame_path(frame, metric):
+    panel = PopulationPanel.from_frame(frame)
+    for year in (1960, 1990, 2023):
+        out = panel.top_n(year, metric, n=10)
+        expected = get_top_n_countries(frame, year, metric, n=10)
+        assert out['country'].astype(str).tolist() == expected['country'].astype(str).tolist()
+        np.testing.assert_allclose(out[metric], expected[metric])
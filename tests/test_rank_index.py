@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import make_panel
+from src.rank_index import RankIndex, top_n_partial
+
+YEAR = 2000
+
+
+@pytest.fixture
+def panel():
+    """
+    Synthetic panel where, in YEAR, several countries share a value, some
+    have NaN and aggregates hold the largest values; rows shuffled.
+    """
+    df = make_panel(1, missing=0.05, seed=5).sample(frac=1, random_state=0).reset_index(drop=True)
+    df['density'] = df['density'].astype('float64')
+    year = df['date'] == YEAR
+    countries = np.flatnonzero(year & (df['is_aggregate'] == False))
+    aggregates = np.flatnonzero(year & (df['is_aggregate'] == True))
+
+    df.loc[countries[:6], 'population'] = 5e9
+    df.loc[countries[6:30:3], 'population'] = 1e6
+    df.loc[countries[30:40], 'population'] = np.nan
+    df.loc[aggregates, 'population'] = 1e10
+    df.loc[countries[:3], 'density'] = np.nan
+    df.loc[aggregates, 'density'] = 1e6
+    return df
+
+
+def _expected(df, year, metric, n):
+    rows = df[(df['date'] == year) & (df['is_aggregate'] == False)]
+    return rows.sort_values(metric, ascending=False, kind='stable').head(n)
+
+
+@pytest.mark.parametrize('metric', ['population', 'density'])
+@pytest.mark.parametrize('n', [1, 3, 6, 10, 200, 300])
+def test_top_n_matches_sort(panel, metric, n):
+    expected = _expected(panel, YEAR, metric, n)
+    index = RankIndex(panel, metrics=[metric])
+    for out in (index.top_n(YEAR, metric, n), top_n_partial(panel, YEAR, metric, n)):
+        pd.testing.assert_frame_equal(out, expected)
+        assert not out['is_aggregate'].any()
+
+    # nlargest agrees on the values (it leaves NaN rows out)
+    largest = panel[(panel['date'] == YEAR) & (panel['is_aggregate'] == False)].nlargest(n, metric, keep='first')
+    np.testing.assert_array_equal(expected[metric].to_numpy()[:len(largest)], largest[metric].to_numpy())
+
+
+def test_unknown_year(panel):
+    assert RankIndex(panel, metrics=['population']).top_n(1800, 'population').empty
+    assert top_n_partial(panel, 1800, 'population').empty
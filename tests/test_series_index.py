@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.series_index import SeriesIndex, lttb
+
+
+def _series(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return np.arange(n, dtype='float64'), rng.normal(0, 1, n).cumsum()
+
+
+@pytest.mark.parametrize('n, threshold', [(100, 3), (100, 10), (5000, 24), (64, 63), (1000, 999)])
+def test_lttb_keeps_threshold_points(n, threshold):
+    x, y = _series(n)
+    kept = lttb(x, y, threshold)
+    assert len(kept) == threshold
+    assert kept[0] == 0 and kept[-1] == n - 1
+    assert (np.diff(kept) > 0).all()
+
+
+def test_lttb_keeps_extremes():
+    # A single spike is the largest triangle of its bucket
+    x, y = np.arange(500, dtype='float64'), np.zeros(500)
+    y[137] = 100.0
+    assert 137 in lttb(x, y, 20)
+
+
+@pytest.mark.parametrize('threshold', [2, 50, 64, 100])
+def test_lttb_short_input_unchanged(threshold):
+    x, y = _series(50)
+    np.testing.assert_array_equal(lttb(x, y, threshold), np.arange(50))
+
+
+def test_lttb_nan_gaps():
+    x, y = _series(300)
+    y[:5] = np.nan
+    y[100:140] = np.nan
+    y[-3:] = np.nan
+    kept = lttb(x, y, 30)
+    assert len(kept) == 30
+    assert not np.isnan(y[kept]).any()
+    assert kept[0] == 5 and kept[-1] == 296
+
+    # Same points as downsampling the series without its gaps
+    valid = np.flatnonzero(~np.isnan(y))
+    np.testing.assert_array_equal(kept, valid[lttb(x[valid], y[valid], 30)])
+
+    # Fewer values than the threshold: all of them
+    y[20:] = np.nan
+    np.testing.assert_array_equal(lttb(x, y, 30), np.arange(5, 20))
+
+
+def test_plot_series_budget():
+    x, y = _series(1000)
+    df = pd.DataFrame({'country': np.repeat(['A', 'B'], 1000), 'date': np.tile(x, 2), 'population': np.tile(y, 2)})
+    out = SeriesIndex(df, metrics=['population']).plot_series(['A', 'B'], 'population', budget=100)
+    assert [len(years) for years, _ in out.values()] == [50, 50]